@@ -2,18 +2,35 @@ import fastapi
 import contextlib
 import asgi_correlation_id
 
-from src.core.logging import setup_logging
+from src.core import admission, executor, memory, metrics, server, telemetry, workers
+from src.core.logging import setup_logging, stop_logging
 from src.api.v1 import router as v1_api_router
+from src.service import data_target, write_behind
 
 
 @contextlib.asynccontextmanager
 async def _lifespan(*args, **kwargs):
     setup_logging()
+    telemetry.start_setup()
+    executor.start_process_pool()
+    await data_target.start_session()
+    await write_behind.start()
+    await workers.start()
     yield
+    await workers.stop()
+    await write_behind.stop()
+    await data_target.close_session()
+    executor.shutdown_process_pool()
+    await telemetry.wait_setup()
+    stop_logging()
 
 
 app = fastapi.FastAPI(lifespan=_lifespan)
 app.add_middleware(asgi_correlation_id.CorrelationIdMiddleware, header_name="correlation-id", validator=None)
+app.add_middleware(memory.MemoryGuardMiddleware, paths=("/api/v1/score",))
+app.add_middleware(admission.AdmissionMiddleware, paths=("/api/v1/score",))
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(server.RecyclingMiddleware)
 
 app.include_router(v1_api_router)
 
@@ -24,6 +41,5 @@ async def api_spec():
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8080, log_config=None)
+    server.run()
 
@@ -1,7 +1,8 @@
 import fastapi
 
-from .probe import router as probe_router
+from .probe import router as probe_router, metrics_router
 from .score import router as score_router
+from .debug import router as debug_router
 
 
 router = fastapi.APIRouter(
@@ -9,4 +10,6 @@ router = fastapi.APIRouter(
 )
 
 router.include_router(probe_router)
+router.include_router(metrics_router)
 router.include_router(score_router)
+router.include_router(debug_router)
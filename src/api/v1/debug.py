@@ -0,0 +1,85 @@
+import typing
+import secrets
+import fastapi
+
+from src.core.config import CONFIG
+from src.core.exception import HTTPException
+from src.model.profile import ProfileSettings
+from src.service import profiler
+
+
+async def _authorize(debug_token: typing.Annotated[str | None, fastapi.Header()] = None) -> None:
+    """
+    Debug endpoints are available only if DEBUG_TOKEN is configured and given in Debug-Token header.
+    """
+    if CONFIG.DEBUG_TOKEN is None:
+        raise HTTPException(status_code=404, detail="Not Found", logger_name=__name__)
+
+    if debug_token is None or not secrets.compare_digest(debug_token, CONFIG.DEBUG_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid debug token", logger_name=__name__)
+
+
+router = fastapi.APIRouter(
+    prefix="/debug",
+    tags=["debug"],
+    dependencies=[fastapi.Depends(_authorize)],
+)
+
+
+@router.post("/profile", status_code=201)
+async def start_profile(settings: ProfileSettings) -> dict:
+    """
+    Start profiling of following /score requests (until given number of them completes or given time elapses).
+    :param settings: Profiling mode and extent.
+    :return: Status of the profiling session.
+    """
+    try:
+        return profiler.start(settings)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e), logger_name=__name__)
+
+
+@router.get("/profile")
+async def profile_status() -> dict:
+    """
+    Status of the current (or last) profiling session.
+    :return: Status of the profiling session.
+    """
+    status = profiler.status()
+    if status is None:
+        raise HTTPException(status_code=404, detail="No profiling session", logger_name=__name__)
+
+    return status
+
+
+@router.delete("/profile")
+async def stop_profile() -> dict:
+    """
+    Finish running profiling session early.
+    :return: Status of the profiling session.
+    """
+    status = profiler.stop()
+    if status is None:
+        raise HTTPException(status_code=404, detail="No profiling session", logger_name=__name__)
+
+    return status
+
+
+@router.get("/profile/artifact")
+async def profile_artifact(text: bool = False) -> fastapi.responses.Response:
+    """
+    Download profile of finished profiling session - pstats file (cprofile), collapsed stacks (sampling)
+    or top allocations (tracemalloc).
+    :param text: Human readable summary instead of pstats file (cprofile mode only).
+    :return: Profile file.
+    """
+    artifact = profiler.artifact(text)
+    if artifact is None:
+        raise HTTPException(status_code=404, detail="No finished profiling session", logger_name=__name__)
+
+    content, media_type, filename = artifact
+    return fastapi.responses.Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,415 @@
+import re
+import time
+import typing
+import logging
+import orjson
+import pydantic
+import fastapi
+import fastapi.concurrency
+import fastapi.exceptions
+import fastapi.routing
+
+from src.core import telemetry
+from src.core.config import CONFIG
+from src.core.exception import HTTPException
+from src.model.document import FullDocument
+from src.model.document_set import DocumentSet
+from src.service import cache
+from src.service.ingest import StreamedInput
+
+# bodies smaller than this are decoded straight on the event loop (faster than hand-off to the thread pool) and
+# with the configured sheet storage (fixed per sheet cost of columnar storage outweighs its gains)
+_SMALL_BODY_BYTES = 256 * 1024
+
+
+async def _decode_default(
+    request: fastapi.Request,
+    docs: typing.Annotated[DocumentSet, fastapi.Body()],
+) -> DocumentSet:
+    """
+    Standard FastAPI request body decoding (json + pydantic validation of every sheet cell).
+    Decoding is timed as parse_body stage by ParseTimedRoute (body is decoded before this dependency is called).
+    :param request: Incoming request.
+    :param docs: List of input documents.
+    :return: Set of input documents.
+    """
+    start = ParseTimedRoute.pop_start(request)
+
+    if start is not None:
+        attributes = {
+            "payload_bytes": len(await request.body()),
+            "document_count": len(docs),
+            "cell_count": sum(doc.cell_count for doc in docs),
+        }
+        telemetry.emit([telemetry.StageRecord("parse_body", start, time.time_ns(), attributes)])
+
+    return docs
+
+
+class ParseTimedRoute(fastapi.routing.APIRoute):
+    """
+    Route timing standard FastAPI request body decoding as parse_body stage - the body is read and validated
+    before any dependency is called, i.e. the start is taken when the route handler is entered and the stage
+    is emitted by _decode_default (or by the route itself if decoding fails).
+    """
+    _START = "parse_body_start"
+
+    def get_route_handler(self) -> typing.Callable[[fastapi.Request], typing.Awaitable[fastapi.Response]]:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: fastapi.Request) -> fastapi.Response:
+            setattr(request.state, self._START, time.time_ns())
+
+            try:
+                return await handler(request)
+            except Exception as e:
+                start = self.pop_start(request)
+                if start is not None:
+                    # decoding failed (malformed JSON, invalid documents, too large body, ...)
+                    telemetry.emit([telemetry.StageRecord("parse_body", start, time.time_ns(), {}, type(e).__name__)])
+                raise
+
+        return timed_handler
+
+    @classmethod
+    def pop_start(cls, request: fastapi.Request) -> int | None:
+        """
+        :param request: Incoming request.
+        :return: Start of the request body decoding (None if not timed or already emitted).
+        """
+        start = getattr(request.state, cls._START, None)
+        if start is not None:
+            delattr(request.state, cls._START)
+        return start
+
+
+async def _decode_fast(request: fastapi.Request) -> DocumentSet:
+    """
+    Fast request body decoding - body is parsed by orjson outside of the event loop and sheet matrices
+    are converted straight to columnar (numeric array) storage. Errors have the same shape as the standard ones.
+    :param request: Incoming request.
+    :return: Set of input documents.
+    """
+    body = await request.body()
+
+    if len(body) < _SMALL_BODY_BYTES:
+        return decode(body)
+
+    return await fastapi.concurrency.run_in_threadpool(decode, body)
+
+
+def decode(body: bytes) -> DocumentSet:
+    """
+    Decode raw request body to set of documents.
+    :param body: Raw request body.
+    :return: Set of input documents, raises RequestValidationError for malformed input.
+    """
+    if not body:
+        raise fastapi.exceptions.RequestValidationError(
+            [{"type": "missing", "loc": ("body",), "msg": "Field required", "input": None}],
+        )
+
+    with telemetry.stage("parse_body", payload_bytes=len(body)) as attributes:
+        try:
+            data = orjson.loads(body)
+        except orjson.JSONDecodeError as e:
+            raise _json_error(e.pos, e.msg, e.doc)
+
+        try:
+            docs = DocumentSet.model_validate(data, context={"sheet_storage_mode": _storage_mode(len(body))})
+        except pydantic.ValidationError as e:
+            raise fastapi.exceptions.RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)],
+                body=data,
+            )
+
+        attributes.update(document_count=len(docs), cell_count=sum(doc.cell_count for doc in docs))
+
+    return docs
+
+
+def _storage_mode(size: int) -> str:
+    return "columnar" if size >= _SMALL_BODY_BYTES else CONFIG.SHEET_STORAGE_MODE
+
+
+async def _decode_streaming(request: fastapi.Request) -> StreamedInput:
+    """
+    Streaming request body decoding - documents are parsed one by one as the body is read and aggregated
+    straight away (input documents are never kept all at once). Errors have the same shape as the standard ones.
+    :param request: Incoming request.
+    :return: Aggregated input documents.
+    """
+    docs = StreamedInput(hash_input=cache.backend() is not None)
+    splitter = JSONArraySplitter()
+    stream = request.stream()
+
+    try:
+        # parsing and aggregation of documents (interleaved with reading of the body), errors of reading the body
+        # itself (e.g. 413 of too large body) are passed as they are
+        with telemetry.stage("parse_body", streamed=True) as attributes:
+            async for chunk in stream:
+                try:
+                    await fastapi.concurrency.run_in_threadpool(_consume, splitter, docs, chunk)
+                except (fastapi.exceptions.RequestValidationError, HTTPException) as e:
+                    if not _is_json_error(e):
+                        # invalid document - malformed JSON in the rest of the body takes precedence (as with
+                        # the whole body parsed upfront), the rest is only checked, not validated
+                        async for rest in stream:
+                            await fastapi.concurrency.run_in_threadpool(_check_json, splitter, rest)
+                        splitter.close()
+                    raise
+            splitter.close()
+            attributes.update(payload_bytes=splitter.size, document_count=docs.count, cell_count=docs.cell_count)
+    except JSONArraySplitter.NotArray:
+        # not a JSON array at all (empty body, object, ...) - rest of the body is read to get the standard error
+        body = bytes(splitter.buffer) + b"".join([chunk async for chunk in stream])
+        await fastapi.concurrency.run_in_threadpool(decode, body)
+        raise
+    except JSONArraySplitter.Error as e:
+        raise _json_error(e.pos, e.msg, None)
+
+    return docs
+
+
+def _consume(splitter: "JSONArraySplitter", docs: StreamedInput, chunk: bytes) -> None:
+    """
+    Parse and aggregate all documents completed by given chunk of the request body.
+    """
+    # all completed elements are parsed first, i.e. malformed JSON is reported before invalid documents
+    for data in _parse_elements(splitter.feed(chunk)):
+        try:
+            doc = FullDocument.model_validate(data, context={"sheet_storage_mode": "columnar"})
+        except pydantic.ValidationError as e:
+            raise fastapi.exceptions.RequestValidationError(
+                [{**error, "loc": ("body", docs.count, *error["loc"])} for error in e.errors(include_url=False)],
+                body=data,
+            )
+
+        try:
+            docs.add(doc)
+        except HTTPException:
+            raise
+        except Exception as e:
+            # document not fitting the aggregation (e.g. missing sheets) - same error as of the scoring itself
+            raise HTTPException(
+                status_code=500,
+                logger_name=__name__,
+                logger_lvl=logging.ERROR,
+                logger_msg="scoring failed due to unexpected error: %s",
+                logger_args=(str(e),),
+            )
+
+
+def _parse_elements(elements: list[tuple[int, bytearray]]) -> list[typing.Any]:
+    """
+    :param elements: Raw elements returned by JSONArraySplitter.feed
+    :return: Parsed elements, raises RequestValidationError for malformed JSON
+    """
+    parsed = []
+
+    for pos, element in elements:
+        try:
+            parsed.append(orjson.loads(element))
+        except orjson.JSONDecodeError as e:
+            raise _json_error(pos + e.pos, e.msg, None)
+
+    return parsed
+
+
+def _check_json(splitter: "JSONArraySplitter", chunk: bytes) -> None:
+    """
+    Check that all elements completed by given chunk of the request body are valid JSON.
+    """
+    try:
+        _parse_elements(splitter.feed(chunk))
+    except JSONArraySplitter.Error as e:
+        raise _json_error(e.pos, e.msg, None)
+
+
+def _is_json_error(error: Exception) -> bool:
+    return isinstance(error, fastapi.exceptions.RequestValidationError) and error.errors()[0]["type"] == "json_invalid"
+
+
+def _json_error(pos: int, msg: str, body: typing.Any) -> fastapi.exceptions.RequestValidationError:
+    return fastapi.exceptions.RequestValidationError(
+        [
+            {
+                "type": "json_invalid",
+                "loc": ("body", pos),
+                "msg": "JSON decode error",
+                "input": {},
+                "ctx": {"error": msg},
+            }
+        ],
+        body=body,
+    )
+
+
+class JSONArraySplitter:
+    """
+    Incremental splitter of JSON array (fed chunk by chunk) into its raw elements, only the unfinished element
+    is buffered. Elements are not parsed, only strings and nesting are tracked.
+    """
+    _STRUCTURE = re.compile(rb'[\[\]{}",]')
+    _NESTED_STRUCTURE = re.compile(rb'[\[\]{}"]')     # commas matter only between array elements
+    _STRING = re.compile(rb'["\\]')
+    _WHITESPACE = b" \t\r\n"
+
+    class Error(ValueError):
+        def __init__(self, msg: str, pos: int) -> None:
+            super().__init__(msg)
+            self.msg = msg
+            self.pos = pos
+
+    class NotArray(ValueError):
+        pass
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self._offset = 0            # position of the buffer start within the whole body
+        self._pos = 0               # scan position within the buffer
+        self._start = 0             # start of the current element within the buffer
+        self._depth = 0
+        self._in_string = False
+        self._started = False
+        self._finished = False
+        self._elements = 0
+
+    def feed(self, chunk: bytes) -> list[tuple[int, bytearray]]:
+        """
+        :param chunk: Next chunk of the JSON array
+        :return: List of (position within the whole body, raw element) of elements completed by the chunk
+        """
+        self.buffer += chunk
+        elements = []
+
+        if not self._started:
+            content = self.buffer.lstrip(self._WHITESPACE)
+            if not content:
+                return elements
+            if content[:1] != b"[":
+                raise self.NotArray()
+            self._started = True
+
+        buffer = self.buffer
+        pos = self._pos
+
+        while pos < len(buffer):
+            if self._finished:
+                rest = buffer[pos:].lstrip(self._WHITESPACE)
+                if rest:
+                    raise self.Error("trailing characters", self._offset + len(buffer) - len(rest))
+                pos = len(buffer)
+                break
+
+            if self._in_string:
+                match = self._STRING.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                elif match.group() == b"\\":
+                    if match.end() == len(buffer):
+                        # escaped character in the next chunk
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                else:
+                    self._in_string = False
+                    pos = match.end()
+                continue
+
+            match = (self._STRUCTURE if self._depth <= 1 else self._NESTED_STRUCTURE).search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+
+            char = match.group()
+            pos = match.end()
+
+            if char == b'"':
+                self._in_string = True
+            elif char in (b"[", b"{"):
+                self._depth += 1
+                if self._depth == 1:
+                    self._start = pos
+            elif char in (b"]", b"}"):
+                self._depth -= 1
+                if self._depth < 0 or (self._depth == 0 and char != b"]"):
+                    raise self.Error("unexpected character", self._offset + match.start())
+                if self._depth == 0:
+                    element = buffer[self._start:match.start()]
+                    if self._elements or element.strip(self._WHITESPACE):
+                        elements.append((self._offset + self._start, element))
+                    self._finished = True
+                    self._start = pos
+            elif self._depth == 1:
+                elements.append((self._offset + self._start, buffer[self._start:match.start()]))
+                self._elements += 1
+                self._start = pos
+
+        # drop processed part of the buffer (everything before the current element)
+        del buffer[:self._start]
+        self._offset += self._start
+        self._pos = pos - self._start
+        self._start = 0
+
+        return elements
+
+    @property
+    def size(self) -> int:
+        """
+        Number of bytes fed so far.
+        """
+        return self._offset + len(self.buffer)
+
+    def close(self) -> None:
+        """
+        Check that the whole array has been fed.
+        """
+        if not self._started:
+            raise self.NotArray()
+
+        if not self._finished:
+            raise self.Error("unexpected end of data", self._offset + len(self.buffer))
+
+
+def _inline_refs(schema: typing.Any, defs: dict[str, dict]) -> typing.Any:
+    """
+    Replace references to definitions of JSON schema by the definitions themselves (no recursive models).
+    """
+    if isinstance(schema, dict):
+        if "$ref" in schema:
+            return _inline_refs(defs[schema["$ref"].rpartition("/")[2]], defs)
+        return {key: _inline_refs(value, defs) for key, value in schema.items() if key != "$defs"}
+
+    if isinstance(schema, list):
+        return [_inline_refs(item, defs) for item in schema]
+
+    return schema
+
+
+def _request_body_openapi() -> dict:
+    """
+    OpenAPI request body of decoders reading the body themselves (documented the same as the standard one).
+    """
+    schema = pydantic.TypeAdapter(list[FullDocument]).json_schema()
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _inline_refs(schema, schema.get("$defs", {}))}},
+        },
+    }
+
+
+# decoders reading the body themselves time it on their own (plain route)
+if CONFIG.SCORE_REQUEST_DECODER == "streaming":
+    decode_documents = _decode_streaming
+    openapi_extra = _request_body_openapi()
+    route_class = fastapi.routing.APIRoute
+elif CONFIG.SCORE_REQUEST_DECODER == "fast":
+    decode_documents = _decode_fast
+    openapi_extra = _request_body_openapi()
+    route_class = fastapi.routing.APIRoute
+else:
+    decode_documents = _decode_default
+    openapi_extra = None
+    route_class = ParseTimedRoute
@@ -0,0 +1,27 @@
+import typing
+import fastapi.responses
+
+from src.model.encoded import EncodedDocument
+
+
+class EncodedDocumentResponse(fastapi.responses.JSONResponse):
+    """
+    Response with document already serialized to JSON bytes - sent as is, without re-validation
+    against response model and without re-encoding by FastAPI.
+    """
+
+    def __init__(self, content: EncodedDocument | bytes, status_code: int = 201, **kwargs) -> None:
+        """
+        :param content: Encoded document or raw JSON bytes.
+        :param status_code: HTTP status code.
+        """
+        if isinstance(content, EncodedDocument):
+            content = content.full
+
+        super().__init__(content=content, status_code=status_code, **kwargs)
+
+    def render(self, content: typing.Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+
+        return super().render(content)
@@ -1,10 +1,17 @@
 import fastapi
 
+from src.core import admission, metrics, workers
+from src.core.config import CONFIG
+from src.service import write_behind
+
 
 router = fastapi.APIRouter(
     prefix="/probe",
     tags=["probe"],
 )
+metrics_router = fastapi.APIRouter(
+    tags=["probe"],
+)
 
 
 @router.get("/alive")
@@ -22,11 +29,39 @@ async def alive() -> fastapi.responses.JSONResponse:
 @router.get("/ready")
 async def ready() -> fastapi.responses.JSONResponse:
     """
-    Readiness check endpoint to check if the service is ready to process requests.
+    Readiness check endpoint to check if the service is ready to process requests - not ready while /score
+    requests in flight or results waiting for persistence are over configured thresholds (traffic goes to less
+    loaded replicas meanwhile). With multiple server workers, values of all workers are summed.
     :return: fastapi.responses.JSONResponse
     """
+    in_flight = admission.in_flight() + sum(await workers.others("in_flight"))
+    if CONFIG.READY_MAX_IN_FLIGHT is not None and in_flight > CONFIG.READY_MAX_IN_FLIGHT:
+        return fastapi.responses.JSONResponse(
+            status_code=503,
+            content={"detail": f"Not ready - {in_flight} scoring requests in flight"},
+        )
+
+    backlog = write_behind.backlog() + sum(await workers.others("backlog"))
+    if CONFIG.READY_MAX_BACKLOG is not None and backlog > CONFIG.READY_MAX_BACKLOG:
+        return fastapi.responses.JSONResponse(
+            status_code=503,
+            content={"detail": f"Not ready - {backlog} results waiting for persistence"},
+        )
+
     return fastapi.responses.JSONResponse(
         status_code=200,
         content={"detail": "Ready"},
     )
 
+
+@metrics_router.get("/metrics", response_class=fastapi.responses.PlainTextResponse)
+async def metrics_() -> fastapi.responses.PlainTextResponse:
+    """
+    In-process metrics (requests, pipeline stages, persistence backlog, data target posts, memory), merged over all
+    server workers.
+    :return: fastapi.responses.PlainTextResponse in Prometheus text format
+    """
+    return fastapi.responses.PlainTextResponse(
+        content=metrics.render(await workers.others("metrics")),
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,64 +1,91 @@
 import typing
 import logging
+import functools
 import fastapi
+import fastapi.concurrency
 
+from src.core import executor, metrics, telemetry
 from src.core.config import CONFIG
 from src.core.exception import HTTPException
-from src.model.document import FullDocument, Document
-from src.service import score, data_target
+from src.model.document import FullDocument
+from src.model.document_set import DocumentSet
+from src.model.encoded import EncodedDocument
+from src.service import cache, profiler, score, write_behind
+from src.service.ingest import StreamedInput
+from src.api.v1 import decoder, encoder
 
 
 logger = logging.getLogger(__name__)
 router = fastapi.APIRouter(
     tags=["score"],
+    route_class=decoder.route_class,
 )
 
 
-@router.post("/score", status_code=201)
-def score_(
-    docs: typing.Annotated[list[FullDocument], fastapi.Body()],
+@router.post(
+    "/score",
+    status_code=201,
+    response_model=FullDocument,
+    response_class=encoder.EncodedDocumentResponse,
+    openapi_extra=decoder.openapi_extra,
+)
+async def score_(
+    docs: typing.Annotated[DocumentSet | StreamedInput, fastapi.Depends(decoder.decode_documents)],
     background_tasks: fastapi.BackgroundTasks,
     correlation_id: typing.Annotated[str | None, fastapi.Header()] = None,
-) -> FullDocument:
+) -> encoder.EncodedDocumentResponse:
     """
     Score.
     :param docs: List of documents input documents used for scoring.
     :param correlation_id: Correlation ID for tracing.
     :return: ID of created final scoring document.
     """
-    logger.info(f"acquired request {correlation_id}")
+    logger.info("acquired request %s", correlation_id)
     try:
-        score.validate_input(docs)
-        logger.info("input validation successful")
+        # input over the memory budget is rejected on validation (DocumentSet)
+        if isinstance(docs, StreamedInput):
+            cell_count = docs.cell_count
+        else:
+            cell_count = sum(doc.cell_count for doc in docs)
+        metrics.payload_cells.observe(cell_count)
 
-        mandatory_docs = [
-            list(
-                filter(lambda x: x.type.key == doc_type, docs)
-            )
-            for doc_type in CONFIG.REQUIRED_DOCUMENT_TYPES
-        ]
-        cashflow_docs = list(
-            filter(lambda x: x.type.key == CONFIG.OPTIONAL_CASHFLOW_DOCUMENT_TYPE, docs)
-        )
-        loan_docs = list(
-            filter(lambda x: x.type.key == CONFIG.OPTIONAL_LOAN_DOCUMENT_TYPE, docs)
-        )
+        cache_key = None
+        if isinstance(docs, StreamedInput):
+            cache_key = docs.cache_key
+        elif cache.backend() is not None:
+            cache_key = await fastapi.concurrency.run_in_threadpool(cache.key, docs)
 
-        summary_docs = [score.calculate_summary_document(docs) for docs in mandatory_docs]
-        logger.info("summary document calculation successful")
+        if cache_key is not None:
+            cached_doc = await cache.lookup(cache_key)
 
-        scoring_docs = score.calculate_scoring_documents(summary_docs)
-        logger.info("scoring document calculation successful")
+            if cached_doc is not None:
+                # same input already scored and its results persisted
+                logger.info("returning cached result for request %s", correlation_id)
+                return encoder.EncodedDocumentResponse(cached_doc)
 
-        final_doc = score.calculate_final_document(scoring_docs, cashflow_docs=cashflow_docs, loan_docs=loan_docs)
-        logger.info("final document calculation successful")
+        # streamed input is already aggregated, only small summary documents are left to be calculated
+        cost = 0 if isinstance(docs, StreamedInput) else cell_count
+
+        try:
+            if profiler.profiling_calls():
+                (encoded_docs, stages), stats = await executor.run(profiler.call_profiled, _calculate, docs, cost=cost)
+                profiler.add_stats(stats)
+            else:
+                encoded_docs, stages = await executor.run(_calculate, docs, cost=cost)
+        except Exception as e:
+            # stages up to (and including) the failed one
+            telemetry.emit(telemetry.attached(e))
+            raise
+        telemetry.emit(stages)
+
+        # result is cached only once persisted - a cache hit skips persistence
+        on_written = None
+        if cache_key is not None:
+            on_written = functools.partial(cache.store, cache_key, encoded_docs[-1].full)
 
-        for doc in [*summary_docs, *scoring_docs, final_doc]:
-            background_tasks.add_task(data_target.post_data, Document(**doc.model_dump()), correlation_id)
-            for sheet in doc.sheets:
-                background_tasks.add_task(data_target.post_data, sheet, correlation_id)
+        background_tasks.add_task(write_behind.enqueue, encoded_docs, correlation_id, on_written)
 
-        return final_doc
+        return encoder.EncodedDocumentResponse(encoded_docs[-1])
 
     except HTTPException as e:
         raise e
@@ -67,6 +94,70 @@ def score_(
             status_code=500,
             logger_name=__name__,
             logger_lvl=logging.ERROR,
-            logger_msg=f"scoring failed due to unexpected error: {str(e)}",
+            logger_msg="scoring failed due to unexpected error: %s",
+            logger_args=(str(e),),
         )
+    finally:
+        profiler.request_done()
+
+
+def _calculate(docs: DocumentSet | StreamedInput) -> tuple[list[EncodedDocument], list[telemetry.StageRecord]]:
+    """
+    Scoring pipeline (CPU-bound, may be executed in worker process).
+    Results are serialized here (once), i.e. only bytes are passed back from worker process.
+    Stages are only recorded (emitted to telemetry by the caller, i.e. by the main process), on failure they are
+    attached to the raised exception.
+    :param docs: List of documents input documents used for scoring (or their aggregates if streamed).
+    :return: Encoded summary documents, scoring documents and final scoring document (last), recorded stages.
+    """
+    with telemetry.recording() as stages:
+        with telemetry.stage("validate_input", stages, document_count=len(docs)):
+            score.validate_input(docs)
+        logger.info("input validation successful")
+
+        if isinstance(docs, StreamedInput):
+            with telemetry.stage("calculate_summary_document", stages, streamed=True):
+                summary_docs = docs.summary_documents()
+            aggregates = docs.aggregates
+        else:
+            mandatory_docs = [docs.of_type(doc_type) for doc_type in CONFIG.REQUIRED_DOCUMENT_TYPES]
+            cashflow_docs = docs.of_type(CONFIG.OPTIONAL_CASHFLOW_DOCUMENT_TYPE)
+            loan_docs = docs.of_type(CONFIG.OPTIONAL_LOAN_DOCUMENT_TYPE)
+
+            summary_docs = []
+            for doc_type, type_docs in zip(CONFIG.REQUIRED_DOCUMENT_TYPES, mandatory_docs):
+                with telemetry.stage(
+                    "calculate_summary_document",
+                    stages,
+                    document_type=doc_type,
+                    document_count=len(type_docs),
+                    cell_count=sum(doc.cell_count for doc in type_docs),
+                ):
+                    summary_docs.append(score.calculate_summary_document(type_docs))
+            aggregates = score.OptionalAggregates.from_documents(cashflow_docs, loan_docs)
+        logger.info("summary document calculation successful")
+
+        with telemetry.stage(
+            "calculate_scoring_documents",
+            stages,
+            document_count=len(summary_docs),
+            cell_count=sum(doc.cell_count for doc in summary_docs),
+        ):
+            scoring_docs = score.calculate_scoring_documents(summary_docs)
+        logger.info("scoring document calculation successful")
+
+        with telemetry.stage(
+            "calculate_final_document",
+            stages,
+            document_count=len(scoring_docs),
+            cell_count=sum(doc.cell_count for doc in scoring_docs),
+        ):
+            final_doc = score.calculate_final_document(scoring_docs, aggregates=aggregates)
+        logger.info("final document calculation successful")
+
+        output_docs = [*summary_docs, *scoring_docs, final_doc]
+        with telemetry.stage("serialize_response", stages, document_count=len(output_docs)) as attributes:
+            encoded_docs = [EncodedDocument.from_document(doc) for doc in output_docs]
+            attributes["payload_bytes"] = sum(len(item) for doc in encoded_docs for item in doc.items)
 
+    return encoded_docs, stages
@@ -0,0 +1,166 @@
+import time
+import asyncio
+import logging
+import collections
+
+from src.core import metrics, workers
+from src.core.config import CONFIG
+from src.core.exception import send_http_error
+
+
+logger = logging.getLogger(__name__)
+
+queue_wait = metrics.Histogram(
+    "score_admission_wait_seconds",
+    "Time /score requests waited for admission",
+    metrics.LATENCY_BUCKETS,
+)
+rejections = metrics.Counter(
+    "score_admission_rejections",
+    "/score requests rejected by admission control",
+    labels=("reason",),
+)
+
+
+class Limiter:
+    """
+    Limit of concurrently processed requests with bounded queue of requests waiting for admission (FIFO).
+    """
+
+    def __init__(self, limit: int | None, queue_size: int) -> None:
+        """
+        :param limit: Maximal number of running requests (None - unlimited, requests are only counted)
+        :param queue_size: Maximal number of waiting requests
+        """
+        self.limit = limit
+        self.queue_size = queue_size
+        self.running = 0
+        self._waiters: collections.deque[asyncio.Future] = collections.deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def full(self) -> bool:
+        """
+        Whether a new request would have to wait but the queue is full.
+        """
+        return not self._available() and self.waiting >= self.queue_size
+
+    async def acquire(self, timeout: float) -> bool:
+        """
+        :param timeout: Seconds to wait for admission
+        :return: False if the request was not admitted in time
+        """
+        # waiting requests go first, i.e. a new request does not overtake the queue
+        if not self._waiters and self._available():
+            self.running += 1
+            return True
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # slot is handed over by release (running count already includes it)
+            await asyncio.wait_for(waiter, timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # cancelled just after the slot was handed over
+                await self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    async def release(self) -> None:
+        # slot is handed over to the first request still waiting (others may have just timed out)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+        self.running -= 1
+
+    def _available(self) -> bool:
+        return self.limit is None or self.running < self.limit
+
+
+_limiter: Limiter | None = None
+
+
+def limiter() -> Limiter:
+    """
+    Limiter of /score requests configured by SCORE_MAX_CONCURRENCY and SCORE_QUEUE_SIZE (created on first use).
+    """
+    global _limiter
+
+    if _limiter is None:
+        _limiter = Limiter(CONFIG.SCORE_MAX_CONCURRENCY, CONFIG.SCORE_QUEUE_SIZE)
+
+    return _limiter
+
+
+def in_flight() -> int:
+    """
+    Number of /score requests being processed or waiting for admission.
+    """
+    return _limiter.running + _limiter.waiting if _limiter is not None else 0
+
+
+metrics.Gauge("score_requests_running", "/score requests being processed", lambda: limiter().running)
+metrics.Gauge("score_requests_queued", "/score requests waiting for admission", lambda: limiter().waiting)
+workers.share("in_flight", in_flight)
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware admitting requests of given paths (before their body is read) - at most SCORE_MAX_CONCURRENCY
+    requests are processed concurrently, others wait up to SCORE_QUEUE_WAIT seconds in the queue. Requests are
+    rejected straight away with 429 when the queue is full and with 503 when not admitted in time.
+    """
+
+    def __init__(self, app, paths: tuple[str, ...]) -> None:
+        self.app = app
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        request_limiter = limiter()
+
+        if request_limiter.full():
+            rejections.inc(reason="queue_full")
+            return await send_http_error(
+                send,
+                429,
+                "Too many requests",
+                {"Retry-After": "1"},
+                logger_name=__name__,
+                logger_msg="Admission queue full (%s requests waiting)",
+                logger_args=(request_limiter.waiting,),
+            )
+
+        start = time.perf_counter()
+        admitted = await request_limiter.acquire(CONFIG.SCORE_QUEUE_WAIT)
+        queue_wait.observe(time.perf_counter() - start)
+
+        if not admitted:
+            rejections.inc(reason="timeout")
+            return await send_http_error(
+                send,
+                503,
+                "Service overloaded",
+                {"Retry-After": "1"},
+                logger_name=__name__,
+                logger_msg="Request not admitted within %s s",
+                logger_args=(CONFIG.SCORE_QUEUE_WAIT,),
+            )
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await request_limiter.release()
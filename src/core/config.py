@@ -1,3 +1,4 @@
+import typing
 import pydantic
 import pydantic_settings
 
@@ -8,6 +9,58 @@ class Config(pydantic_settings.BaseSettings):
     """
     # Data Target
     DATA_TARGET_URL: str = "http://faspo-store-service/api/v1/document"
+    DATA_TARGET_BULK_URL: str | None = None
+    DATA_TARGET_BULK_RETRY_INTERVAL: float = 300.0
+    DATA_TARGET_CONCURRENCY: int = 50
+    DATA_TARGET_REQUEST_CONCURRENCY: int = 8
+    DATA_TARGET_ORDERED_WRITES: bool = True
+    DATA_TARGET_POOL_SIZE: int = 100
+    DATA_TARGET_POOL_SIZE_PER_HOST: int = 0
+    DATA_TARGET_KEEPALIVE_TIMEOUT: float = 30.0
+    DATA_TARGET_TIMEOUT: float = 60.0
+    DATA_TARGET_CONNECT_TIMEOUT: float = 5.0
+
+    # Persistence (write-behind queue)
+    PERSISTENCE_QUEUE_SIZE: int = 1000
+    PERSISTENCE_WORKERS: int = 4
+    PERSISTENCE_RETRY_ATTEMPTS: int = 5
+    PERSISTENCE_RETRY_BACKOFF: float = 0.5
+    PERSISTENCE_RETRY_BACKOFF_MAX: float = 30.0
+    PERSISTENCE_SPOOL_PATH: str | None = None
+    PERSISTENCE_SHUTDOWN_TIMEOUT: float = 10.0
+
+    # Result cache
+    RESULT_CACHE_BACKEND: str | None = None
+    RESULT_CACHE_MAX_ENTRIES: int = 1000
+    RESULT_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    RESULT_CACHE_TTL: float = 3600.0
+
+    # Server
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8080
+    SERVER_WORKERS: int = pydantic.Field(default=1, ge=1)
+    SERVER_LOOP: typing.Literal["auto", "asyncio", "uvloop"] = "auto"
+    SERVER_HTTP: typing.Literal["auto", "h11", "httptools"] = "auto"
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEP_ALIVE: int = 65
+    SERVER_MAX_REQUESTS: int | None = None
+    SERVER_MAX_REQUESTS_JITTER: int | None = None
+    SERVER_GRACEFUL_TIMEOUT: int | None = 30
+    SERVER_STATE_DIR: str | None = None
+
+    # Admission control
+    SCORE_MAX_CONCURRENCY: int | None = None
+    SCORE_QUEUE_SIZE: int = 100
+    SCORE_QUEUE_WAIT: float = 5.0
+    READY_MAX_IN_FLIGHT: int | None = None
+    READY_MAX_BACKLOG: int | None = None
+
+    # Memory guardrails
+    REQUEST_MAX_BYTES: int | None = None
+    REQUEST_MEMORY_BUDGET: int | None = None
+    REQUEST_MEMORY_FACTOR: float = 6.0
+    REQUEST_MEMORY_WAIT: float = 10.0
+    REQUEST_MEMORY_TRACKING: bool = False
 
     # Constants
     REQUIRED_DOCUMENT_TYPES: list[str] = ["001", "002"]
@@ -15,8 +68,31 @@ class Config(pydantic_settings.BaseSettings):
     OPTIONAL_CASHFLOW_DOCUMENT_TYPE: str = "003"
     OPTIONAL_LOAN_DOCUMENT_TYPE: str = "080"
 
+    # Data model
+    SHEET_STORAGE_MODE: typing.Literal["list", "columnar"] = "list"
+
+    # Execution
+    SUMMARY_MODE: typing.Literal["full", "incremental"] = "full"
+    SUMMARY_WINDOW_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    SCORE_REQUEST_DECODER: typing.Literal["default", "fast", "streaming"] = "default"
+    SCORE_EXECUTION_MODE: typing.Literal["thread", "process"] = "thread"
+    SCORE_PROCESS_POOL_SIZE: int | None = None
+    SCORE_PROCESS_MIN_CELLS: int = 50_000
+
     # General
     LOG_LEVEL: pydantic.constr(to_upper=True) = "INFO"
+    LOG_QUEUE: bool = True
+    LOG_SAMPLING: dict[str, float] = {}
+    TELEMETRY_EXPORTER: typing.Literal["azure", "console", "memory", "none"] = "azure"
+    TELEMETRY_SETUP: typing.Literal["background", "blocking"] = "background"
+    DEBUG_TOKEN: str | None = None
+
+    @pydantic.model_validator(mode="after")
+    def _check_max_requests(self) -> "Config":
+        # a single server process is not replaced by a new one, it would just exit
+        if self.SERVER_MAX_REQUESTS is not None and self.SERVER_WORKERS == 1:
+            raise ValueError("SERVER_MAX_REQUESTS requires multiple SERVER_WORKERS")
+        return self
 
 
 CONFIG = Config()
@@ -1,3 +1,4 @@
+import orjson
 import logging
 import fastapi
 
@@ -16,10 +17,15 @@ class HTTPException(fastapi.HTTPException):
         logger_name: str = __name__,
         logger_lvl: int = logging.WARNING,
         logger_msg: str = None,
+        logger_args: tuple = (),
     ) -> None:
+        """
+        :param logger_msg: Logged message (detail by default), formatted with logger_args lazily (only if the level
+                           is enabled, by the logging thread)
+        """
         logging.getLogger(logger_name).log(
-            level=logger_lvl,
-            msg=f"HTTP {status_code} - {logger_msg or detail}",
+            logger_lvl,
+            *_log_message(status_code, detail, logger_msg, logger_args),
             stacklevel=2,
         )
         super().__init__(
@@ -27,3 +33,50 @@ class HTTPException(fastapi.HTTPException):
             detail=detail,
             headers=headers,
         )
+
+    def __reduce__(self):
+        # exception was already logged where it was raised (e.g. in a worker process), so it is restored without logging
+        # (attributes added after it was raised, e.g. recorded stages, are kept)
+        return _restore_http_exception, (self.status_code, self.detail, self.headers), self.__dict__
+
+
+def _restore_http_exception(status_code: int, detail: str, headers: dict) -> HTTPException:
+    """
+    Restore pickled HTTPException without logging its occurrence again.
+    """
+    exception = HTTPException.__new__(HTTPException)
+    fastapi.HTTPException.__init__(exception, status_code=status_code, detail=detail, headers=headers)
+    return exception
+
+
+async def send_http_error(
+    send,
+    status_code: int,
+    detail: str,
+    headers: dict[str, str] | None = None,
+    *,
+    logger_name: str = __name__,
+    logger_msg: str = None,
+    logger_args: tuple = (),
+) -> None:
+    """
+    Send error response straight from ASGI middleware, i.e. without reading the request body (same shape
+    and logging as HTTPException responses).
+    """
+    logging.getLogger(logger_name).warning(*_log_message(status_code, detail, logger_msg, logger_args), stacklevel=2)
+
+    raw_headers = [(b"content-type", b"application/json")]
+    raw_headers.extend((name.lower().encode(), value.encode()) for name, value in (headers or {}).items())
+
+    await send({"type": "http.response.start", "status": status_code, "headers": raw_headers})
+    await send({"type": "http.response.body", "body": orjson.dumps({"detail": detail})})
+
+
+def _log_message(status_code: int, detail: str, logger_msg: str | None, logger_args: tuple) -> tuple:
+    """
+    :return: Logged message and its arguments
+    """
+    if logger_args:
+        return f"HTTP %s - {logger_msg}", status_code, *logger_args
+
+    return "HTTP %s - %s", status_code, logger_msg or detail
@@ -0,0 +1,131 @@
+import os
+import math
+import typing
+import asyncio
+import logging
+import tracemalloc
+import multiprocessing
+import concurrent.futures
+import asgi_correlation_id
+import fastapi.concurrency
+
+from src.core import memory
+from src.core.config import CONFIG
+from src.core.logging import setup_worker_logging
+
+
+logger = logging.getLogger(__name__)
+_process_pool: concurrent.futures.ProcessPoolExecutor | None = None
+_CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def start_process_pool() -> None:
+    """
+    Start process pool for CPU-bound work (only if enabled by configuration).
+    """
+    global _process_pool
+
+    if CONFIG.SCORE_EXECUTION_MODE != "process" or _process_pool is not None:
+        return
+
+    # CPUs are shared by pools of all server workers
+    pool_size = CONFIG.SCORE_PROCESS_POOL_SIZE or max(1, _available_cpus() // CONFIG.SERVER_WORKERS)
+
+    _process_pool = concurrent.futures.ProcessPoolExecutor(
+        max_workers=pool_size,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=setup_worker_logging,
+    )
+    logger.info("process pool started with %s workers", pool_size)
+
+
+def _available_cpus() -> int:
+    """
+    Number of CPUs the process may use - CPUs it is allowed to run on, limited by CPU quota of its cgroup (container
+    CPU limit, rounded up).
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+
+    try:
+        # cgroup v2 ("<quota> <period>" or "max <period>")
+        with open(f"{_CGROUP_ROOT}/cpu.max") as file:
+            quota, period = file.read().split()[:2]
+    except (OSError, ValueError):
+        try:
+            # cgroup v1 (quota -1 if not limited)
+            with open(f"{_CGROUP_ROOT}/cpu/cpu.cfs_quota_us") as quota_file, \
+                    open(f"{_CGROUP_ROOT}/cpu/cpu.cfs_period_us") as period_file:
+                quota, period = quota_file.read().strip(), period_file.read().strip()
+        except OSError:
+            return cpus
+
+    if quota in ("max", "-1"):
+        return cpus
+
+    return max(1, min(cpus, math.ceil(int(quota) / int(period))))
+
+
+def shutdown_process_pool() -> None:
+    """
+    Shut down process pool (if running) - waits for running calls, submitted calls not started yet are cancelled.
+    """
+    global _process_pool
+
+    if _process_pool is None:
+        return
+
+    _process_pool.shutdown(wait=True, cancel_futures=True)
+    _process_pool = None
+    logger.info("process pool shut down")
+
+
+async def run(func: typing.Callable, *args, cost: int = 0) -> typing.Any:
+    """
+    Run CPU-bound function outside of event loop - in process pool for expensive calls, in thread pool otherwise.
+    :param func: Function to be called (must be picklable, i.e. module level function)
+    :param args: Positional arguments of the function (must be picklable)
+    :param cost: Estimated cost of the call (number of processed cells)
+    :return: Return value of the function
+    """
+    if _process_pool is None or cost < CONFIG.SCORE_PROCESS_MIN_CELLS:
+        return await fastapi.concurrency.run_in_threadpool(func, *args)
+
+    peaks = memory.pool_peaks.get()
+
+    result, peak = await asyncio.get_running_loop().run_in_executor(
+        _process_pool,
+        _call_in_worker,
+        asgi_correlation_id.correlation_id.get(),
+        peaks is not None,
+        func,
+        *args,
+    )
+
+    if peak is not None:
+        peaks.append(peak)
+
+    return result
+
+
+def _call_in_worker(
+    correlation_id: str | None,
+    trace_memory: bool,
+    func: typing.Callable,
+    *args,
+) -> tuple[typing.Any, int | None]:
+    """
+    Call function in worker process with correlation ID of the originating request (for logging).
+    :param trace_memory: Whether peak memory of the call is traced (request memory tracking)
+    :return: Return value of the function and peak traced memory (None if not traced)
+    """
+    asgi_correlation_id.correlation_id.set(correlation_id)
+
+    if not trace_memory or tracemalloc.is_tracing():
+        return func(*args), None
+
+    tracemalloc.start(1)
+    try:
+        result = func(*args)
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
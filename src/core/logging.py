@@ -1,57 +1,166 @@
+import copy
+import queue
+import random
 import logging
 import logging.config
-import azure.monitor.opentelemetry
-import azure.monitor.opentelemetry.exporter
+import logging.handlers
 
 from src.core.config import CONFIG
 
 
+_listeners: list[logging.handlers.QueueListener] = []
+
+# message arguments formatted by the listener thread, i.e. they must not change after the record is logged
+_IMMUTABLE_ARGS = (str, int, float, bool, bytes, type(None))
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Handler handing records off to the listener thread as they are, i.e. message formatting (and I/O) is done by
+    the listener - only the level check, filters and queueing are left on the logging thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # records are consumed in this process, no need to format them (and to drop args / exc_info) upfront -
+        # unless an argument is mutable (could be changed before the listener formats the message)
+        if isinstance(record.args, tuple) and all(isinstance(arg, _IMMUTABLE_ARGS) for arg in record.args):
+            return record
+
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+class _SamplingFilter(logging.Filter):
+    """
+    Keeps given fraction of INFO (and lower) records of given loggers (including their children),
+    warnings and errors are always kept.
+    """
+
+    def __init__(self, rates: dict[str, float]) -> None:
+        """
+        :param rates: Fraction of records kept per logger name
+        """
+        super().__init__()
+        self.rates = rates
+        self._cache: dict[str, float | None] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        if record.name not in self._cache:
+            self._cache[record.name] = self._rate(record.name)
+
+        rate = self._cache[record.name]
+        return rate is None or random.random() < rate
+
+    def _rate(self, name: str) -> float | None:
+        # the most specific configured logger applies
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return None
+
+
 def setup_logging():
     """
-    Set up logging configuration.
+    Set up logging configuration (telemetry export is set up separately, see telemetry.start_setup).
+    Output of the root logger is written by a background thread (LOG_QUEUE) and INFO records of configured
+    loggers are sampled (LOG_SAMPLING).
     """
-    azure.monitor.opentelemetry.configure_azure_monitor(
-        logger_name="src",
-        instrumentation_options={
-            "flask": {"enabled": False},
-            "django": {"enabled": False},
-            "psycopg2": {"enabled": False},
-        }
-    )
+    stop_logging()
 
     logging.getLogger("uvicorn.access").addFilter(
-        lambda record: record.getMessage().find("/probe/") == -1
+        lambda record: record.getMessage().find("/probe/") == -1 and record.getMessage().find("/metrics") == -1
     )
 
-    logging.config.dictConfig(
-        {
-            "version": 1,
-            "disable_existing_loggers": False,
-            "filters": {
-                "correlation-id-filter": {
-                    "()": "asgi_correlation_id.CorrelationIdFilter",
-                    "uuid_length": 16,
-                    "default_value": "0" * 16,
-                },
-            },
-            "formatters": {
-                "stdout-fmt": {
-                    "class": "logging.Formatter",
-                    "format": "%(asctime)s | %(levelname)-7s | %(name)-30s | %(funcName)-30s | %(correlation_id)-16s | %(message)s",
-                },
+    logging.config.dictConfig(_logging_config())
+
+    root = logging.getLogger()
+
+    if CONFIG.LOG_QUEUE:
+        queue_handlers(root)
+
+    if CONFIG.LOG_SAMPLING:
+        for handler in root.handlers:
+            handler.addFilter(_SamplingFilter(CONFIG.LOG_SAMPLING))
+
+
+def queue_handlers(logger: logging.Logger) -> None:
+    """
+    Replace handlers of the logger by a queue served by a background thread (listener) passing records to them.
+    Filters of the handlers are moved to the queue, i.e. they still run on the logging thread (e.g. correlation ID
+    of the current request is taken there).
+    :param logger: Logger
+    """
+    handlers = [handler for handler in logger.handlers if not isinstance(handler, _QueueHandler)]
+    if not handlers:
+        return
+
+    queue_handler = _QueueHandler(queue.SimpleQueue())
+
+    for handler in handlers:
+        logger.removeHandler(handler)
+        for log_filter in list(handler.filters):
+            handler.removeFilter(log_filter)
+            if log_filter not in queue_handler.filters:
+                queue_handler.addFilter(log_filter)
+
+    logger.addHandler(queue_handler)
+
+    listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+
+
+def stop_logging() -> None:
+    """
+    Stop background logging threads, records already queued are written first.
+    """
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def setup_worker_logging():
+    """
+    Set up logging configuration for worker processes (stdout only, telemetry is exported by the main process).
+    """
+    logging.config.dictConfig(_logging_config())
+
+
+def _logging_config() -> dict:
+    """
+    Logging configuration shared by the main and worker processes.
+    """
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "filters": {
+            "correlation-id-filter": {
+                "()": "asgi_correlation_id.CorrelationIdFilter",
+                "uuid_length": 16,
+                "default_value": "0" * 16,
             },
-            "handlers": {
-                "stdout-handler": {
-                    "class": "logging.StreamHandler",
-                    "filters": ["correlation-id-filter"],
-                    "formatter": "stdout-fmt",
-                },
+        },
+        "formatters": {
+            "stdout-fmt": {
+                "class": "logging.Formatter",
+                "format": "%(asctime)s | %(levelname)-7s | %(name)-30s | %(funcName)-30s | %(correlation_id)-16s | %(message)s",
             },
-            "root": {"handlers": ["stdout-handler"], "level": CONFIG.LOG_LEVEL},
-            "loggers": {
-                "azure.monitor.opentelemetry": {"level": logging.WARNING},
-                "azure.core.pipeline.policies.http_logging_policy": {"level": logging.WARNING},
+        },
+        "handlers": {
+            "stdout-handler": {
+                "class": "logging.StreamHandler",
+                "filters": ["correlation-id-filter"],
+                "formatter": "stdout-fmt",
             },
-        }
-    )
-
+        },
+        "root": {"handlers": ["stdout-handler"], "level": CONFIG.LOG_LEVEL},
+        "loggers": {
+            "azure.monitor.opentelemetry": {"level": logging.WARNING},
+            "azure.core.pipeline.policies.http_logging_policy": {"level": logging.WARNING},
+        },
+    }
@@ -0,0 +1,306 @@
+import asyncio
+import logging
+import contextvars
+import tracemalloc
+
+from src.core import metrics
+from src.core.config import CONFIG
+from src.core.exception import HTTPException, send_http_error
+
+
+logger = logging.getLogger(__name__)
+
+# peak memory of a /score request is ~5-6x its JSON body (parsed + validated documents, summary and scoring
+# matrices), ~64 B per sheet cell of validated documents (list storage, incl. intermediate matrices)
+CELL_BYTES = 64
+
+estimate_histogram = metrics.Histogram(
+    "request_memory_estimate_bytes",
+    "Estimated memory cost of /score requests",
+    (1e6, 1e7, 5e7, 1e8, 2.5e8, 5e8, 1e9, 2e9, 4e9),
+)
+peak_histogram = metrics.Histogram(
+    "request_memory_peak_bytes",
+    "Peak traced memory allocated during /score requests by server / process pool (REQUEST_MEMORY_TRACKING only)",
+    (1e6, 1e7, 5e7, 1e8, 2.5e8, 5e8, 1e9, 2e9, 4e9),
+    labels=("process",),
+)
+# peaks traced in process pool workers during the current request (set while the request is tracked)
+pool_peaks: contextvars.ContextVar[list[int] | None] = contextvars.ContextVar("pool_peaks", default=None)
+rejections = metrics.Counter(
+    "request_memory_rejections",
+    "/score requests rejected by memory guardrails",
+    labels=("reason",),
+)
+
+
+_retained: dict[str, int] = {}
+
+
+def retain(owner: str, size: int) -> None:
+    """
+    Report memory retained across requests (caches) - counted against the memory budget of requests.
+    Thread-safe, may be called outside of the event loop.
+    :param owner: Name of the owner (e.g. module name)
+    :param size: Bytes currently retained by the owner
+    """
+    previous = _retained.get(owner, 0)
+    _retained[owner] = size
+
+    if size < previous and _budget is not None:
+        # budget freed up for requests waiting for it
+        _budget.wake()
+
+
+def retained() -> int:
+    """
+    Bytes retained across requests by all owners.
+    """
+    return sum(list(_retained.values()))
+
+
+metrics.Gauge("memory_retained_bytes", "Memory retained across requests (caches)", retained)
+
+
+class MemoryBudget:
+    """
+    Memory budget shared by in-flight requests and memory retained across requests - requests reserve their
+    estimated memory cost and wait (up to given time) while the budget is used up by others.
+    """
+
+    def __init__(self, limit: int) -> None:
+        """
+        :param limit: Budget in bytes
+        """
+        self.limit = limit
+        self.reserved = 0
+        self._released: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def acquire(self, amount: int, timeout: float) -> bool:
+        """
+        Reserve memory, a request larger than the whole budget is admitted only if nothing else is reserved.
+        :param amount: Bytes to be reserved
+        :param timeout: Seconds to wait for the budget
+        :return: False if the budget was not available in time
+        """
+        def _available() -> bool:
+            return self.reserved == 0 or self.reserved + retained() + amount <= self.limit
+
+        if self._released is None:
+            self._released = asyncio.Condition()
+            self._loop = asyncio.get_running_loop()
+
+        if not _available():
+            async with self._released:
+                try:
+                    await asyncio.wait_for(self._released.wait_for(_available), timeout=timeout)
+                except asyncio.TimeoutError:
+                    return False
+
+        self.reserved += amount
+        return True
+
+    def grow(self, amount: int) -> None:
+        """
+        Reserve memory without waiting (cost found out while processing the request).
+        """
+        self.reserved += amount
+
+    async def release(self, amount: int) -> None:
+        self.reserved -= amount
+        await self._notify()
+
+    def wake(self) -> None:
+        """
+        Wake up requests waiting for the budget (budget freed up other than by release, e.g. retained memory shrank).
+        Thread-safe, may be called outside of the event loop.
+        """
+        if self._loop is not None and not self._loop.is_closed():
+            asyncio.run_coroutine_threadsafe(self._notify(), self._loop)
+
+    async def _notify(self) -> None:
+        if self._released is not None:
+            async with self._released:
+                self._released.notify_all()
+
+
+_budget: MemoryBudget | None = None
+
+
+def budget() -> MemoryBudget | None:
+    """
+    Configured memory budget (created on first use).
+    :return: MemoryBudget object or None if REQUEST_MEMORY_BUDGET is not set
+    """
+    global _budget
+
+    if _budget is None and CONFIG.REQUEST_MEMORY_BUDGET is not None:
+        _budget = MemoryBudget(CONFIG.REQUEST_MEMORY_BUDGET)
+
+    return _budget
+
+
+metrics.Gauge(
+    "request_memory_reserved_bytes",
+    "Memory reserved by in-flight /score requests",
+    lambda: _budget.reserved if _budget is not None else 0,
+)
+
+
+def check_cells(cell_count: int) -> None:
+    """
+    Reject input documents whose sheets (declared dimensions) would not fit into the memory budget.
+    :param cell_count: Number of sheet cells of input documents
+    """
+    if CONFIG.REQUEST_MEMORY_BUDGET is not None and cell_count * CELL_BYTES > CONFIG.REQUEST_MEMORY_BUDGET:
+        rejections.inc(reason="cells")
+        raise HTTPException(
+            status_code=413,
+            detail="Request too large",
+            logger_name=__name__,
+            logger_msg="Request with %s sheet cells exceeds memory budget",
+            logger_args=(cell_count,),
+        )
+
+
+class MemoryGuardMiddleware:
+    """
+    ASGI middleware applying memory guardrails to requests of given paths (before their body is read):
+    requests over REQUEST_MAX_BYTES are rejected, memory cost estimated from the body size is reserved
+    in the memory budget (requests wait while the budget is used up) and peak memory is tracked (if enabled).
+    """
+
+    def __init__(self, app, paths: tuple[str, ...]) -> None:
+        self.app = app
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            return await self.app(scope, receive, send)
+
+        content_length = _content_length(scope)
+
+        if CONFIG.REQUEST_MAX_BYTES is not None and (content_length or 0) > CONFIG.REQUEST_MAX_BYTES:
+            rejections.inc(reason="size")
+            return await send_http_error(
+                send,
+                413,
+                "Request too large",
+                logger_name=__name__,
+                logger_msg="Request body of %s B exceeds limit",
+                logger_args=(content_length,),
+            )
+
+        memory_budget = budget()
+        reserved = int((content_length or 0) * CONFIG.REQUEST_MEMORY_FACTOR)
+        estimate_histogram.observe(reserved)
+
+        if memory_budget is not None and not await memory_budget.acquire(reserved, CONFIG.REQUEST_MEMORY_WAIT):
+            rejections.inc(reason="budget")
+            return await send_http_error(
+                send,
+                503,
+                "Service overloaded",
+                {"Retry-After": "1"},
+                logger_name=__name__,
+                logger_msg="Memory budget not available",
+            )
+
+        received = 0
+
+        async def _receive():
+            # body size is checked also for requests without content length (reserved as the body arrives)
+            nonlocal received, reserved
+
+            message = await receive()
+            if message["type"] == "http.request":
+                size = len(message.get("body", b""))
+                received += size
+
+                if CONFIG.REQUEST_MAX_BYTES is not None and received > CONFIG.REQUEST_MAX_BYTES:
+                    rejections.inc(reason="size")
+                    raise HTTPException(
+                        status_code=413,
+                        detail="Request too large",
+                        logger_name=__name__,
+                        logger_msg="Request body exceeds limit of %s B",
+                        logger_args=(CONFIG.REQUEST_MAX_BYTES,),
+                    )
+
+                if memory_budget is not None and content_length is None:
+                    growth = int(size * CONFIG.REQUEST_MEMORY_FACTOR)
+                    memory_budget.grow(growth)
+                    reserved += growth
+
+            return message
+
+        baseline = None
+        if CONFIG.REQUEST_MEMORY_TRACKING:
+            baseline = _start_tracking()
+            # work sent to the process pool is traced by the pool worker (see executor)
+            peaks = []
+            pool_peaks.set(peaks)
+
+        try:
+            await self.app(scope, _receive, send)
+        finally:
+            if memory_budget is not None:
+                await memory_budget.release(reserved)
+
+            if baseline is not None:
+                peak = _stop_tracking(baseline)
+                peak_histogram.observe(peak, process="server")
+                pool_peak = max(peaks, default=0)
+                if peaks:
+                    peak_histogram.observe(pool_peak, process="pool")
+                logger.info(
+                    "request memory: %.1f MB body, %.1f MB estimated, %.1f MB peak traced, %.1f MB in process pool",
+                    received / 2**20,
+                    reserved / 2**20,
+                    peak / 2**20,
+                    pool_peak / 2**20,
+                )
+
+
+_tracked_requests = 0
+
+
+def _start_tracking() -> int:
+    """
+    Start tracking of peak memory of a request - peak is reset only when no other request is tracked,
+    i.e. peak of overlapping requests includes memory of each other (upper bound of the actual one).
+    :return: Traced memory at the request start (baseline)
+    """
+    global _tracked_requests
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(1)
+
+    if _tracked_requests == 0:
+        tracemalloc.reset_peak()
+
+    _tracked_requests += 1
+    return tracemalloc.get_traced_memory()[0]
+
+
+def _stop_tracking(baseline: int) -> int:
+    """
+    :param baseline: Value returned by _start_tracking
+    :return: Peak memory allocated during the request (above its baseline)
+    """
+    global _tracked_requests
+
+    _tracked_requests -= 1
+    return max(0, tracemalloc.get_traced_memory()[1] - baseline)
+
+
+def _content_length(scope) -> int | None:
+    for name, value in scope["headers"]:
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
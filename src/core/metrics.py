@@ -0,0 +1,331 @@
+import os
+import abc
+import time
+import bisect
+import typing
+import operator
+import resource
+import threading
+
+from src.core import workers
+
+
+# Local (in-process) metrics exposed in Prometheus text format, independent of the telemetry exporter.
+# Every thread updates its own shard of a metric (no locking on the hot path), shards are summed on exposition.
+# With multiple server workers, values of all workers are merged on exposition (see workers).
+
+
+class _Metric(abc.ABC):
+    type: str
+    merge: typing.Callable[[typing.Any, typing.Any], typing.Any]
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()) -> None:
+        """
+        :param name: Metric name
+        :param description: Metric description (HELP)
+        :param labels: Label names
+        """
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _shard(self) -> dict:
+        """
+        Values of the current thread (registered on first use).
+        """
+        shard = getattr(self._local, "values", None)
+
+        if shard is None:
+            shard = self._local.values = {}
+            with self._lock:
+                self._shards.append(shard)
+
+        return shard
+
+    def _key(self, labels: dict[str, typing.Any]) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _label_text(self, key: tuple[str, ...], **extra: str) -> str:
+        pairs = [*zip(self.labels, key), *extra.items()]
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def values(self) -> dict[tuple[str, ...], typing.Any]:
+        """
+        :return: Values per label values (merged over all threads)
+        """
+        return self._merged(self.merge)
+
+    @abc.abstractmethod
+    def samples(self, values: dict[tuple[str, ...], typing.Any]) -> list[str]:
+        """
+        :param values: Values per label values
+        :return: Sample lines of the metric in Prometheus text format
+        """
+
+    def render(self, shared: typing.Sequence[dict] = ()) -> list[str]:
+        """
+        :param shared: Snapshots of other worker processes merged into the values of this process
+        """
+        values = self.values()
+
+        for snapshot in shared:
+            for key, value in snapshot.get(self.name, []):
+                key = tuple(key)
+                values[key] = self.merge(values[key], value) if key in values else value
+
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.type}", *self.samples(values)]
+
+    def _merged(self, merge: typing.Callable[[typing.Any, typing.Any], typing.Any]) -> dict:
+        with self._lock:
+            shards = list(self._shards)
+
+        merged = {}
+        for shard in shards:
+            # dict copy is atomic (under GIL), the owning thread may keep updating the shard meanwhile
+            for key, value in shard.copy().items():
+                merged[key] = merge(merged[key], value) if key in merged else value
+
+        return merged
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing value.
+    """
+    type = "counter"
+    merge = staticmethod(operator.add)
+
+    def inc(self, value: float = 1, **labels: typing.Any) -> None:
+        """
+        :param value: Increment
+        :param labels: Label values
+        """
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + value
+
+    def value(self, **labels: typing.Any) -> float:
+        """
+        :return: Current value (summed over all threads)
+        """
+        return self.values().get(self._key(labels), 0)
+
+    def samples(self, values: dict[tuple[str, ...], float]) -> list[str]:
+        return [f"{self.name}_total{self._label_text(key)} {_number(value)}" for key, value in sorted(values.items())]
+
+
+class Gauge(Counter):
+    """
+    Value that can go up and down, either updated by inc / dec or observed on exposition by given callback.
+    """
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        callback: typing.Callable[[], float | dict[tuple[str, ...], float]] | None = None,
+        labels: tuple[str, ...] = (),
+        merge: typing.Callable[[float, float], float] = operator.add,
+    ) -> None:
+        """
+        :param callback: Function returning the value (or value per label values if labels are given)
+        :param merge: Function merging values of two worker processes (sum by default)
+        """
+        super().__init__(name, description, labels)
+        self.callback = callback
+        self.merge = merge
+
+    def dec(self, value: float = 1, **labels: typing.Any) -> None:
+        self.inc(-value, **labels)
+
+    def values(self) -> dict[tuple[str, ...], float]:
+        if self.callback is None:
+            # values of threads are summed regardless of merge of worker processes
+            return self._merged(operator.add)
+
+        values = self.callback()
+        return dict(values) if self.labels else {(): values}
+
+    def samples(self, values: dict[tuple[str, ...], float]) -> list[str]:
+        return [f"{self.name}{self._label_text(key)} {_number(value)}" for key, value in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values in fixed buckets.
+    """
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: typing.Sequence[float],
+        labels: tuple[str, ...] = (),
+    ) -> None:
+        """
+        :param buckets: Upper bounds of buckets (sorted)
+        """
+        super().__init__(name, description, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels: typing.Any) -> None:
+        """
+        :param value: Observed value
+        :param labels: Label values
+        """
+        shard = self._shard()
+        key = self._key(labels)
+
+        values = shard.get(key)
+        if values is None:
+            # counts per bucket (+Inf last), sum
+            values = shard[key] = [0] * (len(self.buckets) + 1) + [0]
+
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def merge(self, a: list, b: list) -> list:
+        return [x + y for x, y in zip(a, b)]
+
+    def count(self, **labels: typing.Any) -> int:
+        """
+        :return: Number of observed values (summed over all threads)
+        """
+        values = self.values().get(self._key(labels))
+        return sum(values[:-1]) if values is not None else 0
+
+    def samples(self, values: dict[tuple[str, ...], list]) -> list[str]:
+        samples = []
+
+        for key, values in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip([*self.buckets, float("inf")], values[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                samples.append(f"{self.name}_bucket{self._label_text(key, le=le)} {cumulative}")
+            samples.append(f"{self.name}_sum{self._label_text(key)} {_number(values[-1])}")
+            samples.append(f"{self.name}_count{self._label_text(key)} {cumulative}")
+
+        return samples
+
+
+_registry: list[_Metric] = []
+
+
+def render(shared: typing.Sequence[dict] = ()) -> str:
+    """
+    All registered metrics in Prometheus text exposition format.
+    :param shared: Snapshots of other worker processes merged into the values of this process
+    """
+    return "\n".join(line for metric in _registry for line in metric.render(shared)) + "\n"
+
+
+def snapshot() -> dict[str, list]:
+    """
+    Current values of all registered metrics (JSON serializable) - shared with other worker processes.
+    """
+    return {metric.name: [[list(key), value] for key, value in metric.values().items()] for metric in _registry}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _resident_memory() -> int:
+    """
+    Current resident set size of the process in bytes (peak one where current is not available).
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+_start = time.monotonic()
+
+LATENCY_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60)
+
+requests = Histogram(
+    "http_request_duration_seconds",
+    "Duration of HTTP requests",
+    LATENCY_BUCKETS,
+    labels=("method", "route", "status"),
+)
+requests_in_flight = Gauge("http_requests_in_flight", "HTTP requests being processed")
+stage_duration = Histogram(
+    "score_stage_duration_seconds",
+    "Duration of a single stage of the scoring pipeline (including store posts)",
+    LATENCY_BUCKETS,
+    labels=("stage", "outcome"),
+)
+payload_cells = Histogram(
+    "score_payload_cells",
+    "Number of sheet cells of scored input documents",
+    (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6, 1e7),
+)
+store_posts = Counter(
+    "store_posts",
+    "Posts to the data target by HTTP status",
+    labels=("endpoint", "status"),
+)
+store_items = Counter(
+    "store_items",
+    "Items (documents and sheets) written to the data target by outcome",
+    labels=("outcome",),
+)
+Gauge("process_resident_memory_bytes", "Resident memory size of the process", _resident_memory)
+Gauge(
+    "process_peak_resident_memory_bytes",
+    "Peak resident memory size of the process",
+    lambda: resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+)
+Gauge("process_uptime_seconds", "Time since the process start", lambda: time.monotonic() - _start, merge=max)
+workers.share("metrics", snapshot)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording duration and number of in-flight HTTP requests (by route template, not raw path).
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = 500
+        start = time.perf_counter()
+        requests_in_flight.inc()
+
+        async def _send(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            requests_in_flight.dec()
+            route = scope.get("route")
+            requests.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=route.path if route is not None else "unmatched",
+                status=status,
+            )
@@ -0,0 +1,81 @@
+import os
+import random
+import shutil
+import signal
+import logging
+import tempfile
+import uvicorn
+
+from src.core.config import CONFIG
+
+
+logger = logging.getLogger(__name__)
+
+
+def options() -> dict:
+    """
+    Options of the uvicorn server according to the configuration.
+    """
+    return {
+        "host": CONFIG.SERVER_HOST,
+        "port": CONFIG.SERVER_PORT,
+        "workers": CONFIG.SERVER_WORKERS,
+        "loop": CONFIG.SERVER_LOOP,
+        "http": CONFIG.SERVER_HTTP,
+        "backlog": CONFIG.SERVER_BACKLOG,
+        "timeout_keep_alive": CONFIG.SERVER_KEEP_ALIVE,
+        "timeout_graceful_shutdown": CONFIG.SERVER_GRACEFUL_TIMEOUT,
+        # logging is set up by the application (in every worker)
+        "log_config": None,
+    }
+
+
+def run() -> None:
+    """
+    Run the application - a single server process or supervisor of SERVER_WORKERS worker processes (every worker
+    runs the whole application incl. its own process pool, write-behind queue and metrics, readiness and metrics
+    are aggregated over the workers through a state directory created for the run unless SERVER_STATE_DIR is set).
+    """
+    state_dir = None
+    if CONFIG.SERVER_WORKERS > 1 and CONFIG.SERVER_STATE_DIR is None:
+        # inherited by the worker processes through the environment
+        state_dir = os.environ["SERVER_STATE_DIR"] = tempfile.mkdtemp(prefix="faspo-workers-")
+
+    try:
+        # application is passed as import string - required by multiple workers (imported by every worker)
+        uvicorn.run("main:app", **options())
+    finally:
+        if state_dir is not None:
+            shutil.rmtree(state_dir, ignore_errors=True)
+            del os.environ["SERVER_STATE_DIR"]
+
+
+class RecyclingMiddleware:
+    """
+    ASGI middleware recycling the worker process - after SERVER_MAX_REQUESTS requests plus random jitter (up to
+    SERVER_MAX_REQUESTS_JITTER, drawn in every worker so that workers are not replaced at the same time) the worker
+    is asked to shut down gracefully (SIGTERM) and the server supervisor starts a new one.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.requests = 0
+        self.limit = None
+
+        if CONFIG.SERVER_MAX_REQUESTS is not None:
+            jitter = CONFIG.SERVER_MAX_REQUESTS_JITTER
+            if jitter is None:
+                jitter = CONFIG.SERVER_MAX_REQUESTS // 10
+            self.limit = CONFIG.SERVER_MAX_REQUESTS + random.randint(0, jitter)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or self.limit is None:
+            return await self.app(scope, receive, send)
+
+        self.requests += 1
+        if self.requests == self.limit:
+            logger.info("worker %s recycled after %s requests", os.getpid(), self.requests)
+            # in-flight requests (incl. this one) are completed before the worker exits
+            os.kill(os.getpid(), signal.SIGTERM)
+
+        await self.app(scope, receive, send)
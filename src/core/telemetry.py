@@ -0,0 +1,206 @@
+import time
+import typing
+import asyncio
+import logging
+import contextlib
+import asgi_correlation_id
+import opentelemetry.trace
+import opentelemetry.metrics
+
+from src.core import metrics
+from src.core.config import CONFIG
+
+
+logger = logging.getLogger(__name__)
+tracer = opentelemetry.trace.get_tracer(__name__)
+meter = opentelemetry.metrics.get_meter(__name__)
+
+stage_duration = meter.create_histogram(
+    name="score.stage.duration",
+    unit="s",
+    description="Duration of a single stage of the scoring pipeline",
+)
+
+# exporters of "memory" telemetry (for tests / benchmarks)
+span_exporter = None
+metric_reader = None
+
+_setup: asyncio.Future | None = None
+
+
+def setup_telemetry() -> None:
+    """
+    Set up export of traces and metrics (and of logs for Azure Monitor) according to TELEMETRY_EXPORTER.
+    """
+    global span_exporter, metric_reader
+
+    if CONFIG.TELEMETRY_EXPORTER == "azure":
+        # imported only when used - azure monitor distro is the slowest import of the application
+        import azure.monitor.opentelemetry
+
+        azure.monitor.opentelemetry.configure_azure_monitor(
+            logger_name="src",
+            instrumentation_options={
+                "flask": {"enabled": False},
+                "django": {"enabled": False},
+                "psycopg2": {"enabled": False},
+            }
+        )
+        return
+
+    if CONFIG.TELEMETRY_EXPORTER == "none":
+        return
+
+    # opentelemetry sdk is a dependency of azure-monitor-opentelemetry
+    import opentelemetry.sdk.trace
+    import opentelemetry.sdk.trace.export
+    import opentelemetry.sdk.trace.export.in_memory_span_exporter
+    import opentelemetry.sdk.metrics
+    import opentelemetry.sdk.metrics.export
+
+    if CONFIG.TELEMETRY_EXPORTER == "console":
+        span_processor = opentelemetry.sdk.trace.export.BatchSpanProcessor(
+            opentelemetry.sdk.trace.export.ConsoleSpanExporter()
+        )
+        reader = opentelemetry.sdk.metrics.export.PeriodicExportingMetricReader(
+            opentelemetry.sdk.metrics.export.ConsoleMetricExporter()
+        )
+    else:
+        span_exporter = opentelemetry.sdk.trace.export.in_memory_span_exporter.InMemorySpanExporter()
+        span_processor = opentelemetry.sdk.trace.export.SimpleSpanProcessor(span_exporter)
+        reader = metric_reader = opentelemetry.sdk.metrics.export.InMemoryMetricReader()
+
+    tracer_provider = opentelemetry.sdk.trace.TracerProvider()
+    tracer_provider.add_span_processor(span_processor)
+    opentelemetry.trace.set_tracer_provider(tracer_provider)
+    opentelemetry.metrics.set_meter_provider(opentelemetry.sdk.metrics.MeterProvider(metric_readers=[reader]))
+
+    logger.info("telemetry exported to %s", CONFIG.TELEMETRY_EXPORTER)
+
+
+def start_setup() -> None:
+    """
+    Set up telemetry on application startup according to TELEMETRY_SETUP - either in background thread
+    (the application serves requests meanwhile, telemetry recorded before the setup is finished is not exported)
+    or straight away. Must be called from the event loop.
+    """
+    global _setup
+
+    if CONFIG.TELEMETRY_SETUP == "blocking":
+        setup_telemetry()
+        return
+
+    _setup = asyncio.get_running_loop().run_in_executor(None, _setup_in_background)
+
+
+async def wait_setup() -> None:
+    """
+    Wait for telemetry set up in background (if any), e.g. before shutdown.
+    """
+    if _setup is not None:
+        await _setup
+
+
+def _setup_in_background() -> None:
+    start = time.perf_counter()
+
+    try:
+        setup_telemetry()
+    except Exception:
+        # telemetry is not essential, the application keeps running without it
+        logger.exception("telemetry setup failed")
+        return
+
+    logger.info("telemetry set up in %.2f s", time.perf_counter() - start)
+
+
+class StageRecord(typing.NamedTuple):
+    """
+    Timing of a single pipeline stage (picklable, i.e. can be passed back from worker process).
+    """
+    name: str
+    start: int          # ns since epoch
+    end: int            # ns since epoch
+    attributes: dict[str, typing.Any]
+    error: str | None = None
+
+
+@contextlib.contextmanager
+def stage(
+    name: str,
+    records: list[StageRecord] | None = None,
+    **attributes: typing.Any,
+) -> typing.Iterator[dict[str, typing.Any]]:
+    """
+    Time pipeline stage - span and stage duration metric. Yields span attributes, attributes known only
+    after the stage (e.g. size of its output) can be added to them.
+    :param name: Stage name
+    :param records: If given, stage is only recorded to the list (to be emitted later, e.g. by the main process
+                    for stages run in worker process), emitted straight away otherwise
+    :param attributes: Span attributes (document count, cell count, payload bytes, ...)
+    """
+    start = time.time_ns()
+    error = None
+
+    try:
+        yield attributes
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        record = StageRecord(name, start, time.time_ns(), attributes, error)
+
+        if records is not None:
+            records.append(record)
+        else:
+            emit([record])
+
+
+@contextlib.contextmanager
+def recording() -> typing.Iterator[list[StageRecord]]:
+    """
+    Collect records of stages run inside (see stage). Records collected until an exception are attached to it,
+    i.e. stages of failed pipeline (possibly run in worker process) can still be emitted by the caller.
+    """
+    records = []
+
+    try:
+        yield records
+    except BaseException as e:
+        e.stage_records = records
+        raise
+
+
+def attached(error: BaseException) -> list[StageRecord]:
+    """
+    :param error: Exception raised inside recording
+    :return: Stages recorded until the exception (empty if not raised inside recording)
+    """
+    return getattr(error, "stage_records", [])
+
+
+def emit(records: list[StageRecord]) -> None:
+    """
+    Emit recorded stages as spans (children of the current span) and stage duration metrics (both telemetry
+    and local ones).
+    Spans are tagged with correlation ID of the current request (unless given by the stage itself).
+    :param records: Recorded stages
+    """
+    correlation_id = asgi_correlation_id.correlation_id.get()
+
+    for record in records:
+        attributes = {"correlation_id": correlation_id, **record.attributes}
+        span = tracer.start_span(
+            record.name,
+            start_time=record.start,
+            # attributes without value (not known for given stage) are left out
+            attributes={key: value for key, value in attributes.items() if value is not None},
+        )
+        if record.error is not None:
+            span.set_status(opentelemetry.trace.StatusCode.ERROR, record.error)
+        span.end(end_time=record.end)
+
+        duration = (record.end - record.start) / 1e9
+        outcome = "failure" if record.error is not None else "success"
+        stage_duration.record(duration, {"stage": record.name, "outcome": outcome})
+        metrics.stage_duration.observe(duration, stage=record.name, outcome=outcome)
@@ -0,0 +1,146 @@
+import os
+import typing
+import asyncio
+import logging
+import orjson
+
+from src.core.config import CONFIG
+
+
+# State shared by worker processes of one server (multiple SERVER_WORKERS) through files in SERVER_STATE_DIR.
+# Every worker periodically publishes values of registered sources to its own file, readiness probe and /metrics
+# aggregate these values over all live workers (values of other workers are up to PUBLISH_INTERVAL seconds old).
+
+PUBLISH_INTERVAL = 1.0
+
+logger = logging.getLogger(__name__)
+
+_sources: dict[str, typing.Callable[[], typing.Any]] = {}
+_publisher: asyncio.Task | None = None
+
+
+def enabled() -> bool:
+    """
+    Whether the state is shared with other worker processes.
+    """
+    return CONFIG.SERVER_STATE_DIR is not None
+
+
+def share(name: str, source: typing.Callable[[], typing.Any]) -> None:
+    """
+    Register value shared with other worker processes.
+    :param name: Name of the value
+    :param source: Function returning the current (JSON serializable) value of this process
+    """
+    _sources[name] = source
+
+
+async def start() -> None:
+    """
+    Start periodic publishing of the shared values (if enabled).
+    """
+    global _publisher
+
+    if not enabled() or _publisher is not None:
+        return
+
+    os.makedirs(CONFIG.SERVER_STATE_DIR, exist_ok=True)
+    _publisher = asyncio.create_task(_publish_periodically(), name="worker-state-publisher")
+
+
+async def stop() -> None:
+    """
+    Stop publishing and remove the published state of this process.
+    """
+    global _publisher
+
+    if _publisher is None:
+        return
+
+    _publisher.cancel()
+    await asyncio.gather(_publisher, return_exceptions=True)
+    _publisher = None
+
+    try:
+        os.remove(_state_path(os.getpid()))
+    except FileNotFoundError:
+        pass
+
+
+async def others(name: str) -> list:
+    """
+    :param name: Name of the shared value
+    :return: Last published values of other live worker processes (empty if sharing is disabled)
+    """
+    if not enabled():
+        return []
+
+    return await asyncio.to_thread(_read_others, name)
+
+
+async def _publish_periodically() -> None:
+    while True:
+        try:
+            state = orjson.dumps({name: source() for name, source in _sources.items()})
+            await asyncio.to_thread(_write_state, state)
+        except Exception as e:
+            logger.error("publishing of worker state failed: %s", str(e))
+
+        await asyncio.sleep(PUBLISH_INTERVAL)
+
+
+def _write_state(state: bytes) -> None:
+    path = _state_path(os.getpid())
+
+    # readers never see a partially written file
+    with open(f"{path}.tmp", "wb") as file:
+        file.write(state)
+    os.replace(f"{path}.tmp", path)
+
+
+def _read_others(name: str) -> list:
+    values = []
+
+    for file_name in os.listdir(CONFIG.SERVER_STATE_DIR):
+        pid = file_name.removesuffix(".json")
+        if not file_name.endswith(".json") or not pid.isdigit() or int(pid) == os.getpid():
+            continue
+
+        path = _state_path(int(pid))
+        if not _alive(int(pid)):
+            # state of a worker that exited without clean up (killed)
+            _remove(path)
+            continue
+
+        try:
+            with open(path, "rb") as file:
+                state = orjson.loads(file.read())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            continue
+
+        if name in state:
+            values.append(state[name])
+
+    return values
+
+
+def _state_path(pid: int) -> str:
+    return os.path.join(CONFIG.SERVER_STATE_DIR, f"{pid}.json")
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    return True
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,206 @@
+import collections.abc
+import numpy as np
+
+
+_NUMERIC_TYPES = {float, int, type(None)}
+_CELL_TYPES = {float, int, bool, str, type(None)}
+_MAX_EXACT_INT = 2 ** 53
+
+
+class ColumnarItems(collections.abc.Sequence):
+    """
+    Compact (columnar) storage of sheet items - numeric columns are kept in a single contiguous float64 array
+    with null mask, other (label) columns are kept as plain lists. Behaves as a read-only sequence of rows.
+    """
+    __slots__ = ("width", "labels", "columns", "values", "mask", "integer")
+
+    def __init__(
+        self,
+        width: int,
+        labels: dict[int, list],
+        columns: np.ndarray,
+        values: np.ndarray,
+        mask: np.ndarray,
+        integer: np.ndarray,
+    ) -> None:
+        """
+        :param width: Number of columns
+        :param labels: Label (non-numeric) columns by column index
+        :param columns: Indices of numeric columns (ascending)
+        :param values: Numeric columns, float64 array of shape (rows, len(columns)), NaN where null
+        :param mask: Null mask of numeric columns, bool array of shape (rows, len(columns))
+        :param integer: Integer cells of numeric columns, bool array of shape (rows, len(columns))
+        """
+        self.width = width
+        self.labels = labels
+        self.columns = columns
+        self.values = values
+        self.mask = mask
+        self.integer = integer
+
+    @classmethod
+    def from_items(cls, items: list[list]) -> "ColumnarItems":
+        """
+        Build columnar storage from list of rows.
+        :param items: Sheet item matrix (all rows of the same length)
+        :return: ColumnarItems object, raises ValueError if items cannot be stored in columnar form
+        """
+        if not isinstance(items, list) or not set(map(type, items)) <= {list}:
+            raise ValueError("items must be a list of lists")
+
+        width = len(items[0]) if items else 0
+        if not set(map(len, items)) <= {width}:
+            raise ValueError("items must be rectangular")
+
+        # all cells are converted at once (numeric columns in a single cast), only types are checked column by column
+        cells = np.array(items, dtype=object) if items else np.empty((0, width), dtype=object)
+        if cells.shape != (len(items), width):
+            raise ValueError("items must be a matrix of scalar cells")
+
+        labels = {}
+        columns = []
+        integer = []
+
+        for j, col in enumerate(cells.T.tolist()):
+            kinds = set(map(type, col))
+
+            if not kinds <= _CELL_TYPES:
+                raise ValueError(f"unsupported cell type in column {j}")
+
+            if not kinds <= _NUMERIC_TYPES:
+                labels[j] = col
+            elif int not in kinds:
+                columns.append(j)
+                integer.append(None)
+            elif float not in kinds:
+                columns.append(j)
+                integer.append(True)
+            else:
+                # integers of mixed column are told apart cell by cell (1 and 1.0 round-trip as given)
+                columns.append(j)
+                integer.append(np.fromiter((type(value) is int for value in col), bool, len(col)))
+
+        try:
+            values = cells[:, columns].astype(np.float64, order="C")
+        except OverflowError:
+            raise ValueError("integer out of float range")
+        mask = np.isnan(values)
+
+        # integers not exactly representable as floats are kept as labels
+        exact = np.array([
+            cell_integer is None or np.max(np.abs(np.where(mask[:, k], 0, values[:, k])), initial=0) < _MAX_EXACT_INT
+            for k, cell_integer in enumerate(integer)
+        ], dtype=bool)
+        if not exact.all():
+            for k in np.flatnonzero(~exact).tolist():
+                labels[columns[k]] = cells[:, columns[k]].tolist()
+            columns = [j for j, keep in zip(columns, exact.tolist()) if keep]
+            integer = [cell_integer for cell_integer, keep in zip(integer, exact.tolist()) if keep]
+            values = values[:, exact]
+            mask = mask[:, exact]
+
+        integer_mask = np.zeros(values.shape, dtype=bool)
+        for k, cell_integer in enumerate(integer):
+            if cell_integer is True:
+                integer_mask[:, k] = ~mask[:, k]
+            elif cell_integer is not None:
+                integer_mask[:, k] = cell_integer
+
+        return cls(
+            width=width,
+            labels=dict(sorted(labels.items())),
+            columns=np.array(columns, dtype=np.intp),
+            values=values,
+            mask=mask,
+            integer=integer_mask,
+        )
+
+    def numeric_block(self, start: int = 0) -> np.ndarray | None:
+        """
+        Numeric part of the items from given column onward (int64 if all columns hold integers, float64 if none).
+        :param start: Index of the first column
+        :return: Array of shape (rows, width - start) or None if the part is not purely numeric, contains nulls
+            or mixes integer and float columns (integers would be promoted to floats)
+        """
+        selected = self.columns >= start
+        integer = self.integer[:, selected]
+
+        if (
+            int(selected.sum()) != self.width - start
+            or
+            self.mask[:, selected].any()
+            or
+            integer.any() and not integer.all()
+        ):
+            return None
+
+        block = self.values[:, selected]
+        if integer.all() and block.shape[1]:
+            return block.astype(np.int64)
+
+        return block
+
+    def to_items(self) -> list[list]:
+        """
+        Convert back to list of rows.
+        """
+        cols = [None] * self.width
+
+        for j, col in self.labels.items():
+            cols[j] = col
+
+        for k, j in enumerate(self.columns.tolist()):
+            values = self.values[:, k]
+            integer = self.integer[:, k]
+            if (integer | self.mask[:, k]).all():
+                col = np.where(self.mask[:, k], 0, values).astype(np.int64).tolist()
+            else:
+                col = values.tolist()
+                for i in np.flatnonzero(integer).tolist():
+                    col[i] = int(col[i])
+
+            if self.mask[:, k].any():
+                for i in np.flatnonzero(self.mask[:, k]).tolist():
+                    col[i] = None
+
+            cols[j] = col
+
+        return [list(row) for row in zip(*cols)] if self.width else [[] for _ in range(len(self))]
+
+    @property
+    def size(self) -> int:
+        """
+        Number of cells.
+        """
+        return len(self) * self.width
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        row = [None] * self.width
+
+        for j, col in self.labels.items():
+            row[j] = col[index]
+
+        for k, j in enumerate(self.columns.tolist()):
+            if not self.mask[index, k]:
+                value = self.values[index, k].item()
+                row[j] = int(value) if self.integer[index, k] else value
+
+        return row
+
+    def __iter__(self):
+        return iter(self.to_items())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ColumnarItems):
+            other = other.to_items()
+
+        return self.to_items() == other
+
+    def __repr__(self) -> str:
+        return f"ColumnarItems({self.to_items()!r})"
@@ -42,3 +42,44 @@ class FullDocument(Document):
     """
     sheets: list[Sheet]
 
+    @classmethod
+    def trusted(cls, *, type: dict, version: dict, sheets: list[Sheet], **data) -> "FullDocument":
+        """
+        Construct document produced by the service itself - i.e. already valid data, skips validation.
+        :param type: Document type information
+        :param version: Document version information
+        :param sheets: Document sheets (already constructed)
+        :param data: Other document fields
+        :return: FullDocument object
+        """
+        return cls.model_construct(
+            type=_DocumentType.model_construct(**type),
+            version=_DocumentVersion.model_construct(**version),
+            sheets=sheets,
+            **data,
+        )
+
+    def header(self) -> Document:
+        """
+        Header-only view of the document (sheets information without sheet data), sheet data are not copied.
+        :return: Document object
+        """
+        return Document.model_construct(
+            inner_type=self.inner_type,
+            id=self.id,
+            subject_id=self.subject_id,
+            type=self.type,
+            period=self.period,
+            version=self.version,
+            sheets=[
+                _SheetInfo.model_construct(id=sheet.id, name=sheet.name, number=sheet.number)
+                for sheet in self.sheets
+            ],
+        )
+
+    @property
+    def cell_count(self) -> int:
+        """
+        Number of cells in all sheets of the document.
+        """
+        return sum(sheet.cell_count for sheet in self.sheets)
@@ -0,0 +1,84 @@
+import typing
+import pydantic
+
+from src.core import memory
+from src.model.document import FullDocument
+
+
+class DocumentSet(pydantic.RootModel[list[FullDocument]]):
+    """
+    Set of input documents indexed (once) by document type and period
+    """
+    _by_type: dict[str, list[FullDocument]] = pydantic.PrivateAttr(default_factory=dict)
+    _by_period: dict[tuple[str, int], list[FullDocument]] = pydantic.PrivateAttr(default_factory=dict)
+    _periods: dict[str, set[int]] = pydantic.PrivateAttr(default_factory=dict)
+
+    @pydantic.model_validator(mode="before")
+    @classmethod
+    def _check_cells(cls, data: typing.Any) -> typing.Any:
+        """
+        Reject input whose sheets would not fit into the memory budget - before validation of every sheet cell.
+        """
+        memory.check_cells(declared_cells(data))
+        return data
+
+    def model_post_init(self, __context) -> None:
+        for doc in self.root:
+            self._by_type.setdefault(doc.type.key, []).append(doc)
+            self._by_period.setdefault((doc.type.key, doc.period.year), []).append(doc)
+            self._periods.setdefault(doc.type.key, set()).add(doc.period.year)
+
+    def __len__(self) -> int:
+        return len(self.root)
+
+    def __iter__(self):
+        return iter(self.root)
+
+    def of_type(self, key: str) -> list[FullDocument]:
+        """
+        Documents of given type (in input order).
+        """
+        return self._by_type.get(key, [])
+
+    def of_period(self, key: str, year: int) -> list[FullDocument]:
+        """
+        Documents of given type and period (in input order).
+        """
+        return self._by_period.get((key, year), [])
+
+    def periods(self, key: str) -> set[int]:
+        """
+        Periods (years) covered by documents of given type.
+        """
+        return self._periods.get(key, set())
+
+    def has_periods(self, key: str, count: int) -> bool:
+        """
+        Whether documents of given type cover exactly given number of consecutive periods.
+        """
+        return consecutive_periods(self.periods(key), count)
+
+
+def consecutive_periods(periods: set[int], count: int) -> bool:
+    """
+    Whether periods (years) are exactly given number of consecutive periods.
+    """
+    return len(periods) == count and (not periods or max(periods) == min(periods) + count - 1)
+
+
+def declared_cells(data: typing.Any) -> int:
+    """
+    Number of sheet cells of raw (not validated) input documents, malformed parts are not counted.
+    """
+    count = 0
+
+    for doc in data if isinstance(data, list) else ():
+        sheets = doc.get("sheets") if isinstance(doc, dict) else None
+
+        for sheet in sheets if isinstance(sheets, list) else ():
+            items = sheet.get("items") if isinstance(sheet, dict) else None
+
+            if isinstance(items, list):
+                count += sum(len(row) for row in items if isinstance(row, list))
+
+    return count
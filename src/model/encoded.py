@@ -0,0 +1,44 @@
+import typing
+import pydantic_core
+
+from src.model.document import FullDocument
+
+
+class EncodedDocument(typing.NamedTuple):
+    """
+    Document serialized (once) to JSON bytes - document header and every sheet are encoded separately
+    and reused both for the HTTP response and for the data target posts.
+    """
+    header: bytes               # Document (with sheets information only)
+    sheets: list[bytes]         # Sheet per item
+    base: bytes | None = None   # FullDocument without sheets (needed for full document only)
+
+    @classmethod
+    def from_document(cls, doc: FullDocument) -> "EncodedDocument":
+        """
+        Encode full document.
+        :param doc: FullDocument object
+        :return: EncodedDocument object
+        """
+        return cls(
+            header=pydantic_core.to_json(doc.header(), by_alias=True),
+            sheets=[pydantic_core.to_json(sheet, by_alias=True) for sheet in doc.sheets],
+            base=pydantic_core.to_json(doc, by_alias=True, exclude={"sheets"}),
+        )
+
+    @property
+    def full(self) -> bytes:
+        """
+        Full document (including sheet data), same as FullDocument JSON.
+        """
+        if self.base is None:
+            raise ValueError("full document is not available")
+
+        return self.base[:-1] + b',"sheets":[' + b",".join(self.sheets) + b"]}"
+
+    @property
+    def items(self) -> list[bytes]:
+        """
+        Items to be stored in the data target - document header followed by its sheets.
+        """
+        return [self.header, *self.sheets]
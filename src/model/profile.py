@@ -0,0 +1,18 @@
+import typing
+import pydantic
+
+
+class ProfileSettings(pydantic.BaseModel):
+    """
+    Settings of on-demand profiling session
+    """
+    mode: typing.Literal["cprofile", "sampling", "tracemalloc"]
+    requests: int | None = pydantic.Field(default=None, gt=0)               # number of /score requests profiled
+    duration: float | None = pydantic.Field(default=None, gt=0, le=3600)    # seconds profiled
+    interval: float = pydantic.Field(default=0.005, ge=0.001, le=1)         # sampling interval (sampling mode only)
+
+    @pydantic.model_validator(mode="after")
+    def _bounded(self) -> "ProfileSettings":
+        if self.requests is None and self.duration is None:
+            raise ValueError("number of requests or duration of profiling is required")
+        return self
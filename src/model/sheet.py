@@ -1,5 +1,9 @@
+import typing
 import pydantic
 
+from src.core.config import CONFIG
+from src.model.columnar import ColumnarItems
+
 
 class _SheetInfo(pydantic.BaseModel):
     """
@@ -14,8 +18,55 @@ class Sheet(_SheetInfo):
     """
     Document sheet data
     """
+    model_config = pydantic.ConfigDict(arbitrary_types_allowed=True)
+
     inner_type: str = pydantic.Field(default="sheet", alias="_type")
     subject_id: str
     doc_id: str
-    items: list[list[float | int | bool | str | None]]
+    items: list[list[float | int | bool | str | None]] | ColumnarItems
+
+    @classmethod
+    def trusted(cls, **data) -> "Sheet":
+        """
+        Construct sheet produced by the service itself - i.e. already valid data, skips validation of every cell.
+        :param data: Sheet fields
+        :return: Sheet object
+        """
+        return cls.model_construct(**data)
+
+    @pydantic.field_validator("items", mode="wrap")
+    @classmethod
+    def _validate_items(
+        cls,
+        value: typing.Any,
+        handler: pydantic.ValidatorFunctionWrapHandler,
+        info: pydantic.ValidationInfo,
+    ) -> typing.Any:
+        """
+        In columnar storage mode items are stored as ColumnarItems (without validation of every single cell),
+        items that cannot be stored in columnar form (ragged rows, ...) fall back to the standard validation.
+        Storage mode can be overridden by "sheet_storage_mode" key of validation context.
+        """
+        storage_mode = (info.context or {}).get("sheet_storage_mode", CONFIG.SHEET_STORAGE_MODE)
+
+        if storage_mode == "columnar" and not isinstance(value, ColumnarItems):
+            try:
+                return ColumnarItems.from_items(value)
+            except ValueError:
+                pass
+
+        return handler(value)
+
+    @pydantic.field_serializer("items")
+    def _serialize_items(self, items: list[list] | ColumnarItems) -> list[list]:
+        return items.to_items() if isinstance(items, ColumnarItems) else items
+
+    @property
+    def cell_count(self) -> int:
+        """
+        Number of cells in the sheet.
+        """
+        if isinstance(self.items, ColumnarItems):
+            return self.items.size
 
+        return sum(len(row) for row in self.items)
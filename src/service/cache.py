@@ -0,0 +1,231 @@
+import abc
+import time
+import typing
+import hashlib
+import logging
+import collections
+import orjson
+import pydantic_core
+import opentelemetry.metrics
+
+from src.core import memory
+from src.core.config import CONFIG
+from src.model.columnar import ColumnarItems
+from src.model.document import FullDocument
+
+
+logger = logging.getLogger(__name__)
+meter = opentelemetry.metrics.get_meter(__name__)
+
+lookup_counter = meter.create_counter(
+    name="result_cache.lookups",
+    description="Result cache lookups",
+)
+
+
+class CacheBackend(abc.ABC):
+    """
+    Result cache storage, maps key (hash of the input) to the encoded final document.
+    """
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """
+        :param key: Cache key
+        :return: Cached value or None if not cached (or expired)
+        """
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: bytes) -> None:
+        """
+        :param key: Cache key
+        :param value: Value to be cached
+        """
+
+    @abc.abstractmethod
+    async def clear(self) -> None:
+        """
+        Remove all cached values.
+        """
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    In-process LRU cache limited by number of entries, total size of values and time to live.
+    Cached values are counted against the memory budget of requests.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float) -> None:
+        """
+        :param max_entries: Maximal number of cached values
+        :param max_bytes: Maximal total size of cached values
+        :param ttl: Seconds a value stays cached
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries: collections.OrderedDict[str, tuple[float, bytes]] = collections.OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires, value = entry
+        if expires <= time.monotonic():
+            self._remove(key)
+            memory.retain(__name__, self.size)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self.size += len(value)
+
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+        memory.retain(__name__, self.size)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+        memory.retain(__name__, self.size)
+
+    def _remove(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self.size -= len(value)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_BACKENDS: dict[str, typing.Callable[[], CacheBackend]] = {
+    "memory": lambda: MemoryCacheBackend(
+        max_entries=CONFIG.RESULT_CACHE_MAX_ENTRIES,
+        max_bytes=CONFIG.RESULT_CACHE_MAX_BYTES,
+        ttl=CONFIG.RESULT_CACHE_TTL,
+    ),
+}
+_backend: CacheBackend | None = None
+
+
+def register_backend(name: str, factory: typing.Callable[[], CacheBackend]) -> None:
+    """
+    Register cache backend, selected by RESULT_CACHE_BACKEND config value.
+    :param name: Backend name
+    :param factory: Function creating the backend (called once, on first use)
+    """
+    _BACKENDS[name] = factory
+
+
+def backend() -> CacheBackend | None:
+    """
+    Configured cache backend (created on first use).
+    :return: CacheBackend object or None if result cache is disabled
+    """
+    global _backend
+
+    if _backend is None and CONFIG.RESULT_CACHE_BACKEND is not None:
+        if CONFIG.RESULT_CACHE_BACKEND not in _BACKENDS:
+            raise ValueError(f"unknown result cache backend {CONFIG.RESULT_CACHE_BACKEND}")
+
+        _backend = _BACKENDS[CONFIG.RESULT_CACHE_BACKEND]()
+        logger.info("result cache enabled with %s backend", CONFIG.RESULT_CACHE_BACKEND)
+
+    return _backend
+
+
+def key(docs: typing.Iterable[FullDocument]) -> str:
+    """
+    Canonical hash of the input documents (document and sheet metadata, sheet data in input order)
+    and of configuration values the result depends on.
+    :param docs: Input documents
+    :return: Cache key
+    """
+    digest = key_hasher()
+
+    for doc in docs:
+        update_key(digest, doc)
+
+    return digest.hexdigest()
+
+
+def key_hasher() -> "hashlib._Hash":
+    """
+    Hasher of the cache key (for input documents hashed one by one), see key.
+    :return: Hash object seeded with configuration values the result depends on
+    """
+    return hashlib.sha256(
+        orjson.dumps(
+            [
+                CONFIG.REQUIRED_DOCUMENT_TYPES,
+                CONFIG.REQUIRED_DOCUMENT_PERIODS,
+                CONFIG.OPTIONAL_CASHFLOW_DOCUMENT_TYPE,
+                CONFIG.OPTIONAL_LOAN_DOCUMENT_TYPE,
+            ]
+        )
+    )
+
+
+def update_key(digest: "hashlib._Hash", doc: FullDocument) -> None:
+    """
+    Add input document to the cache key hasher.
+    :param digest: Hash object created by key_hasher
+    :param doc: Input document
+    """
+    digest.update(pydantic_core.to_json(doc, by_alias=True, exclude={"sheets"}))
+
+    for sheet in doc.sheets:
+        digest.update(pydantic_core.to_json(sheet, by_alias=True, exclude={"items"}))
+        _update_items(digest, sheet.items)
+
+
+def _update_items(digest: "hashlib._Hash", items: list[list] | ColumnarItems) -> None:
+    """
+    Hash sheet items - columnar items are hashed by their arrays (without conversion back to rows).
+    """
+    if not isinstance(items, ColumnarItems):
+        digest.update(b"list")
+        digest.update(pydantic_core.to_json(items))
+        return
+
+    digest.update(b"columnar")
+    digest.update(orjson.dumps([items.width, items.values.shape, [[j, col] for j, col in items.labels.items()]]))
+    for array in (items.columns, items.values, items.mask, items.integer):
+        digest.update(array.tobytes())
+
+
+async def lookup(cache_key: str) -> bytes | None:
+    """
+    Cached final document for given key.
+    :param cache_key: Cache key
+    :return: Encoded final document or None if not cached (or cache disabled)
+    """
+    cache = backend()
+    if cache is None:
+        return None
+
+    value = await cache.get(cache_key)
+    lookup_counter.add(1, {"result": "miss" if value is None else "hit"})
+    return value
+
+
+async def store(cache_key: str, value: bytes) -> None:
+    """
+    Cache final document under given key (no-op if cache is disabled).
+    :param cache_key: Cache key
+    :param value: Encoded final document
+    """
+    cache = backend()
+    if cache is not None:
+        await cache.set(cache_key, value)
@@ -1,30 +1,372 @@
+import time
+import typing
+import asyncio
+import logging
 import aiohttp
 import pydantic
+import opentelemetry.metrics
 
+from src.core import metrics, telemetry
 from src.core.config import CONFIG
 from src.core.exception import HTTPException
+from src.model.encoded import EncodedDocument
 
 
-async def post_data(data: pydantic.BaseModel, correlation_id: str | None = None) -> str:
+logger = logging.getLogger(__name__)
+meter = opentelemetry.metrics.get_meter(__name__)
+_session: aiohttp.ClientSession | None = None
+# bulk endpoint is not used until then (monotonic time) after it was refused, i.e. support is probed again later
+_bulk_unsupported_until: float = 0.0
+_global_semaphore: asyncio.Semaphore | None = None
+
+post_counter = meter.create_counter(
+    name="data_target.post.items",
+    description="Items posted to the data target",
+)
+post_duration = meter.create_histogram(
+    name="data_target.post.duration",
+    unit="s",
+    description="Duration of posting all items of a single request to the data target",
+)
+
+
+async def start_session() -> None:
+    """
+    Start shared (pooled) client session for the data target API, used by all posts of the process.
+    """
+    global _session, _global_semaphore
+
+    if _session is not None:
+        return
+
+    _global_semaphore = asyncio.Semaphore(CONFIG.DATA_TARGET_CONCURRENCY)
+
+    _session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=CONFIG.DATA_TARGET_POOL_SIZE,
+            limit_per_host=CONFIG.DATA_TARGET_POOL_SIZE_PER_HOST,
+            keepalive_timeout=CONFIG.DATA_TARGET_KEEPALIVE_TIMEOUT,
+        ),
+        timeout=aiohttp.ClientTimeout(
+            total=CONFIG.DATA_TARGET_TIMEOUT,
+            connect=CONFIG.DATA_TARGET_CONNECT_TIMEOUT,
+        ),
+    )
+    logger.info("data target session started with pool size %s", CONFIG.DATA_TARGET_POOL_SIZE)
+
+
+async def close_session() -> None:
+    """
+    Close shared client session (if started) together with all its pooled connections.
+    """
+    global _session, _global_semaphore
+
+    if _session is None:
+        return
+
+    await _session.close()
+    _session = None
+    _global_semaphore = None
+    logger.info("data target session closed")
+
+
+def pool_stats() -> dict[str, int]:
+    """
+    Connection pool statistics of the shared client session.
+    :return: Pool limit, number of connections in use and number of idle (keep-alive) connections.
+    """
+    if _session is None or _session.closed:
+        return {"limit": 0, "acquired": 0, "idle": 0}
+
+    connector = _session.connector
+    return {
+        "limit": connector.limit,
+        # aiohttp does not expose pool usage publicly
+        "acquired": len(connector._acquired),
+        "idle": sum(len(conns) for conns in connector._conns.values()),
+    }
+
+
+meter.create_observable_gauge(
+    name="data_target.pool.connections",
+    callbacks=[
+        lambda options: [
+            opentelemetry.metrics.Observation(value, {"state": state})
+            for state, value in pool_stats().items()
+        ]
+    ],
+    description="Connections of the shared data target client session pool",
+)
+
+
+async def post_data(data: pydantic.BaseModel | bytes, correlation_id: str | None = None) -> str:
     """
     Post data to the data target API (store-service most likely).
-    :param data: Data to be posted, should be a Pydantic model.
+    :param data: Data to be posted, should be a Pydantic model (or already encoded JSON).
     :param correlation_id: Correlation ID for tracing the request.
     :return: Response text from the API (ID of created item).
     """
-    async with (
-        aiohttp.ClientSession() as async_session,
-        async_session.post(
-            url=f"{CONFIG.DATA_TARGET_URL}",
-            headers={"Correlation-Id": correlation_id},
-            json=data.model_dump(mode="json", by_alias=True),
-        ) as response,
-    ):
-        if response.status != 201:
-            raise HTTPException(
-                status_code=response.status,
-                detail=f"Data target API request failed: {response.reason}",
-                logger_name=__name__,
-            )
-
-        return await response.text()
+    if _session is None:
+        # outside of application lifespan (scripts, tests) - one-off session
+        async with aiohttp.ClientSession() as async_session:
+            return await _post_data(async_session, data, correlation_id)
+
+    return await _post_data(_session, data, correlation_id)
+
+
+async def post_data_bulk(
+    docs: list[EncodedDocument],
+    correlation_id: str | None = None,
+    written: list[str | None] | None = None,
+    record: bool = True,
+) -> list[str]:
+    """
+    Post all data in a single request to the bulk endpoint of the data target API (JSON array body),
+    falls back to posting items concurrently one by one when bulk endpoint is not configured or not supported
+    by the data target. Outcome of the whole post is logged (and recorded to metrics) once.
+    :param docs: Encoded documents to be posted (each document header followed by its sheets).
+    :param correlation_id: Correlation ID for tracing the request.
+    :param written: IDs of items already written by previous attempt (None for items to be posted), updated
+                    in place as items are written - a retry after partial failure posts the failed items only.
+    :param record: Whether to log and record the outcome (False - recorded by the caller, e.g. once for all
+                   attempts of a retried post, see record_post).
+    :return: Response texts from the API (IDs of created items) in the same order as posted data.
+    """
+    start = time.perf_counter()
+
+    if written is None:
+        written = [None] * sum(len(doc.sheets) + 1 for doc in docs)
+
+    # document header followed by its sheets, items written by previous attempt are left out
+    groups = []
+    pending = []        # indexes of posted items
+    index = 0
+    for doc in docs:
+        head = doc.header if written[index] is None else None
+        rest = [sheet for i, sheet in enumerate(doc.sheets, index + 1) if written[i] is None]
+        pending.extend(i for i in range(index, index + len(doc.sheets) + 1) if written[i] is None)
+        groups.append(_Group(head, rest))
+        index += len(doc.sheets) + 1
+
+    try:
+        results = await _post_data_bulk_or_single(groups, correlation_id)
+    except Exception as e:
+        results = [e] * len(pending)
+
+    failed = []
+    for index, result in zip(pending, results):
+        if isinstance(result, BaseException):
+            failed.append(result)
+        else:
+            written[index] = result
+
+    if record:
+        record_post(correlation_id, len(pending), len(failed), time.perf_counter() - start)
+
+    if failed:
+        raise failed[0]
+
+    return written
+
+
+class _Group(typing.NamedTuple):
+    """
+    Items of a single document to be posted - its header (None if not to be posted) and sheets.
+    """
+    head: bytes | None
+    rest: list[bytes]
+
+    @property
+    def items(self) -> list[bytes]:
+        return [self.head, *self.rest] if self.head is not None else self.rest
+
+
+async def _post_data_bulk_or_single(
+    groups: list[_Group],
+    correlation_id: str | None,
+) -> list[str | BaseException]:
+    """
+    Post data via bulk endpoint if available, concurrently one by one otherwise.
+    """
+    global _bulk_unsupported_until
+
+    if CONFIG.DATA_TARGET_BULK_URL is None or time.monotonic() < _bulk_unsupported_until:
+        return await _post_data_concurrently(groups, correlation_id)
+
+    data = [item for group in groups for item in group.items]
+
+    if _session is None:
+        async with aiohttp.ClientSession() as async_session:
+            results = await _post_data_bulk(async_session, data, correlation_id)
+    else:
+        results = await _post_data_bulk(_session, data, correlation_id)
+
+    if results is None:
+        logger.warning(
+            "data target does not support bulk requests, falling back to single item requests for %s s",
+            CONFIG.DATA_TARGET_BULK_RETRY_INTERVAL,
+        )
+        _bulk_unsupported_until = time.monotonic() + CONFIG.DATA_TARGET_BULK_RETRY_INTERVAL
+        return await _post_data_concurrently(groups, correlation_id)
+
+    return results
+
+
+async def _post_data_concurrently(
+    groups: list[_Group],
+    correlation_id: str | None,
+) -> list[str | BaseException]:
+    """
+    Post data one by one concurrently, limited both per call and globally (across all calls of the process).
+    If ordered writes are required, each document header is written before its sheets.
+    :return: IDs of created items or exceptions of failed posts in the same order as posted data.
+    """
+    global _global_semaphore
+
+    if _global_semaphore is None:
+        _global_semaphore = asyncio.Semaphore(CONFIG.DATA_TARGET_CONCURRENCY)
+    request_semaphore = asyncio.Semaphore(CONFIG.DATA_TARGET_REQUEST_CONCURRENCY)
+
+    async def _post(item: bytes) -> str | BaseException:
+        # per request limit first - a request waiting for its own items does not hold global permits meanwhile
+        async with request_semaphore, _global_semaphore:
+            try:
+                return await post_data(item, correlation_id)
+            except Exception as e:
+                return e
+
+    async def _post_group(group: _Group) -> list[str | BaseException]:
+        if group.head is None:
+            # header already written
+            return list(await asyncio.gather(*(_post(item) for item in group.rest)))
+
+        head = await _post(group.head)
+        if isinstance(head, BaseException):
+            return [head] * len(group.items)
+        return [head, *await asyncio.gather(*(_post(item) for item in group.rest))]
+
+    if not CONFIG.DATA_TARGET_ORDERED_WRITES:
+        return list(await asyncio.gather(*(_post(item) for group in groups for item in group.items)))
+
+    return [result for results in await asyncio.gather(*map(_post_group, groups)) for result in results]
+
+
+def record_post(correlation_id: str | None, total: int, failed: int, duration: float) -> None:
+    """
+    Log and record to metrics the outcome of posting all data of a single request.
+    :param correlation_id: Correlation ID of the request.
+    :param total: Number of posted items.
+    :param failed: Number of items not written.
+    :param duration: Seconds the post took.
+    """
+    outcome = "failure" if failed else "success"
+    post_counter.add(total - failed, {"status": "success"})
+    post_counter.add(failed, {"status": "failure"})
+    post_duration.record(duration, {"outcome": outcome})
+    metrics.store_items.inc(total - failed, outcome="success")
+    metrics.store_items.inc(failed, outcome="failure")
+    logger.log(
+        logging.WARNING if failed else logging.INFO,
+        "data target post %s for request %s: %s of %s items written in %.3fs",
+        outcome,
+        correlation_id,
+        total - failed,
+        total,
+        duration,
+    )
+
+
+async def _post_data(
+    async_session: aiohttp.ClientSession,
+    data: pydantic.BaseModel | bytes,
+    correlation_id: str | None,
+) -> str:
+    """
+    Post data to the data target API using given client session.
+    """
+    if isinstance(data, bytes):
+        # already encoded JSON, sent as is
+        kwargs = {"data": data, "headers": {"Correlation-Id": correlation_id, "Content-Type": "application/json"}}
+    else:
+        kwargs = {"json": data.model_dump(mode="json", by_alias=True), "headers": {"Correlation-Id": correlation_id}}
+
+    with telemetry.stage(
+        "store_post",
+        correlation_id=correlation_id,
+        item_count=1,
+        payload_bytes=len(data) if isinstance(data, bytes) else None,
+    ) as attributes:
+        async with async_session.post(url=f"{CONFIG.DATA_TARGET_URL}", **kwargs) as response:
+            attributes["http_status"] = response.status
+            metrics.store_posts.inc(endpoint="document", status=response.status)
+
+            if response.status != 201:
+                raise HTTPException(
+                    status_code=response.status,
+                    detail=f"Data target API request failed: {response.reason}",
+                    logger_name=__name__,
+                )
+
+            return await response.text()
+
+
+async def _post_data_bulk(
+    async_session: aiohttp.ClientSession,
+    data: list[bytes],
+    correlation_id: str | None,
+) -> list[str | BaseException] | None:
+    """
+    Post data to the bulk endpoint of the data target API using given client session.
+    :return: IDs of created items (or exceptions of failed items) or None if bulk endpoint is not supported.
+    """
+    body = b"[" + b",".join(data) + b"]"
+
+    with telemetry.stage(
+        "store_post_bulk",
+        correlation_id=correlation_id,
+        item_count=len(data),
+        payload_bytes=len(body),
+    ) as attributes:
+        async with async_session.post(
+            url=f"{CONFIG.DATA_TARGET_BULK_URL}",
+            headers={"Correlation-Id": correlation_id, "Content-Type": "application/json"},
+            data=body,
+        ) as response:
+            attributes["http_status"] = response.status
+            metrics.store_posts.inc(endpoint="bulk", status=response.status)
+
+            if response.status in (404, 405, 501):
+                return None
+
+            if response.status not in (200, 201, 207):
+                raise HTTPException(
+                    status_code=response.status,
+                    detail=f"Data target API bulk request failed: {response.reason}",
+                    logger_name=__name__,
+                )
+
+            results = await response.json()
+
+    if len(results) != len(data):
+        raise HTTPException(
+            status_code=502,
+            detail=f"Data target API bulk request returned {len(results)} results for {len(data)} items",
+            logger_name=__name__,
+            logger_msg="Data target API bulk request failed: %s",
+            logger_args=(results,),
+        )
+
+    # per item results: [{"status": 201, "id": "..."}, {"status": 400, "detail": "..."}, ...]
+    failed = [(i, result) for i, result in enumerate(results) if result.get("status") != 201]
+    if not failed:
+        return [result["id"] for result in results]
+
+    # written items are kept (not posted again on retry), failed ones share a single (logged) error
+    error = HTTPException(
+        status_code=502,
+        detail=f"Data target API bulk request failed for {len(failed)} of {len(data)} items",
+        logger_name=__name__,
+        logger_msg="Data target API bulk request failed: %s",
+        logger_args=(failed,),
+    )
+    return [result["id"] if result.get("status") == 201 else error for result in results]
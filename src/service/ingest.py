@@ -0,0 +1,117 @@
+import logging
+import datetime as dt
+
+from src.core.config import CONFIG
+from src.core.exception import HTTPException
+from src.model.document import Document, FullDocument
+from src.model.document_set import consecutive_periods
+from src.service import cache, matrix, score
+
+
+class _RunningSummary:
+    """
+    Running summary of documents of a single required type - header of the first document, latest period
+    and running period sums of every sheet.
+    """
+
+    def __init__(self, doc: FullDocument) -> None:
+        self.header: Document = doc.header()
+        self.period: dt.date = doc.period
+        self.count = 0
+        self.sheets = [matrix.PeriodSum() for _ in doc.sheets]
+
+    def add(self, doc: FullDocument) -> None:
+        for sheet_num, sheet_sum in enumerate(self.sheets):
+            sheet_sum.add(doc.sheets[sheet_num].items)
+
+        self.period = max(self.period, doc.period)
+        self.count += 1
+
+
+class StreamedInput:
+    """
+    Input documents aggregated one by one (as the request body is read) - only data needed for scoring are kept,
+    i.e. running summaries of required documents and aggregates of optional ones, documents themselves are dropped.
+    """
+
+    def __init__(self, hash_input: bool = False) -> None:
+        """
+        :param hash_input: Whether to compute result cache key of the input as well.
+        """
+        self.count = 0
+        self.cell_count = 0
+        self.aggregates = score.OptionalAggregates()
+        self._periods: dict[str, set[int]] = {}
+        self._summaries: dict[str, _RunningSummary] = {}
+        self._digest = cache.key_hasher() if hash_input else None
+
+    def add(self, doc: FullDocument) -> None:
+        """
+        Add input document.
+        :param doc: FullDocument object
+        """
+        key = doc.type.key
+        self._periods.setdefault(key, set()).add(doc.period.year)
+
+        if key in CONFIG.REQUIRED_DOCUMENT_TYPES:
+            if key not in self._summaries:
+                self._summaries[key] = _RunningSummary(doc)
+            self._summaries[key].add(doc)
+        elif key == CONFIG.OPTIONAL_CASHFLOW_DOCUMENT_TYPE:
+            self.aggregates = self.aggregates.add_cashflow(doc)
+        elif key == CONFIG.OPTIONAL_LOAN_DOCUMENT_TYPE:
+            self.aggregates = self.aggregates.add_loan(doc)
+
+        if self._digest is not None:
+            cache.update_key(self._digest, doc)
+
+        self.count += 1
+        self.cell_count += doc.cell_count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getstate__(self) -> dict:
+        # input is passed to worker process for scoring, hash object cannot be pickled (nor is the key needed there)
+        return {**self.__dict__, "_digest": None}
+
+    def has_periods(self, key: str, count: int) -> bool:
+        """
+        Whether documents of given type cover exactly given number of consecutive periods.
+        """
+        return consecutive_periods(self._periods.get(key, set()), count)
+
+    @property
+    def cache_key(self) -> str | None:
+        """
+        Result cache key of the input (None if not computed).
+        """
+        return self._digest.hexdigest() if self._digest is not None else None
+
+    def summary_documents(self) -> list[FullDocument]:
+        """
+        Summary documents of required document types (same as score.calculate_summary_document).
+        :return: List of Document objects with summary data
+        """
+        summary_docs = []
+
+        for key in CONFIG.REQUIRED_DOCUMENT_TYPES:
+            summary = self._summaries.get(key)
+
+            if summary is None or summary.count != CONFIG.REQUIRED_DOCUMENT_PERIODS:
+                raise HTTPException(
+                    status_code=500,
+                    logger_name=__name__,
+                    logger_lvl=logging.ERROR,
+                    logger_msg="Invalid input data - not all required documents are present",
+                )
+
+            summary_docs.append(
+                score.build_summary_document(
+                    summary.header,
+                    summary.period,
+                    [sheet_sum.result() for sheet_sum in summary.sheets],
+                )
+            )
+
+        return summary_docs
@@ -0,0 +1,226 @@
+import itertools
+import numpy as np
+
+from src.model.columnar import ColumnarItems
+
+
+LABEL_COLUMNS = 2
+
+# integers up to this magnitude stay exact when converted to float64
+_MAX_EXACT_INT = 2 ** 53
+
+
+def stack_numeric(matrices: list[list[list]]) -> np.ndarray | None:
+    """
+    Stack numeric parts (columns from LABEL_COLUMNS onward) of several sheet matrices into one typed array.
+    Numeric parts have to hold either integers only or floats only - numpy would promote integers of mixed data
+    to float64, while cell by cell python arithmetic keeps integer results where all operands are integers.
+    :param matrices: List of sheet item matrices (all of the same shape)
+    :return: Array of shape (len(matrices), rows, cols) or None if data are not purely numeric / rectangular,
+        mix integers and floats or hold integers not exact in float64
+    """
+    if matrices and all(isinstance(items, ColumnarItems) for items in matrices):
+        blocks = [items.numeric_block(LABEL_COLUMNS) for items in matrices]
+
+        if any(block is None for block in blocks) or len({block.shape for block in blocks}) != 1:
+            return None
+
+        return np.stack(blocks)
+
+    try:
+        block = np.array([[row[LABEL_COLUMNS:] for row in items] for items in matrices])
+    except ValueError:
+        return None
+
+    if block.ndim != 3 or block.dtype.kind not in "biuf":
+        return None
+
+    if block.dtype.kind in "iu" and np.abs(block).max(initial=0) >= _MAX_EXACT_INT:
+        return None
+
+    # integer (and bool) blocks hold no floats, float block may hold integers promoted by numpy
+    if block.dtype.kind == "f" and any(
+        not set(map(type, itertools.chain.from_iterable(row[LABEL_COLUMNS:] for row in items))) <= {float}
+        for items in matrices
+    ):
+        return None
+
+    return block
+
+
+def sum_periods(matrices: list[list[list]]) -> list[list]:
+    """
+    Sum sheet matrices of several periods cell by cell, label columns are taken from the first matrix.
+    :param matrices: List of sheet item matrices (one per period)
+    :return: Summed sheet item matrix
+    """
+    block = stack_numeric(matrices)
+
+    if block is None:
+        return _sum_periods_python(matrices)
+
+    return attach_labels(matrices[0], block.sum(axis=0))
+
+
+def attach_labels(items: list[list], values: np.ndarray) -> list[list]:
+    """
+    Build sheet item matrix from label columns of given matrix and numeric values.
+    :param items: Sheet item matrix the label columns are taken from
+    :param values: Numeric part of the result, array of shape (rows, cols)
+    :return: Sheet item matrix
+    """
+    return [[*row[:LABEL_COLUMNS], *row_values] for row, row_values in zip(items, values.tolist())]
+
+
+def _sum_periods_python(matrices: list[list[list]]) -> list[list]:
+    """
+    Cell by cell fallback of sum_periods for data that cannot be stacked into numeric array (None values, ...).
+    :param matrices: List of sheet item matrices (one per period)
+    :return: Summed sheet item matrix
+    """
+    matrices = [list(items) for items in matrices]
+    rows = len(matrices[0])
+    cols = len(matrices[0][0])
+
+    return [
+        [
+            *matrices[0][i][:LABEL_COLUMNS],
+            *(sum(items[i][j] for items in matrices) for j in range(LABEL_COLUMNS, cols)),
+        ]
+        for i in range(rows)
+    ]
+
+
+class PeriodSum:
+    """
+    Running version of sum_periods - matrices are added one by one (in period order of sum_periods input),
+    only the sum and label columns of the first matrix are kept.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._labels: list[list] = []
+        self._total: np.ndarray | list[list] | None = None
+        self._cols = 0
+
+    def add(self, items: list[list]) -> None:
+        """
+        Add sheet item matrix of the next period.
+        :param items: Sheet item matrix
+        """
+        block = stack_numeric([items])
+        if block is not None and block.dtype.kind not in "bif":
+            block = None
+
+        if self.count == 0:
+            self._labels = [row[:LABEL_COLUMNS] for row in items]
+
+        if block is not None and (self.count == 0 or self._can_add(block[0])):
+            block = block[0]
+            if self.count == 0:
+                # bool matrices are summed as integers (same as numpy sum)
+                self._total = block.astype(np.int64) if block.dtype.kind == "b" else block
+            else:
+                self._total = self._total + block
+        else:
+            self._add_python(list(items))
+
+        self.count += 1
+
+    def result(self) -> list[list]:
+        """
+        :return: Summed sheet item matrix
+        """
+        if isinstance(self._total, np.ndarray):
+            return attach_labels(self._labels, self._total)
+
+        return [[*labels, *values] for labels, values in zip(self._labels, self._total)]
+
+    def _can_add(self, block: np.ndarray) -> bool:
+        return isinstance(self._total, np.ndarray) and block.shape == self._total.shape
+
+    def _add_python(self, items: list[list]) -> None:
+        """
+        Cell by cell addition (same as _sum_periods_python) for data that cannot be added as numeric array.
+        """
+        if self.count == 0:
+            self._cols = len(items[0])
+            self._total = [[0] * (self._cols - LABEL_COLUMNS) for _ in items]
+        elif isinstance(self._total, np.ndarray):
+            self._cols = self._total.shape[1] + LABEL_COLUMNS
+            self._total = self._total.tolist()
+
+        for i, total in enumerate(self._total):
+            for j in range(LABEL_COLUMNS, self._cols):
+                total[j - LABEL_COLUMNS] = total[j - LABEL_COLUMNS] + items[i][j]
+
+
+def cross_product(items: list[list]) -> np.ndarray:
+    """
+    Calculate r * c / (r + c) for every combination of row sum r and column sum c of sheet numeric part.
+    :param items: Sheet item matrix
+    :return: Float array of shape (rows, cols), NaN marks cells with zero denominator
+    """
+    block = stack_numeric([items])
+
+    if block is None:
+        return _cross_product_python(items)
+
+    block = block[0]
+
+    if block.dtype.kind == "f":
+        # accumulated column by column (instead of block.sum(axis=1)) to keep the summation order of plain python sum
+        row_sums = np.zeros(block.shape[0], dtype=np.float64)
+        for j in range(block.shape[1]):
+            row_sums += block[:, j]
+        col_sums = block.sum(axis=0)
+    else:
+        # integer sums are exact, products and sums of the sums have to stay exact in float64 as well
+        # (python divides integers with correct rounding)
+        row_sums = block.sum(axis=1, dtype=np.int64)
+        col_sums = block.sum(axis=0, dtype=np.int64)
+        max_row = int(np.abs(row_sums).max(initial=0))
+        max_col = int(np.abs(col_sums).max(initial=0))
+
+        if max_row * max_col >= _MAX_EXACT_INT or max(max_row, max_col) >= _MAX_EXACT_INT // 2:
+            return _cross_product_python(items)
+
+        row_sums = row_sums.astype(np.float64)
+        col_sums = col_sums.astype(np.float64)
+
+    numerator = np.multiply.outer(row_sums, col_sums)
+    denominator = np.add.outer(row_sums, col_sums)
+
+    return np.divide(numerator, denominator, out=np.full_like(numerator, np.nan), where=denominator != 0)
+
+
+def _cross_product_python(items: list[list]) -> np.ndarray:
+    """
+    Pure python fallback of cross_product for data that cannot be stacked into numeric array.
+    :param items: Sheet item matrix
+    :return: Float array of shape (rows, cols), NaN marks cells with zero denominator
+    """
+    items = list(items)
+    col_sums = [sum(col) for col in list(zip(*items))[LABEL_COLUMNS:]]
+    row_sums = [sum(row[LABEL_COLUMNS:]) for row in items]
+
+    return np.array(
+        [[(r * c / (r + c)) if (r + c) else np.nan for c in col_sums] for r in row_sums],
+        dtype=np.float64,
+    ).reshape(len(row_sums), len(col_sums))
+
+
+def to_items(array: np.ndarray) -> list[list]:
+    """
+    Convert numeric array back to sheet item matrix, NaN values are converted to None.
+    :param array: Float array of shape (rows, cols)
+    :return: Sheet item matrix
+    """
+    missing = np.isnan(array)
+
+    if not missing.any():
+        return array.tolist()
+
+    items = array.astype(object)
+    items[missing] = None
+    return items.tolist()
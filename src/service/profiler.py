@@ -0,0 +1,268 @@
+import os
+import io
+import sys
+import pstats
+import marshal
+import types
+import typing
+import asyncio
+import cProfile
+import logging
+import threading
+import tracemalloc
+import collections
+import datetime as dt
+
+from src.core.config import CONFIG
+from src.model.profile import ProfileSettings
+
+
+logger = logging.getLogger(__name__)
+
+# innermost frames of threads waiting for work (not sampled)
+_IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("connection.py", "wait"),
+}
+
+
+class _Stats:
+    """
+    Raw cProfile statistics in the form accepted by pstats.Stats.
+    """
+
+    def __init__(self, stats: dict) -> None:
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class _Session:
+    """
+    Profiling session - profiles /score requests until given number of them completes or given time elapses.
+    """
+
+    def __init__(self, settings: ProfileSettings) -> None:
+        self.settings = settings
+        self.started = dt.datetime.now()
+        self.finished: dt.datetime | None = None
+        self.requests = 0
+        self.stats: pstats.Stats | None = None
+        self.samples: collections.Counter[str] = collections.Counter()
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self.peak_memory = 0
+        self._tracing = False       # tracemalloc started by this session (not by memory tracking)
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+        self._timer: asyncio.TimerHandle | None = None
+
+        if settings.mode == "sampling":
+            self._sampler = threading.Thread(target=self._sample, name="profiler-sampler", daemon=True)
+            self._sampler.start()
+        elif settings.mode == "tracemalloc" and not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+            self._tracing = True
+
+        if settings.duration is not None:
+            self._timer = asyncio.get_running_loop().call_later(settings.duration, self.finish)
+
+    def add_stats(self, stats: dict) -> None:
+        if self.finished is not None:
+            return
+
+        if self.stats is None:
+            self.stats = pstats.Stats(_Stats(stats))
+        else:
+            self.stats.add(_Stats(stats))
+
+    def request_done(self) -> None:
+        if self.finished is not None:
+            return
+
+        self.requests += 1
+        if self.settings.requests is not None and self.requests >= self.settings.requests:
+            self.finish()
+
+    def finish(self) -> None:
+        if self.finished is not None:
+            return
+
+        self.finished = dt.datetime.now()
+
+        if self._timer is not None:
+            self._timer.cancel()
+
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+        elif self.settings.mode == "tracemalloc" and tracemalloc.is_tracing():
+            self.snapshot = tracemalloc.take_snapshot()
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            # tracing started by somebody else (REQUEST_MEMORY_TRACKING) goes on
+            if self._tracing:
+                tracemalloc.stop()
+
+        logger.info("%s profiling finished after %s requests", self.settings.mode, self.requests)
+
+    def _sample(self) -> None:
+        """
+        Sample stacks of all threads (but the sampler) in regular intervals until stopped.
+        """
+        sampler_id = threading.get_ident()
+
+        while not self._stop.wait(self.settings.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id or _frame_key(frame) in _IDLE_FRAMES:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    stack.append(f"{frame.f_code.co_name} ({frame.f_code.co_filename}:{frame.f_code.co_firstlineno})")
+                    frame = frame.f_back
+
+                self.samples[";".join(reversed(stack))] += 1
+
+    def status(self) -> dict[str, typing.Any]:
+        return {
+            **self.settings.model_dump(),
+            "state": "running" if self.finished is None else "finished",
+            "started": self.started.isoformat(),
+            "finished": self.finished.isoformat() if self.finished is not None else None,
+            "profiled_requests": self.requests,
+        }
+
+    def artifact(self, text: bool = False) -> tuple[bytes, str, str]:
+        """
+        :param text: Human readable summary instead of raw profile (cprofile mode only)
+        :return: Content, media type and file name of the profile
+        """
+        name = f"profile-{self.settings.mode}-{self.started:%Y%m%d%H%M%S}"
+
+        if self.settings.mode == "cprofile":
+            if self.stats is None:
+                return b"", "text/plain", f"{name}.txt"
+
+            if text:
+                output = io.StringIO()
+                self.stats.stream = output
+                self.stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(100)
+                return output.getvalue().encode(), "text/plain", f"{name}.txt"
+
+            # pstats (marshal) format, e.g. for snakeviz
+            return marshal.dumps(self.stats.stats), "application/octet-stream", f"{name}.prof"
+
+        if self.settings.mode == "sampling":
+            # collapsed stacks format, e.g. for flamegraph.pl or speedscope
+            content = "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+            return content.encode(), "text/plain", f"{name}.collapsed"
+
+        lines = [f"peak traced memory: {self.peak_memory} B"]
+        if self.snapshot is not None:
+            lines.extend(str(statistic) for statistic in self.snapshot.statistics("lineno")[:100])
+        return "\n".join(lines).encode(), "text/plain", f"{name}.txt"
+
+
+def _frame_key(frame: types.FrameType) -> tuple[str, str]:
+    return os.path.basename(frame.f_code.co_filename), frame.f_code.co_name
+
+
+_session: _Session | None = None
+
+
+def start(settings: ProfileSettings) -> dict[str, typing.Any]:
+    """
+    Start profiling session (previous finished session is dropped). Must be called from the event loop.
+    :param settings: ProfileSettings object
+    :return: Status of the session
+    """
+    global _session
+
+    if _session is not None and _session.finished is None:
+        raise RuntimeError("profiling session already running")
+
+    if settings.mode != "cprofile" and CONFIG.SCORE_EXECUTION_MODE == "process":
+        # sampler and tracemalloc see this process only, not the scoring pipeline in the process pool
+        raise RuntimeError(f"{settings.mode} profiling not supported with process execution mode")
+
+    _session = _Session(settings)
+    logger.info("%s profiling started", settings.mode)
+    return _session.status()
+
+
+def stop() -> dict[str, typing.Any] | None:
+    """
+    Finish running profiling session.
+    :return: Status of the session or None if there is no session
+    """
+    if _session is None:
+        return None
+
+    _session.finish()
+    return _session.status()
+
+
+def status() -> dict[str, typing.Any] | None:
+    """
+    :return: Status of the current (or last) profiling session or None if there is none
+    """
+    return _session.status() if _session is not None else None
+
+
+def artifact(text: bool = False) -> tuple[bytes, str, str] | None:
+    """
+    Profile of finished session.
+    :param text: Human readable summary instead of raw profile (cprofile mode only)
+    :return: Content, media type and file name or None if there is no finished session
+    """
+    if _session is None or _session.finished is None:
+        return None
+
+    return _session.artifact(text)
+
+
+def profiling_calls() -> bool:
+    """
+    Whether calls of the scoring pipeline should be profiled (see call_profiled).
+    """
+    return _session is not None and _session.finished is None and _session.settings.mode == "cprofile"
+
+
+def call_profiled(func: typing.Callable, *args) -> tuple[typing.Any, dict | None]:
+    """
+    Call function under cProfile (module level, i.e. can be called in worker process).
+    :return: Return value of the function and raw profile statistics (None if profiler could not be enabled)
+    """
+    profiler = cProfile.Profile()
+
+    try:
+        profiler.enable()
+    except ValueError:
+        # another profiler active in this process (possible since python 3.12)
+        return func(*args), None
+
+    try:
+        result = func(*args)
+    finally:
+        profiler.disable()
+
+    profiler.create_stats()
+    return result, profiler.stats
+
+
+def add_stats(stats: dict | None) -> None:
+    """
+    Add statistics of profiled call to the running session.
+    """
+    if stats is not None and _session is not None:
+        _session.add_stats(stats)
+
+
+def request_done() -> None:
+    """
+    Count completed /score request (session finishes after configured number of requests).
+    """
+    if _session is not None:
+        _session.request_done()
@@ -1,30 +1,77 @@
+import typing
 import logging
 import secrets
 import datetime as dt
 
 from src.core.config import CONFIG
 from src.core.exception import HTTPException
-from src.model.document import FullDocument
+from src.model.document import Document, FullDocument
+from src.model.document_set import DocumentSet
 from src.model.sheet import Sheet
+from src.service import matrix, window
 
+if typing.TYPE_CHECKING:
+    # ingest imports this module
+    from src.service.ingest import StreamedInput
 
-def validate_input(docs: list[FullDocument]) -> bool:
+
+class OptionalAggregates(typing.NamedTuple):
+    """
+    Aggregates of optional input documents (cashflow, loans) used for final document calculation
+    """
+    has_loans: bool = False
+    loans_sum: float = 0
+    cashflow_sum: float = 0
+    capital_sum: float = 0
+
+    @classmethod
+    def from_documents(
+        cls,
+        cashflow_docs: list[FullDocument] | None = None,
+        loan_docs: list[FullDocument] | None = None,
+    ) -> "OptionalAggregates":
+        """
+        :param cashflow_docs: List of Document objects (of cashflow type)
+        :param loan_docs: List of Document objects (of loan type)
+        :return: OptionalAggregates object
+        """
+        aggregates = cls()
+        for doc in cashflow_docs or []:
+            aggregates = aggregates.add_cashflow(doc)
+        for doc in loan_docs or []:
+            aggregates = aggregates.add_loan(doc)
+        return aggregates
+
+    def add_cashflow(self, doc: FullDocument) -> "OptionalAggregates":
+        """
+        Add cashflow document (its data are not referenced by the result).
+        """
+        return self._replace(
+            cashflow_sum=sum((row[1] for row in doc.sheets[0].items), self.cashflow_sum),
+            capital_sum=sum((row[4] for row in doc.sheets[1].items), self.capital_sum),
+        )
+
+    def add_loan(self, doc: FullDocument) -> "OptionalAggregates":
+        """
+        Add loan document (its data are not referenced by the result).
+        """
+        return self._replace(
+            has_loans=True,
+            loans_sum=sum((row[5] for row in doc.sheets[0].items), self.loans_sum),
+        )
+
+
+def validate_input(docs: "DocumentSet | StreamedInput | list[FullDocument]") -> bool:
     """
     Simulate validation of input payload - i.e. if it all contains mandatory document
-    :param docs: List of Document objects
+    :param docs: Set (or list) of Document objects or streamed input
     :return: True if validation is successful, raises HTTPException otherwise
     """
-    periods = dict()
-
-    for doc in docs:
-        periods[doc.type.key] = periods.get(doc.type.key, set()).union({doc.period.year})
+    if isinstance(docs, list):
+        docs = DocumentSet(docs)
 
     for required_doc in CONFIG.REQUIRED_DOCUMENT_TYPES:
-        if (
-            len(periods.get(required_doc, set())) != CONFIG.REQUIRED_DOCUMENT_PERIODS
-            or
-            max(periods[required_doc]) != min(periods[required_doc]) + CONFIG.REQUIRED_DOCUMENT_PERIODS - 1
-        ):
+        if not docs.has_periods(required_doc, CONFIG.REQUIRED_DOCUMENT_PERIODS):
             raise HTTPException(
                 status_code=400,
                 detail=f"Missing required document type {required_doc} for all periods",
@@ -50,53 +97,53 @@ def calculate_summary_document(docs: list[FullDocument]) -> FullDocument:
             logger_msg="Invalid input data - not all required documents are present",
         )
 
-    doc_id = secrets.token_hex(16)
-    sheets = []
+    sheets_data = []
 
     for sheet_num in range(len(docs[0].sheets)):
-        sheet_data = []
-
-        cols = len(docs[0].sheets[sheet_num].items[0])
-        rows = len(docs[0].sheets[sheet_num].items)
-
-        for i in range(rows):
-            row_data = []
+        if CONFIG.SUMMARY_MODE == "incremental":
+            sheets_data.append(window.sum_periods(docs, sheet_num))
+        else:
+            sheets_data.append(matrix.sum_periods([doc.sheets[sheet_num].items for doc in docs]))
 
-            for j in range(2):
-                row_data.append(docs[0].sheets[sheet_num].items[i][j])
+    return build_summary_document(docs[0], max(doc.period for doc in docs), sheets_data)
 
-            for j in range(2, cols):
-                row_data.append(sum(doc.sheets[sheet_num].items[i][j] for doc in docs))
 
-            sheet_data.append(row_data)
-
-        sheets.append(
-            Sheet(
-                id=secrets.token_hex(16),
-                subject_id=docs[0].subject_id,
-                doc_id=doc_id,
-                name=f"{docs[0].sheets[sheet_num].name} - Summary",
-                number=docs[0].sheets[sheet_num].number,
-                items=sheet_data,
-            )
-        )
+def build_summary_document(first_doc: Document, period: dt.date, sheets_data: list[list[list]]) -> FullDocument:
+    """
+    Build summary document from already summed sheet data.
+    :param first_doc: First of the summed documents (document header is enough), source of document information
+    :param period: Latest of the summed periods
+    :param sheets_data: Summed sheet item matrices (one per sheet of the first document)
+    :return: Document object with summary data
+    """
+    doc_id = secrets.token_hex(16)
 
-    return FullDocument(
+    return FullDocument.trusted(
         id=doc_id,
-        subject_id=docs[0].subject_id,
+        subject_id=first_doc.subject_id,
         type={
-            "key": f"{docs[0].type.key}S",
-            "name": f"{docs[0].type.name} - Summary",
+            "key": f"{first_doc.type.key}S",
+            "name": f"{first_doc.type.name} - Summary",
             "layer": 2,
-            "order": docs[0].type.order,
+            "order": first_doc.type.order,
         },
-        period=max(doc.period for doc in docs),
+        period=period,
         version={
             "version": 1,
             "author": "faspo-model-service",
             "created": dt.datetime.now(),
         },
-        sheets=sheets,
+        sheets=[
+            Sheet.trusted(
+                id=secrets.token_hex(16),
+                subject_id=first_doc.subject_id,
+                doc_id=doc_id,
+                name=f"{sheet_info.name} - Summary",
+                number=sheet_info.number,
+                items=sheet_data,
+            )
+            for sheet_info, sheet_data in zip(first_doc.sheets, sheets_data)
+        ],
     )
 
 
@@ -126,12 +173,10 @@ def calculate_scoring_documents(summary_docs: list[FullDocument]) -> list[FullDo
         for sheet in doc.sheets:
             doc_id = secrets.token_hex(16)
 
-            col_sums = [sum(col) for col in list(zip(*sheet.items))[2:]]
-            row_sums = [sum(row[2:]) for row in sheet.items]
-            cross_product = [[(r * c / (r + c)) if (r + c) else None for c in col_sums] for r in row_sums]
+            cross_product = matrix.cross_product(sheet.items)
 
             docs.append(
-                FullDocument(
+                FullDocument.trusted(
                     id=doc_id,
                     subject_id=doc.subject_id,
                     type={
@@ -147,13 +192,13 @@ def calculate_scoring_documents(summary_docs: list[FullDocument]) -> list[FullDo
                         "created": dt.datetime.now(),
                     },
                     sheets=[
-                        Sheet(
+                        Sheet.trusted(
                             id=secrets.token_hex(16),
                             subject_id=doc.subject_id,
                             doc_id=doc_id,
                             name="Scoring",
                             number=1,
-                            items=cross_product,
+                            items=matrix.to_items(cross_product),
                         )
                     ],
                 )
@@ -167,6 +212,7 @@ def calculate_final_document(
     *,
     cashflow_docs: list[FullDocument] = None,
     loan_docs: list[FullDocument] = None,
+    aggregates: OptionalAggregates | None = None,
 ) -> FullDocument:
     """
     WARNING: all calculations are completely made up and from bussiness point of view nonsensical
@@ -175,6 +221,7 @@ def calculate_final_document(
     :param scoring_docs: List of Document objects (of scoring type)
     :param cashflow: List of Document objects (additional data from input)
     :param loans: List of Document objects (additional data from input)
+    :param aggregates: Already aggregated cashflow and loan documents (instead of the documents themselves)
     :return: Document object with final data
     """
     if (
@@ -189,11 +236,14 @@ def calculate_final_document(
             logger_msg="Invalid input data - not all required documents are present",
     )
 
-    subject_has_loans = bool(loan_docs)
-    loans_sum = sum(row[5] for doc in loan_docs for row in doc.sheets[0].items) if subject_has_loans else 0
+    if aggregates is None:
+        aggregates = OptionalAggregates.from_documents(cashflow_docs, loan_docs)
+
+    subject_has_loans = aggregates.has_loans
+    loans_sum = aggregates.loans_sum
 
-    cashflow_sum = sum(row[1] for doc in cashflow_docs for row in doc.sheets[0].items) if cashflow_docs else 0
-    capital_sum = sum(row[4] for doc in cashflow_docs for row in doc.sheets[1].items) if cashflow_docs else 0
+    cashflow_sum = aggregates.cashflow_sum
+    capital_sum = aggregates.capital_sum
     subject_is_suspicious = cashflow_sum > capital_sum * 10
 
     scoring_1_avg = sum(scoring_docs[0].sheets[0].items[-1]) / len(scoring_docs[0].sheets[0].items[-1])
@@ -219,7 +269,7 @@ def calculate_final_document(
     final_scoring += scoring_4_avg * coefficient
 
     doc_id = secrets.token_hex(16)
-    return FullDocument(
+    return FullDocument.trusted(
         id=doc_id,
         subject_id=scoring_docs[0].subject_id,
         type={
@@ -235,7 +285,7 @@ def calculate_final_document(
             "created": dt.datetime.now(),
         },
         sheets=[
-            Sheet(
+            Sheet.trusted(
                 id=secrets.token_hex(16),
                 subject_id=scoring_docs[0].subject_id,
                 doc_id=doc_id,
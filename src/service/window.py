@@ -0,0 +1,163 @@
+import typing
+import datetime as dt
+import threading
+import collections
+import numpy as np
+
+from src.core import memory
+from src.core.config import CONFIG
+from src.model.document import FullDocument
+from src.service import matrix
+
+
+class _PeriodKey(typing.NamedTuple):
+    """
+    Identity of the document of a single period - data of the same document version never change.
+    """
+    period: dt.date
+    doc_id: str
+    version: int
+
+
+class _Window(typing.NamedTuple):
+    """
+    Partial aggregates of a single subject / document type / sheet: numeric block of every period
+    of the last window and (for integer data) sum of the last window.
+    """
+    blocks: dict[_PeriodKey, np.ndarray]
+    keys: tuple[_PeriodKey, ...]
+    total: np.ndarray | None
+
+    @property
+    def size(self) -> int:
+        """
+        Bytes of the kept arrays.
+        """
+        size = sum(block.nbytes for block in self.blocks.values())
+        return size + self.total.nbytes if self.total is not None else size
+
+
+_windows: collections.OrderedDict[tuple[str, str, int], _Window] = collections.OrderedDict()
+_size = 0
+_lock = threading.Lock()
+
+
+def sum_periods(docs: list[FullDocument], sheet_num: int) -> list[list]:
+    """
+    Incremental version of matrix.sum_periods for given sheet of documents of a single subject and document type.
+    Numeric blocks of periods already seen (same document version) are reused, integer window sums are updated
+    by adding new and subtracting dropped periods. Output is identical to full recompute.
+    :param docs: List of Document objects (one per period, all of the same subject and type)
+    :param sheet_num: Index of the sheet
+    :return: Summed sheet item matrix
+    """
+    matrices = [doc.sheets[sheet_num].items for doc in docs]
+    window_key = (docs[0].subject_id, docs[0].type.key, sheet_num)
+    keys = tuple(_PeriodKey(doc.period, doc.id, doc.version.version) for doc in docs)
+
+    with _lock:
+        window = _windows.get(window_key)
+
+    blocks = {}
+    for key, items in zip(keys, matrices):
+        block = window.blocks.get(key) if window is not None else None
+        if block is None:
+            block = matrix.stack_numeric([items])
+            if block is None:
+                # not purely numeric data - no partial aggregates
+                _discard(window_key)
+                return matrix.sum_periods(matrices)
+            block = block[0]
+        blocks[key] = block
+
+    if (
+        len({block.shape for block in blocks.values()}) != 1
+        or
+        any(block.dtype.kind == "u" for block in blocks.values())
+    ):
+        _discard(window_key)
+        return matrix.sum_periods(matrices)
+
+    total = _update_total(window, keys, blocks)
+    if total is None:
+        total = np.stack([blocks[key] for key in keys]).sum(axis=0)
+
+    _store(window_key, _Window(blocks, keys, total if total.dtype.kind == "i" else None))
+
+    return matrix.attach_labels(matrices[0], total)
+
+
+def _update_total(window: _Window | None, keys: tuple[_PeriodKey, ...], blocks: dict) -> np.ndarray | None:
+    """
+    Update sum of the previous window by periods added to and dropped from the window.
+    Integer data only (exact arithmetic), None if the sum has to be recomputed.
+    """
+    if (
+        window is None
+        or
+        window.total is None
+        or
+        window.total.shape != next(iter(blocks.values())).shape
+        or
+        len(blocks) != len(keys)
+        or
+        not all(block.dtype.kind in "bi" for block in blocks.values())
+    ):
+        return None
+
+    added = [key for key in keys if key not in window.keys]
+    dropped = [key for key in window.keys if key not in keys]
+
+    if len(added) + len(dropped) >= len(keys):
+        return None
+
+    total = window.total
+    for key in added:
+        total = total + blocks[key].astype(np.int64)
+    for key in dropped:
+        total = total - window.blocks[key].astype(np.int64)
+
+    return total
+
+
+def _store(window_key: tuple[str, str, int], window: _Window) -> None:
+    global _size
+
+    with _lock:
+        _pop(window_key)
+        _windows[window_key] = window
+        _size += window.size
+
+        while _size > CONFIG.SUMMARY_WINDOW_CACHE_MAX_BYTES:
+            _pop(next(iter(_windows)))
+
+        memory.retain(__name__, _size)
+
+
+def _discard(window_key: tuple[str, str, int]) -> None:
+    with _lock:
+        _pop(window_key)
+        memory.retain(__name__, _size)
+
+
+def _pop(window_key: tuple[str, str, int]) -> None:
+    """
+    Drop window (caller holds the lock).
+    """
+    global _size
+
+    window = _windows.pop(window_key, None)
+    if window is not None:
+        _size -= window.size
+
+
+def clear() -> None:
+    """
+    Drop all partial aggregates.
+    """
+    global _size
+
+    with _lock:
+        _windows.clear()
+        _size = 0
+        memory.retain(__name__, _size)
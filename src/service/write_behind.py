@@ -0,0 +1,376 @@
+import os
+import time
+import uuid
+import typing
+import fcntl
+import orjson
+import asyncio
+import logging
+import aiohttp
+
+from src.core import metrics, workers
+from src.core.config import CONFIG
+from src.core.exception import HTTPException
+from src.model.encoded import EncodedDocument
+from src.service import data_target
+
+
+logger = logging.getLogger(__name__)
+_queue: asyncio.Queue | None = None
+_workers: list[asyncio.Task] = []
+_spool_lock: asyncio.Lock | None = None
+_spool_path: str | None = None
+_spool_slot = None          # lock file of the spool file claimed by this process
+_spool_pending: set[str] = set()    # IDs of spooled entries not written yet
+
+
+async def start() -> None:
+    """
+    Start write-behind queue and its workers, replays results left in the spool file by previous run (if any).
+    """
+    global _queue, _spool_lock, _spool_path
+
+    if _queue is not None:
+        return
+
+    _queue = asyncio.Queue(maxsize=CONFIG.PERSISTENCE_QUEUE_SIZE)
+    _spool_lock = asyncio.Lock()
+    _spool_path = _claim_spool()
+    _workers.extend(
+        asyncio.create_task(_worker(), name=f"write-behind-worker-{i}")
+        for i in range(CONFIG.PERSISTENCE_WORKERS)
+    )
+
+    for entry_id, correlation_id, data in await asyncio.to_thread(_replay_spool):
+        _spool_pending.add(entry_id)
+        await _queue.put((entry_id, correlation_id, data, None))
+
+    logger.info("write-behind queue started with %s workers, %s replayed", CONFIG.PERSISTENCE_WORKERS, _queue.qsize())
+
+
+async def stop() -> None:
+    """
+    Stop write-behind queue, waits (up to configured timeout) for queued results to be written.
+    Results not written in time stay in the spool file (if enabled) and are replayed on next start.
+    """
+    global _queue, _spool_path, _spool_slot
+
+    if _queue is None:
+        return
+
+    try:
+        await asyncio.wait_for(_queue.join(), timeout=CONFIG.PERSISTENCE_SHUTDOWN_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("write-behind queue stopped with %s unwritten results", _queue.qsize())
+
+    for worker in _workers:
+        worker.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+
+    _workers.clear()
+    _spool_pending.clear()
+    _queue = None
+
+    # spool file is released for the next process (e.g. replacement of this worker)
+    if _spool_slot is not None:
+        _spool_slot.close()
+    _spool_path = _spool_slot = None
+    logger.info("write-behind queue stopped")
+
+
+def backlog() -> int:
+    """
+    Number of results waiting in the write-behind queue.
+    """
+    return _queue.qsize() if _queue is not None else 0
+
+
+metrics.Gauge("persistence_backlog", "Results waiting in the write-behind queue", backlog)
+workers.share("backlog", backlog)
+
+
+async def enqueue(
+    data: list[EncodedDocument],
+    correlation_id: str | None = None,
+    on_written: typing.Callable[[], typing.Awaitable] | None = None,
+) -> None:
+    """
+    Queue results of a scoring run for writing to the data target.
+    Waits for free space when queue is full, i.e. should be called as background task (after response is sent).
+    :param data: Data to be written, encoded documents (produced by the scoring run).
+    :param correlation_id: Correlation ID for tracing the request.
+    :param on_written: Called (and awaited) once all data are written (not called if writing fails for good
+                       or if the results are replayed from the spool by next run).
+    """
+    if _queue is None:
+        # outside of application lifespan (scripts, tests) - written directly
+        await _write(None, correlation_id, data, on_written)
+        return
+
+    entry_id = uuid.uuid4().hex
+    if _spool_path is not None:
+        # record is spliced from already encoded documents (no re-serialization of sheet data)
+        await _spool(
+            entry_id,
+            b'{"id":' + orjson.dumps(entry_id)
+            + b',"correlation_id":' + orjson.dumps(correlation_id)
+            + b',"data":['
+            + b",".join(b'{"header":' + doc.header + b',"sheets":[' + b",".join(doc.sheets) + b"]}" for doc in data)
+            + b"]}"
+        )
+    await _queue.put((entry_id, correlation_id, data, on_written))
+
+
+async def _worker() -> None:
+    """
+    Write-behind worker, writes queued results until cancelled.
+    """
+    while True:
+        entry_id, correlation_id, data, on_written = await _queue.get()
+        try:
+            await _write(entry_id, correlation_id, data, on_written)
+        except Exception as e:
+            logger.error("writing results of request %s failed, results dropped: %s", correlation_id, str(e))
+        finally:
+            _queue.task_done()
+
+
+async def _write(
+    entry_id: str | None,
+    correlation_id: str | None,
+    data: list[EncodedDocument],
+    on_written: typing.Callable[[], typing.Awaitable] | None = None,
+) -> None:
+    """
+    Write results to the data target, transient failures are retried with exponential backoff (only items not
+    written by previous attempts are posted again).
+    """
+    written = [None] * sum(len(doc.sheets) + 1 for doc in data)
+    start = time.perf_counter()
+
+    try:
+        for attempt in range(1, CONFIG.PERSISTENCE_RETRY_ATTEMPTS + 1):
+            try:
+                await data_target.post_data_bulk(data, correlation_id, written, record=False)
+                break
+            except (HTTPException, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not _is_transient(e) or attempt == CONFIG.PERSISTENCE_RETRY_ATTEMPTS:
+                    raise
+
+                delay = min(
+                    CONFIG.PERSISTENCE_RETRY_BACKOFF * 2 ** (attempt - 1),
+                    CONFIG.PERSISTENCE_RETRY_BACKOFF_MAX,
+                )
+                logger.warning(
+                    "writing results of request %s failed (attempt %s), retry in %ss", correlation_id, attempt, delay
+                )
+                await asyncio.sleep(delay)
+    except Exception:
+        data_target.record_post(correlation_id, len(written), written.count(None), time.perf_counter() - start)
+        # results failed for good are not replayed by next run either (they would fail on every start)
+        await _mark_done(entry_id)
+        raise
+
+    # outcome of all attempts is recorded once (items written by any of them count as written)
+    data_target.record_post(correlation_id, len(written), 0, time.perf_counter() - start)
+    await _mark_done(entry_id)
+
+    if on_written is not None:
+        try:
+            await on_written()
+        except Exception as e:
+            logger.error("post-write callback of request %s failed: %s", correlation_id, str(e))
+
+
+def _is_transient(error: Exception) -> bool:
+    """
+    Whether the failure may disappear on retry (server side errors, throttling, connection problems).
+    """
+    if isinstance(error, HTTPException):
+        return error.status_code >= 500 or error.status_code == 429
+
+    return True
+
+
+def _claim_spool() -> str | None:
+    """
+    Spool file of this process - every process claims (locks) its own spool file, with multiple server workers
+    a numbered one, a recycled worker takes over the file of its predecessor (and replays it).
+    :return: Path of the spool file or None if spool is disabled
+    """
+    global _spool_slot
+
+    if CONFIG.PERSISTENCE_SPOOL_PATH is None:
+        return None
+
+    if _spool_slot is not None:
+        return _spool_slot.name.removesuffix(".lock")
+
+    for path in _spool_slots():
+        # lock is held until the queue is stopped
+        slot = _lock_spool(path)
+        if slot is not None:
+            _spool_slot = slot
+            return path
+
+    path = f"{CONFIG.PERSISTENCE_SPOOL_PATH}.{os.getpid()}"
+    logger.warning("all write-behind spool slots taken, spooling to %s", path)
+    _spool_slot = _lock_spool(path)
+    return path
+
+
+def _spool_slots() -> list[str]:
+    if CONFIG.SERVER_WORKERS <= 1:
+        return [CONFIG.PERSISTENCE_SPOOL_PATH]
+
+    return [f"{CONFIG.PERSISTENCE_SPOOL_PATH}.{i}" for i in range(CONFIG.SERVER_WORKERS)]
+
+
+def _lock_spool(path: str):
+    """
+    :return: Open lock file of the spool file or None if it is locked by another process
+    """
+    slot = open(f"{path}.lock", "a")
+
+    try:
+        fcntl.flock(slot, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        slot.close()
+        return None
+
+    return slot
+
+
+def _adopt_spools() -> list[tuple[str, typing.Any]]:
+    """
+    Lock spool files of no running process - left by a run with another number of server workers (bare path,
+    slots over SERVER_WORKERS) or by a worker spooling to its PID file.
+    :return: List of (path, open lock file) tuples
+    """
+    directory, name = os.path.split(CONFIG.PERSISTENCE_SPOOL_PATH)
+    adopted = []
+
+    for file_name in sorted(os.listdir(directory or ".")):
+        suffix = file_name.removeprefix(f"{name}.")
+        if file_name != name and (suffix == file_name or not suffix.isdigit()):
+            continue
+
+        path = os.path.join(directory, file_name)
+        if path == _spool_path:
+            continue
+
+        slot = _lock_spool(path)
+        if slot is not None:
+            adopted.append((path, slot))
+
+    return adopted
+
+
+async def _spool(entry_id: str, record: bytes) -> None:
+    """
+    Append (JSON encoded) record of queued results to the spool file (if enabled).
+    """
+    if _spool_path is None:
+        return
+
+    async with _spool_lock:
+        await asyncio.to_thread(_append_line, _spool_path, record + b"\n")
+        _spool_pending.add(entry_id)
+
+
+async def _mark_done(entry_id: str | None) -> None:
+    """
+    Mark spooled results as done (written or failed for good). Spool file is truncated once no spooled results
+    are pending, i.e. it does not grow with every result of a long running process.
+    """
+    if entry_id not in _spool_pending:
+        return
+
+    async with _spool_lock:
+        _spool_pending.discard(entry_id)
+
+        if _spool_pending:
+            await asyncio.to_thread(_append_line, _spool_path, orjson.dumps({"done": entry_id}) + b"\n")
+        else:
+            await asyncio.to_thread(_truncate, _spool_path)
+
+
+def _read_spool(path: str, entries: dict[str, dict]) -> None:
+    """
+    Add records of results not written yet from the spool file to given entries (by entry ID).
+    """
+    try:
+        with open(path, "rb") as file:
+            for line in file:
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    logger.warning("skipping corrupted write-behind spool record")
+                    continue
+
+                if "done" in record:
+                    entries.pop(record["done"], None)
+                else:
+                    entries[record["id"]] = record
+    except FileNotFoundError:
+        pass
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _append_line(path: str, line: bytes) -> None:
+    with open(path, "ab") as file:
+        file.write(line)
+        file.flush()
+
+
+def _truncate(path: str) -> None:
+    with open(path, "wb"):
+        pass
+
+
+def _replay_spool() -> list[tuple[str, str | None, list[EncodedDocument]]]:
+    """
+    Read results not written by previous run from the spool file of this process and from spool files of no running
+    process (these are removed) and compact the spool file of this process to these results only.
+    :return: List of (entry ID, correlation ID, data) tuples.
+    """
+    if _spool_path is None:
+        return []
+
+    adopted = _adopt_spools()
+    entries = {}
+
+    for path in [_spool_path, *(path for path, _ in adopted)]:
+        _read_spool(path, entries)
+
+    with open(_spool_path, "wb") as file:
+        file.writelines(orjson.dumps(record) + b"\n" for record in entries.values())
+
+    for path, slot in adopted:
+        logger.info("write-behind spool %s taken over", path)
+        _remove(path)
+        # lock files of slots stay for the workers claiming them
+        if path not in _spool_slots():
+            _remove(slot.name)
+        slot.close()
+
+    return [
+        (
+            record["id"],
+            record["correlation_id"],
+            [
+                EncodedDocument(
+                    header=orjson.dumps(doc["header"]),
+                    sheets=[orjson.dumps(sheet) for sheet in doc["sheets"]],
+                )
+                for doc in record["data"]
+            ],
+        )
+        for record in entries.values()
+    ]
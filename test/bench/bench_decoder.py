@@ -0,0 +1,54 @@
+import sys
+import json
+import time
+import asyncio
+import typing
+import orjson
+import httpx
+import fastapi
+
+from src.api.v1 import decoder
+from src.model.document_set import DocumentSet
+from test.bench.generator import generate_payload_of_size
+
+
+SIZES = [100_000, 1_000_000, 10_000_000, 50_000_000]
+
+
+def _app(decode_documents: typing.Callable) -> fastapi.FastAPI:
+    app = fastapi.FastAPI()
+
+    @app.post("/decode")
+    async def decode(docs: typing.Annotated[DocumentSet, fastapi.Depends(decode_documents)]) -> int:
+        return len(docs)
+
+    return app
+
+
+async def _measure(app: fastapi.FastAPI, body: bytes, repeat: int) -> float:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            response = await client.post("/decode", content=body, headers={"content-type": "application/json"})
+            assert response.status_code == 200, response.text
+        return (time.perf_counter() - start) / repeat
+
+
+async def main(sizes: list[int]) -> list[dict]:
+    results = []
+
+    for size in sizes:
+        body = orjson.dumps(generate_payload_of_size(size))
+        repeat = max(1, 10_000_000 // len(body))
+        default = await _measure(_app(decoder._decode_default), body, repeat)
+        fast = await _measure(_app(decoder._decode_fast), body, repeat)
+
+        results.append({"bytes": len(body), "default_s": default, "fast_s": fast, "speedup": default / fast})
+        print(f"{len(body) / 1e6:8.2f} MB  default {default * 1e3:9.1f} ms  fast {fast * 1e3:9.1f} ms  "
+              f"speedup {default / fast:4.2f}x", file=sys.stderr)
+
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(asyncio.run(main([int(size) for size in sys.argv[1:]] or SIZES)), indent=2))
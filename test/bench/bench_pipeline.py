@@ -0,0 +1,133 @@
+import sys
+import asyncio
+import argparse
+import unittest.mock
+import orjson
+import httpx
+
+from src.core.config import CONFIG
+from src.model.document import FullDocument
+from src.model.document_set import DocumentSet
+from src.model.encoded import EncodedDocument
+from src.service import score
+from test.bench import runner
+from test.bench.generator import generate_documents
+
+
+def _parse(data: list[dict], storage: str) -> DocumentSet:
+    if storage == "columnar":
+        return DocumentSet.model_validate(data, context={"sheet_storage_mode": "columnar"})
+    return DocumentSet.model_validate(data)
+
+
+def bench_stages(data: list[dict], *, storage: str, repeat: int) -> dict[str, dict]:
+    """
+    Benchmark model parsing / serialization and every stage of the scoring pipeline separately.
+    :param data: JSON ready list of input documents
+    :param storage: Sheet storage of parsed input documents (list or columnar)
+    :param repeat: Number of measured calls of every benchmark
+    :return: Statistics per benchmark name
+    """
+    body = orjson.dumps(data)
+    docs = _parse(data, storage)
+    cells = sum(doc.cell_count for doc in docs)
+
+    mandatory_docs = [docs.of_type(doc_type) for doc_type in CONFIG.REQUIRED_DOCUMENT_TYPES]
+    mandatory_cells = sum(doc.cell_count for type_docs in mandatory_docs for doc in type_docs)
+    summary_docs = [score.calculate_summary_document(type_docs) for type_docs in mandatory_docs]
+    summary_cells = sum(doc.cell_count for doc in summary_docs)
+    scoring_docs = score.calculate_scoring_documents(summary_docs)
+    scoring_cells = sum(doc.cell_count for doc in scoring_docs)
+    cashflow_docs = docs.of_type(CONFIG.OPTIONAL_CASHFLOW_DOCUMENT_TYPE)
+    loan_docs = docs.of_type(CONFIG.OPTIONAL_LOAN_DOCUMENT_TYPE)
+    output_docs = [*summary_docs, *scoring_docs]
+
+    return {
+        "model.parse_json": runner.measure(lambda: orjson.loads(body), repeat=repeat, cells=cells),
+        "model.validate_list": runner.measure(lambda: _parse(data, "list"), repeat=repeat, cells=cells),
+        "model.validate_columnar": runner.measure(lambda: _parse(data, "columnar"), repeat=repeat, cells=cells),
+        "model.serialize": runner.measure(
+            lambda: [EncodedDocument.from_document(doc) for doc in output_docs],
+            repeat=repeat,
+            cells=summary_cells + scoring_cells,
+        ),
+        "score.validate_input": runner.measure(lambda: score.validate_input(docs), repeat=repeat),
+        "score.calculate_summary_document": runner.measure(
+            lambda: [score.calculate_summary_document(type_docs) for type_docs in mandatory_docs],
+            repeat=repeat,
+            cells=mandatory_cells,
+        ),
+        "score.calculate_scoring_documents": runner.measure(
+            lambda: score.calculate_scoring_documents(summary_docs),
+            repeat=repeat,
+            cells=summary_cells,
+        ),
+        "score.calculate_final_document": runner.measure(
+            lambda: score.calculate_final_document(scoring_docs, cashflow_docs=cashflow_docs, loan_docs=loan_docs),
+            repeat=repeat,
+            cells=scoring_cells,
+        ),
+    }
+
+
+async def bench_api(data: list[dict], *, repeat: int) -> dict[str, dict]:
+    """
+    Benchmark end-to-end /score call through in-process ASGI transport (configured decoder and execution mode,
+    writing of results to the data target is disabled).
+    :param data: JSON ready list of input documents
+    :param repeat: Number of measured calls
+    :return: Statistics per benchmark name
+    """
+    from main import app
+
+    body = orjson.dumps(data)
+    cells = sum(FullDocument.model_validate(doc).cell_count for doc in data)
+
+    async def _score() -> None:
+        response = await client.post("/api/v1/score", content=body, headers={"content-type": "application/json"})
+        assert response.status_code == 201, response.text
+
+    with unittest.mock.patch("src.service.write_behind.enqueue", new=unittest.mock.AsyncMock()):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            return {
+                f"api.score[{CONFIG.SCORE_REQUEST_DECODER}]": await runner.measure_async(
+                    _score, repeat=repeat, cells=cells,
+                ),
+            }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark scoring pipeline and /score API")
+    parser.add_argument("--sheets", type=int, default=2, help="number of sheets of every mandatory document")
+    parser.add_argument("--rows", type=int, default=500, help="number of rows of every sheet")
+    parser.add_argument("--cols", type=int, default=20, help="number of columns of every sheet")
+    parser.add_argument("--periods", type=int, default=CONFIG.REQUIRED_DOCUMENT_PERIODS, help="number of periods")
+    parser.add_argument("--storage", choices=["list", "columnar"], default="list", help="sheet storage of stages")
+    parser.add_argument("--repeat", type=int, default=20, help="number of measured calls of every benchmark")
+    parser.add_argument("--output", help="save results to given JSON file")
+    parser.add_argument("--baseline", help="compare results with given JSON file (exit code 1 on regression)")
+    parser.add_argument("--threshold", type=float, default=.1, help="tolerated relative slowdown")
+    args = parser.parse_args(argv)
+
+    params = {key: getattr(args, key) for key in ["sheets", "rows", "cols", "periods", "storage", "repeat"]}
+    data = generate_documents(sheets=args.sheets, rows=args.rows, cols=args.cols, periods=args.periods)
+
+    results = {
+        **bench_stages(data, storage=args.storage, repeat=args.repeat),
+        **asyncio.run(bench_api(data, repeat=args.repeat)),
+    }
+
+    comparison = None
+    if args.baseline:
+        comparison = runner.compare(results, runner.load(args.baseline)["results"], threshold=args.threshold)
+
+    runner.report(results, comparison)
+
+    if args.output:
+        runner.save(args.output, runner.metadata(params), results)
+
+    return int(any(item["regression"] for item in comparison or []))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import socket
+import argparse
+import subprocess
+import httpx
+
+from test.bench import runner
+
+
+# measures import of the application in a fresh interpreter (prints seconds)
+_IMPORT_SCRIPT = "import time; start = time.perf_counter(); import main; print(time.perf_counter() - start)"
+
+
+def _environment(exporter: str, setup: str) -> dict[str, str]:
+    return {
+        **os.environ,
+        "DATA_TARGET_URL": os.environ.get("DATA_TARGET_URL", "http://127.0.0.1:9/api/v1/document"),
+        "TELEMETRY_EXPORTER": exporter,
+        "TELEMETRY_SETUP": setup,
+    }
+
+
+def bench_import(env: dict[str, str], repeat: int) -> dict:
+    """
+    Import time of the application module (fresh interpreter per measurement, interpreter start not included).
+    """
+    durations = []
+
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _IMPORT_SCRIPT], env=env, capture_output=True, text=True, check=True,
+        ).stdout
+        durations.append(float(output.strip().splitlines()[-1]))
+
+    return runner.from_durations(durations)
+
+
+def bench_ready(env: dict[str, str], repeat: int, timeout: float = 60) -> dict:
+    """
+    Time from spawn of the service (uvicorn, fresh interpreter) to the first successful readiness probe.
+    """
+    durations = []
+
+    for _ in range(repeat):
+        port = _free_port()
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--log-level", "warning"],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        try:
+            durations.append(_wait_ready(f"http://127.0.0.1:{port}/api/v1/probe/ready", start, timeout))
+        finally:
+            process.terminate()
+            process.wait()
+
+    return runner.from_durations(durations)
+
+
+def _wait_ready(url: str, start: float, timeout: float) -> float:
+    with httpx.Client(timeout=1) as client:
+        while time.perf_counter() - start < timeout:
+            try:
+                if client.get(url).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.TransportError:
+                pass
+            time.sleep(.005)
+
+    raise TimeoutError(f"service not ready within {timeout} s")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark startup of the service (import and time to ready)")
+    parser.add_argument("--exporter", default="none", help="TELEMETRY_EXPORTER of the measured service")
+    parser.add_argument("--setup", choices=["background", "blocking"], default="background",
+                        help="TELEMETRY_SETUP of the measured service")
+    parser.add_argument("--repeat", type=int, default=5, help="number of measured starts of every benchmark")
+    parser.add_argument("--output", help="save results to given JSON file")
+    parser.add_argument("--baseline", help="compare results with given JSON file (exit code 1 on regression)")
+    parser.add_argument("--threshold", type=float, default=.1, help="tolerated relative slowdown")
+    args = parser.parse_args(argv)
+
+    params = {key: getattr(args, key) for key in ["exporter", "setup", "repeat"]}
+    env = _environment(args.exporter, args.setup)
+
+    results = {
+        "startup.import": bench_import(env, repeat=args.repeat),
+        "startup.ready": bench_ready(env, repeat=args.repeat),
+    }
+
+    comparison = None
+    if args.baseline:
+        comparison = runner.compare(results, runner.load(args.baseline)["results"], threshold=args.threshold)
+
+    runner.report(results, comparison)
+
+    if args.output:
+        runner.save(args.output, runner.metadata(params), results)
+
+    return int(any(item["regression"] for item in comparison or []))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import random
+
+
+def generate_documents(
+    *,
+    sheets: int = 2,
+    rows: int = 100,
+    cols: int = 10,
+    periods: int = 3,
+    cashflow: bool = True,
+    loans: bool = True,
+    seed: int = 0,
+) -> list[dict]:
+    """
+    Generate synthetic /score payload (JSON ready list of documents).
+    :param sheets: Number of sheets of every mandatory document
+    :param rows: Number of rows of every sheet
+    :param cols: Number of columns of every sheet (2 label columns + numeric columns)
+    :param periods: Number of consecutive periods of mandatory documents
+    :param cashflow: Whether optional cashflow document is included
+    :param loans: Whether optional loan document is included
+    :param seed: Random seed (same parameters and seed give the same payload)
+    :return: List of documents
+    """
+    rnd = random.Random(seed)
+
+    def _items(labels: int) -> list[list]:
+        return [
+            [*(f"label-{i}-{j}" for j in range(labels)), *(round(rnd.uniform(0, 1e6), 2) for _ in range(cols - labels))]
+            for i in range(rows)
+        ]
+
+    def _document(key: str, year: int, sheet_labels: list[int]) -> dict:
+        doc_id = f"{key}-{year}"
+        return {
+            "_type": "doc",
+            "id": doc_id,
+            "subject_id": "subject",
+            "type": {"key": key, "name": f"Document {key}", "layer": 1, "order": 1},
+            "period": f"{year}-12-31",
+            "version": {"version": 1, "author": "bench", "created": "2024-01-01T00:00:00"},
+            "sheets": [
+                {
+                    "_type": "sheet",
+                    "id": f"{doc_id}-{number}",
+                    "subject_id": "subject",
+                    "doc_id": doc_id,
+                    "name": f"Sheet {number}",
+                    "number": number,
+                    "items": _items(labels),
+                }
+                for number, labels in enumerate(sheet_labels, 1)
+            ],
+        }
+
+    docs = [
+        _document(key, year, [2] * sheets)
+        for key in ["001", "002"]
+        for year in range(2024 - periods + 1, 2025)
+    ]
+    if cashflow:
+        docs.append(_document("003", 2024, [1, 4]))
+    if loans:
+        docs.append(_document("080", 2024, [5]))
+
+    return docs
+
+
+def generate_payload_of_size(size: int, *, cols: int = 20, seed: int = 0) -> list[dict]:
+    """
+    Generate synthetic /score payload of approximately given JSON size.
+    :param size: Target size in bytes
+    :param cols: Number of columns of every sheet
+    :param seed: Random seed
+    :return: List of documents
+    """
+    # ~10 bytes per cell, 2 sheets x 6 mandatory documents + 3 optional sheets
+    rows = max(1, size // (cols * 10 * 15))
+    return generate_documents(rows=rows, cols=cols, seed=seed)
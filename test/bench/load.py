@@ -0,0 +1,333 @@
+import sys
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import resource
+import contextlib
+import collections
+import unittest.mock
+import orjson
+import httpx
+import aiohttp.web
+
+from src.core.config import CONFIG
+from test.bench import runner
+from test.bench.generator import generate_documents
+
+
+class StandInStore:
+    """
+    Local stand-in of the data target API (store-service) with injectable latency and error rate.
+    Serves single item (POST /api/v1/document) and bulk (POST /api/v1/bulk) endpoints.
+    """
+
+    def __init__(self, *, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0) -> None:
+        """
+        :param latency: Mean response latency in seconds
+        :param jitter: Maximal deviation from the mean latency in seconds (uniformly distributed)
+        :param error_rate: Probability of a request failing with 503
+        :param seed: Random seed
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self.items = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._runner: aiohttp.web.AppRunner | None = None
+
+        self.app = aiohttp.web.Application(client_max_size=1024 ** 3)
+        self.app.router.add_post("/api/v1/document", self._document)
+        self.app.router.add_post("/api/v1/bulk", self._bulk)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """
+        :param host: Host to listen on
+        :param port: Port to listen on (0 = any free port)
+        :return: Base URL of the store
+        """
+        self._runner = aiohttp.web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = aiohttp.web.TCPSite(self._runner, host, port)
+        await site.start()
+        host, port = site._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "items": self.items, "errors": self.errors}
+
+    async def _respond(self) -> bool:
+        """
+        Simulate latency of the store, False if the request should fail.
+        """
+        self.requests += 1
+        delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self._random.random() < self.error_rate:
+            self.errors += 1
+            return False
+
+        return True
+
+    async def _document(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
+        await request.read()
+        if not await self._respond():
+            return aiohttp.web.Response(status=503)
+
+        self.items += 1
+        return aiohttp.web.Response(status=201, text=uuid.uuid4().hex)
+
+    async def _bulk(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
+        items = orjson.loads(await request.read())
+        if not await self._respond():
+            return aiohttp.web.Response(status=503)
+
+        self.items += len(items)
+        return aiohttp.web.Response(
+            status=207,
+            body=orjson.dumps([{"status": 201, "id": uuid.uuid4().hex} for _ in items]),
+            content_type="application/json",
+        )
+
+
+def read_payloads(path: str) -> list[bytes]:
+    """
+    Read /score payloads from JSONL file - every line is either the payload itself (JSON array of documents)
+    or captured request object with the payload in "body".
+    :param path: JSONL file
+    :return: Encoded payloads (request bodies)
+    """
+    payloads = []
+
+    with open(path, "rb") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith(b"{"):
+                line = orjson.dumps(orjson.loads(line)["body"])
+            payloads.append(line)
+
+    return payloads
+
+
+def write_payloads(path: str, count: int, **params) -> None:
+    """
+    Write synthetic /score payloads to JSONL file (one payload per line, different data in each).
+    :param path: JSONL file
+    :param count: Number of payloads
+    :param params: Parameters of generate_documents
+    """
+    with open(path, "wb") as file:
+        for seed in range(count):
+            file.write(orjson.dumps(generate_documents(**params, seed=seed)) + b"\n")
+
+
+class _Recorder:
+    """
+    Outcomes of sent requests.
+    """
+
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.outcomes: collections.Counter = collections.Counter()
+
+    async def send(self, client: httpx.AsyncClient, body: bytes, number: int) -> None:
+        start = time.perf_counter()
+        try:
+            response = await client.post(
+                "/api/v1/score",
+                content=body,
+                headers={"content-type": "application/json", "correlation-id": f"load-{number}"},
+            )
+            outcome = str(response.status_code)
+        except httpx.HTTPError as e:
+            outcome = type(e).__name__
+        self.latencies.append(time.perf_counter() - start)
+        self.outcomes[outcome] += 1
+
+
+async def run_closed(
+    client: httpx.AsyncClient,
+    payloads: list[bytes],
+    *,
+    requests: int,
+    concurrency: int,
+) -> _Recorder:
+    """
+    Closed loop load - given number of clients, each sends next request as soon as the previous one completes.
+    """
+    recorder = _Recorder()
+    numbers = iter(range(requests))
+
+    async def _client() -> None:
+        for number in numbers:
+            await recorder.send(client, payloads[number % len(payloads)], number)
+
+    await asyncio.gather(*(_client() for _ in range(concurrency)))
+    return recorder
+
+
+async def run_open(
+    client: httpx.AsyncClient,
+    payloads: list[bytes],
+    *,
+    requests: int,
+    rate: float,
+    seed: int = 0,
+) -> _Recorder:
+    """
+    Open loop load - requests arrive at given mean rate (Poisson process) regardless of completion of previous ones.
+    """
+    recorder = _Recorder()
+    rnd = random.Random(seed)
+    tasks = []
+
+    for number in range(requests):
+        tasks.append(asyncio.create_task(recorder.send(client, payloads[number % len(payloads)], number)))
+        await asyncio.sleep(rnd.expovariate(rate))
+
+    await asyncio.gather(*tasks)
+    return recorder
+
+
+@contextlib.asynccontextmanager
+async def _in_process_client(timeout: float):
+    """
+    Client of the application running in this process (full lifespan - executor, data target session
+    and write-behind queue), telemetry is not exported.
+    """
+    import main
+
+    with unittest.mock.patch.object(CONFIG, "TELEMETRY_EXPORTER", "none"):
+        async with main.app.router.lifespan_context(main.app):
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=main.app), base_url="http://load", timeout=timeout,
+            ) as client:
+                yield client
+
+
+def peak_rss(pid: int | None = None) -> float | None:
+    """
+    Peak resident set size of given process (this process by default) in MB.
+    """
+    if pid is None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    try:
+        with open(f"/proc/{pid}/status") as file:
+            for line in file:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+
+    return None
+
+
+def summary(recorder: _Recorder, duration: float) -> dict:
+    """
+    :return: Throughput, latency percentiles and outcome counts of the load run
+    """
+    latencies = sorted(recorder.latencies)
+    succeeded = recorder.outcomes.get("201", 0)
+
+    return {
+        "requests": len(latencies),
+        "duration_s": duration,
+        "throughput_rps": succeeded / duration if duration else None,
+        "p50_s": runner.percentile(latencies, .5),
+        "p95_s": runner.percentile(latencies, .95),
+        "p99_s": runner.percentile(latencies, .99),
+        "max_s": latencies[-1],
+        "outcomes": dict(recorder.outcomes),
+        "errors": len(latencies) - succeeded,
+    }
+
+
+async def main(args: argparse.Namespace) -> dict:
+    payloads = read_payloads(args.payloads)
+    store = StandInStore(latency=args.store_latency, jitter=args.store_jitter, error_rate=args.store_error_rate)
+    store_url = await store.start(port=args.store_port)
+    print(f"stand-in store listening on {store_url}", file=sys.stderr)
+
+    if args.url is None:
+        CONFIG.DATA_TARGET_URL = f"{store_url}/api/v1/document"
+        CONFIG.DATA_TARGET_BULK_URL = f"{store_url}/api/v1/bulk" if args.store_bulk else None
+        client_context = _in_process_client(args.timeout)
+    else:
+        client_context = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+
+    try:
+        async with client_context as client:
+            start = time.perf_counter()
+            if args.rate is None:
+                recorder = await run_closed(client, payloads, requests=args.requests, concurrency=args.concurrency)
+            else:
+                recorder = await run_open(client, payloads, requests=args.requests, rate=args.rate)
+            duration = time.perf_counter() - start
+    finally:
+        await store.stop()
+
+    return {
+        "meta": runner.metadata(vars(args)),
+        "load": summary(recorder, duration),
+        "store": store.stats(),
+        "peak_rss_mb": {
+            "load": peak_rss(),
+            "server": peak_rss(args.server_pid) if args.server_pid else None,
+        },
+    }
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Replay /score payloads from JSONL file")
+    parser.add_argument("payloads", help="JSONL file with /score payloads (one per line)")
+    parser.add_argument("--generate", type=int, metavar="COUNT", help="write COUNT synthetic payloads first")
+    parser.add_argument("--rows", type=int, default=100, help="rows of every sheet of synthetic payloads")
+    parser.add_argument("--cols", type=int, default=10, help="columns of every sheet of synthetic payloads")
+    parser.add_argument("--url", help="base URL of running service (application is run in-process otherwise)")
+    parser.add_argument("--server-pid", type=int, help="PID of the running service (for its peak RSS)")
+    parser.add_argument("--requests", type=int, default=100, help="number of requests (payloads are cycled)")
+    parser.add_argument("--concurrency", type=int, default=4, help="number of concurrent clients (closed loop)")
+    parser.add_argument("--rate", type=float, help="mean arrival rate per second (open loop)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="request timeout in seconds")
+    parser.add_argument("--store-port", type=int, default=0, help="port of the stand-in store")
+    parser.add_argument("--store-bulk", action="store_true", help="let the service use the bulk endpoint")
+    parser.add_argument("--store-latency", type=float, default=0.0, help="mean store latency in seconds")
+    parser.add_argument("--store-jitter", type=float, default=0.0, help="store latency deviation in seconds")
+    parser.add_argument("--store-error-rate", type=float, default=0.0, help="probability of store failure")
+    parser.add_argument("--output", help="save results to given JSON file")
+    return parser
+
+
+if __name__ == "__main__":
+    arguments = _parser().parse_args()
+
+    if arguments.generate:
+        write_payloads(arguments.payloads, arguments.generate, rows=arguments.rows, cols=arguments.cols)
+
+    results = asyncio.run(main(arguments))
+    load = results["load"]
+    print(
+        f"{load['requests']} requests in {load['duration_s']:.2f}s  {load['throughput_rps']:.1f} req/s  "
+        f"p50 {load['p50_s'] * 1e3:.1f} ms  p95 {load['p95_s'] * 1e3:.1f} ms  p99 {load['p99_s'] * 1e3:.1f} ms  "
+        f"errors {load['errors']}  peak RSS {results['peak_rss_mb']['load']:.0f} MB",
+        file=sys.stderr,
+    )
+
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(results, output, indent=2)
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,196 @@
+import sys
+import json
+import time
+import typing
+import platform
+import argparse
+import statistics
+import subprocess
+import datetime as dt
+
+
+def measure(func: typing.Callable[[], typing.Any], *, repeat: int, warmup: int = 1, cells: int = 0) -> dict:
+    """
+    Measure duration of repeated calls of given function.
+    :param func: Function to be measured (without arguments)
+    :param repeat: Number of measured calls
+    :param warmup: Number of calls before measurement (not measured)
+    :param cells: Number of sheet cells processed by a single call (for throughput)
+    :return: Result statistics
+    """
+    for _ in range(warmup):
+        func()
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+
+    return from_durations(durations, cells)
+
+
+async def measure_async(
+    func: typing.Callable[[], typing.Awaitable],
+    *,
+    repeat: int,
+    warmup: int = 1,
+    cells: int = 0,
+) -> dict:
+    """
+    Measure duration of repeated calls of given coroutine function, see measure.
+    """
+    for _ in range(warmup):
+        await func()
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        durations.append(time.perf_counter() - start)
+
+    return from_durations(durations, cells)
+
+
+def from_durations(durations: list[float], cells: int = 0) -> dict:
+    """
+    Statistics of measured durations (also for durations measured elsewhere, e.g. in a subprocess).
+    :param durations: Durations in seconds
+    :param cells: Number of sheet cells processed by a single call (for throughput)
+    :return: Result statistics
+    """
+    durations = sorted(durations)
+    median = statistics.median(durations)
+
+    return {
+        "repeat": len(durations),
+        "min_s": durations[0],
+        "median_s": median,
+        "mean_s": statistics.fmean(durations),
+        "p95_s": percentile(durations, .95),
+        "cells": cells,
+        "cells_per_s": cells / median if median else None,
+    }
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    :param values: Sorted values
+    :param q: Quantile (0 - 1)
+    :return: Value of given quantile (nearest rank)
+    """
+    return values[min(len(values) - 1, round(q * (len(values) - 1)))]
+
+
+def metadata(params: dict) -> dict:
+    """
+    Metadata of benchmark run (commit, environment and benchmark parameters).
+    :param params: Benchmark parameters
+    :return: Metadata
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "created": dt.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "params": params,
+    }
+
+
+def save(path: str, meta: dict, results: dict[str, dict]) -> None:
+    """
+    Save benchmark results as JSON.
+    :param path: Output file
+    :param meta: Run metadata
+    :param results: Statistics per benchmark name
+    """
+    with open(path, "w") as file:
+        json.dump({"meta": meta, "results": results}, file, indent=2)
+
+
+def load(path: str) -> dict:
+    """
+    :param path: File saved by save
+    :return: Saved benchmark run
+    """
+    with open(path) as file:
+        return json.load(file)
+
+
+def compare(
+    results: dict[str, dict],
+    baseline: dict[str, dict],
+    *,
+    threshold: float = .1,
+    min_delta: float = .001,
+) -> list[dict]:
+    """
+    Compare benchmark results with baseline (benchmarks present in both only).
+    Median latency is compared, i.e. throughput regression is flagged as well (it is derived from the same value).
+    :param results: Statistics per benchmark name
+    :param baseline: Baseline statistics per benchmark name
+    :param threshold: Relative slowdown tolerated before flagged as regression
+    :param min_delta: Absolute slowdown (seconds) tolerated regardless of threshold (noise of very short benchmarks)
+    :return: Comparison per benchmark
+    """
+    comparison = []
+
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+
+        ratio = stats["median_s"] / baseline[name]["median_s"]
+        delta = stats["median_s"] - baseline[name]["median_s"]
+        comparison.append({
+            "name": name,
+            "baseline_s": baseline[name]["median_s"],
+            "median_s": stats["median_s"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold and delta > min_delta,
+        })
+
+    return comparison
+
+
+def report(results: dict[str, dict], comparison: list[dict] | None = None, file: typing.TextIO = sys.stderr) -> None:
+    """
+    Print human readable summary of benchmark results (and of comparison with baseline).
+    """
+    by_name = {item["name"]: item for item in comparison or []}
+
+    for name, stats in results.items():
+        line = f"{name:<36} median {stats['median_s'] * 1e3:10.2f} ms  p95 {stats['p95_s'] * 1e3:10.2f} ms"
+        if stats["cells_per_s"]:
+            line += f"  {stats['cells_per_s'] / 1e6:8.2f} Mcells/s"
+        if name in by_name:
+            item = by_name[name]
+            line += f"  {item['ratio']:5.2f}x baseline" + ("  REGRESSION" if item["regression"] else "")
+        print(line, file=file)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Compare two saved benchmark runs, exit code 1 on regression.
+    """
+    parser = argparse.ArgumentParser(description="Compare benchmark results with baseline")
+    parser.add_argument("results", help="benchmark results (JSON)")
+    parser.add_argument("baseline", help="baseline benchmark results (JSON)")
+    parser.add_argument("--threshold", type=float, default=.1, help="tolerated relative slowdown")
+    args = parser.parse_args(argv)
+
+    results = load(args.results)["results"]
+    comparison = compare(results, load(args.baseline)["results"], threshold=args.threshold)
+    report(results, comparison)
+
+    return int(any(item["regression"] for item in comparison))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,13 +12,13 @@ def mock_score_service() -> unittest.mock.Mock:
 
 
 @pytest.fixture
-def mock_data_target_service() -> unittest.mock.Mock:
-    with unittest.mock.patch("src.api.v1.score.data_target") as mock_data_target_service:
-        yield mock_data_target_service
+def mock_write_behind_service() -> unittest.mock.Mock:
+    with unittest.mock.patch("src.api.v1.score.write_behind") as mock_write_behind_service:
+        yield mock_write_behind_service
 
 
 @pytest.fixture
-async def async_client(mock_environ, mock_score_service, mock_data_target_service) -> httpx.AsyncClient:
+async def async_client(mock_environ, mock_score_service, mock_write_behind_service) -> httpx.AsyncClient:
     from main import app
 
     transport = httpx.ASGITransport(app=app)
@@ -0,0 +1,77 @@
+import pytest
+import httpx
+
+from src.service import profiler
+
+
+@pytest.fixture
+def debug_token(monkeypatch) -> str:
+    from src.core.config import CONFIG
+
+    monkeypatch.setattr(CONFIG, "DEBUG_TOKEN", "secret")
+    monkeypatch.setattr(profiler, "_session", None)
+    yield CONFIG.DEBUG_TOKEN
+    profiler.stop()
+
+
+@pytest.mark.asyncio
+async def test_profile__disabled(async_client: httpx.AsyncClient) -> None:
+    response = await async_client.get("/api/v1/debug/profile", headers={"debug-token": "secret"})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_profile__invalid_token(async_client: httpx.AsyncClient, debug_token) -> None:
+    response = await async_client.get("/api/v1/debug/profile", headers={"debug-token": "wrong"})
+
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_profile(
+    async_client: httpx.AsyncClient,
+    debug_token,
+    mock_001_docs,
+    mock_score_service,
+    mock_write_behind_service,
+) -> None:
+    headers = {"debug-token": debug_token}
+    settings = {"mode": "cprofile", "requests": 1}
+    mock_score_service.calculate_summary_document.return_value = mock_001_docs[0]
+    mock_score_service.calculate_scoring_documents.return_value = mock_001_docs
+    mock_score_service.calculate_final_document.return_value = mock_001_docs[0]
+
+    response = await async_client.post("/api/v1/debug/profile", json=settings, headers=headers)
+    assert response.status_code == 201
+    assert response.json()["state"] == "running"
+
+    response = await async_client.post("/api/v1/debug/profile", json=settings, headers=headers)
+    assert response.status_code == 409
+
+    response = await async_client.get("/api/v1/debug/profile/artifact", headers=headers)
+    assert response.status_code == 404
+
+    response = await async_client.post(
+        "/api/v1/score",
+        json=[doc.model_dump(mode="json", by_alias=True) for doc in mock_001_docs],
+    )
+    assert response.status_code == 201
+
+    response = await async_client.get("/api/v1/debug/profile", headers=headers)
+    assert response.json()["state"] == "finished"
+    assert response.json()["profiled_requests"] == 1
+
+    response = await async_client.get("/api/v1/debug/profile/artifact", params={"text": True}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-disposition"].startswith('attachment; filename="profile-cprofile-')
+    assert "_calculate" in response.text
+
+
+@pytest.mark.asyncio
+async def test_profile__unbounded(async_client: httpx.AsyncClient, debug_token) -> None:
+    response = await async_client.post(
+        "/api/v1/debug/profile", json={"mode": "sampling"}, headers={"debug-token": debug_token},
+    )
+
+    assert response.status_code == 422
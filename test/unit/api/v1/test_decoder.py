@@ -0,0 +1,237 @@
+import typing
+import unittest.mock
+import orjson
+import pytest
+import httpx
+import fastapi
+
+from src.api.v1 import decoder
+from src.core import memory
+from src.model.columnar import ColumnarItems
+from src.model.document_set import DocumentSet
+from src.service.ingest import StreamedInput
+
+
+@pytest.fixture
+async def decoder_clients() -> tuple[httpx.AsyncClient, httpx.AsyncClient]:
+    clients = []
+
+    for decode_documents in [decoder._decode_default, decoder._decode_fast]:
+        app = fastapi.FastAPI()
+
+        @app.post("/decode")
+        async def decode(docs: typing.Annotated[DocumentSet, fastapi.Depends(decode_documents)]) -> dict:
+            return {"docs": len(docs), "columnar": all(isinstance(s.items, ColumnarItems) for d in docs for s in d.sheets)}
+
+        clients.append(httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test"))
+
+    yield tuple(clients)
+
+    for client in clients:
+        await client.aclose()
+
+
+@pytest.fixture
+async def streaming_client() -> httpx.AsyncClient:
+    app = fastapi.FastAPI()
+
+    @app.post("/decode")
+    async def decode(docs: typing.Annotated[StreamedInput, fastapi.Depends(decoder._decode_streaming)]) -> dict:
+        return {"docs": docs.count, "periods": docs.has_periods("001", 3)}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_decode__success(decoder_clients, mock_001_docs, monkeypatch) -> None:
+    default_client, fast_client = decoder_clients
+    body = [doc.model_dump(mode="json", by_alias=True) for doc in mock_001_docs]
+
+    default_response = await default_client.post("/decode", json=body)
+    fast_response = await fast_client.post("/decode", json=body)
+
+    assert default_response.status_code == fast_response.status_code == 200
+    assert default_response.json() == {"docs": 3, "columnar": False}
+    # small body - configured sheet storage
+    assert fast_response.json() == {"docs": 3, "columnar": False}
+
+    monkeypatch.setattr(decoder, "_SMALL_BODY_BYTES", 0)
+    fast_response = await fast_client.post("/decode", json=body)
+
+    assert fast_response.json() == {"docs": 3, "columnar": True}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"",
+        b"{}",
+        b"[{\"id\": 1}]",
+        b"[{\"id\": \"1\", \"subject_id\": \"1\", \"type\": {}, \"period\": \"x\", \"version\": {}, \"sheets\": [{}]}]",
+    ]
+)
+async def test_decode__validation_error(decoder_clients, streaming_client, body) -> None:
+    default_client, fast_client = decoder_clients
+
+    default_response = await default_client.post("/decode", content=body, headers={"content-type": "application/json"})
+    fast_response = await fast_client.post("/decode", content=body, headers={"content-type": "application/json"})
+    streaming_response = await streaming_client.post(
+        "/decode", content=body, headers={"content-type": "application/json"},
+    )
+
+    assert default_response.status_code == fast_response.status_code == streaming_response.status_code == 422
+    assert default_response.json() == fast_response.json() == streaming_response.json()
+
+
+@pytest.mark.asyncio
+async def test_decode__json_error(decoder_clients) -> None:
+    default_client, fast_client = decoder_clients
+
+    default_response = await default_client.post("/decode", content=b"[1,", headers={"content-type": "application/json"})
+    fast_response = await fast_client.post("/decode", content=b"[1,", headers={"content-type": "application/json"})
+
+    assert default_response.status_code == fast_response.status_code == 422
+    assert fast_response.json()["detail"][0]["type"] == default_response.json()["detail"][0]["type"] == "json_invalid"
+    assert fast_response.json()["detail"][0]["loc"] == default_response.json()["detail"][0]["loc"] == ["body", 3]
+    assert fast_response.json()["detail"][0]["msg"] == default_response.json()["detail"][0]["msg"]
+
+
+@pytest.mark.asyncio
+async def test_decode_default__parse_body_stage(mock_001_docs) -> None:
+    app = fastapi.FastAPI()
+    router = fastapi.APIRouter(route_class=decoder.ParseTimedRoute)
+
+    @router.post("/decode")
+    async def decode(docs: typing.Annotated[DocumentSet, fastapi.Depends(decoder._decode_default)]) -> dict:
+        return {"docs": len(docs)}
+
+    app.include_router(router)
+    body = orjson.dumps([doc.model_dump(mode="json", by_alias=True) for doc in mock_001_docs])
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        with unittest.mock.patch("src.core.telemetry.emit") as mock_emit:
+            response = await client.post("/decode", content=body, headers={"content-type": "application/json"})
+            invalid_response = await client.post("/decode", content=b"[1,", headers={"content-type": "application/json"})
+
+    assert response.status_code == 200
+    assert invalid_response.status_code == 422
+    assert mock_emit.call_count == 2
+    (stage,), (failed_stage,) = [call.args[0] for call in mock_emit.call_args_list]
+    assert stage.name == failed_stage.name == "parse_body"
+    assert stage.attributes == {"payload_bytes": len(body), "document_count": 3, "cell_count": 60}
+    assert stage.end >= stage.start and stage.error is None
+    assert failed_stage.error == "RequestValidationError"
+
+
+@pytest.mark.asyncio
+async def test_decode_streaming__success(streaming_client, mock_001_docs) -> None:
+    body = orjson.dumps([doc.model_dump(mode="json", by_alias=True) for doc in mock_001_docs])
+
+    async def _chunks():
+        for i in range(0, len(body), 7):
+            yield body[i:i + 7]
+
+    response = await streaming_client.post("/decode", content=_chunks(), headers={"content-type": "application/json"})
+
+    assert response.status_code == 200
+    assert response.json() == {"docs": 3, "periods": True}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [b'[{"a": 1,', b"[1 2]", b"[{}] x", b"[{]", b'[1, {"a": x}]'])
+async def test_decode_streaming__json_error(streaming_client, body) -> None:
+    response = await streaming_client.post("/decode", content=body, headers={"content-type": "application/json"})
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+    assert response.json()["detail"][0]["loc"][0] == "body"
+
+
+@pytest.mark.asyncio
+async def test_decode_streaming__json_error_after_invalid_document(streaming_client) -> None:
+    response = await streaming_client.post("/decode", content=b"[1,", headers={"content-type": "application/json"})
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+    assert response.json()["detail"][0]["loc"] == ["body", 3]
+
+
+@pytest.mark.asyncio
+async def test_decode_streaming__max_bytes_chunked(monkeypatch) -> None:
+    monkeypatch.setattr(memory.CONFIG, "REQUEST_MAX_BYTES", 20)
+    monkeypatch.setattr(memory, "_budget", None)
+    app = fastapi.FastAPI()
+    app.add_middleware(memory.MemoryGuardMiddleware, paths=("/decode",))
+
+    @app.post("/decode")
+    async def decode(docs: typing.Annotated[StreamedInput, fastapi.Depends(decoder._decode_streaming)]) -> dict:
+        return {"docs": docs.count}
+
+    async def _body():
+        # body exceeds the limit before the first document is complete
+        yield b'[{"id": "'
+        for _ in range(5):
+            yield b"x" * 10
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/decode", content=_body(), headers={"content-type": "application/json"})
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request too large"}
+
+
+@pytest.mark.asyncio
+async def test_decode_streaming__aggregation_error(streaming_client, mock_001_docs, caplog) -> None:
+    body = [doc.model_dump(mode="json", by_alias=True) for doc in mock_001_docs]
+    # fewer sheets than the first document of the type
+    body[1]["sheets"] = body[1]["sheets"][:1]
+
+    response = await streaming_client.post("/decode", json=body)
+
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Internal Server Error"}
+    assert caplog.records[-1].levelname == "ERROR"
+    assert caplog.records[-1].message.startswith("HTTP 500 - scoring failed due to unexpected error")
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b"[]",
+        b" [ 1 , 2.5 ,\"a\"] ",
+        b'[{"a": "x]},[{\\"}", "b": [1, {"c": []}]}, [], "\\\\", null]',
+    ],
+)
+def test_json_array_splitter(body) -> None:
+    for chunk_size in range(1, len(body) + 1):
+        splitter = decoder.JSONArraySplitter()
+        elements = []
+
+        for i in range(0, len(body), chunk_size):
+            elements.extend(splitter.feed(body[i:i + chunk_size]))
+        splitter.close()
+
+        assert [orjson.loads(element) for _, element in elements] == orjson.loads(body)
+        assert all(body[pos:pos + len(element)] == element for pos, element in elements)
+
+
+@pytest.mark.parametrize("body", [b"", b"  ", b"{}", b"1"])
+def test_json_array_splitter__not_array(body) -> None:
+    splitter = decoder.JSONArraySplitter()
+
+    with pytest.raises(decoder.JSONArraySplitter.NotArray):
+        splitter.feed(body)
+        splitter.close()
+
+
+def test_request_body_openapi() -> None:
+    request_body = decoder._request_body_openapi()["requestBody"]
+    schema = request_body["content"]["application/json"]["schema"]
+
+    assert request_body["required"] is True
+    assert schema["type"] == "array"
+    assert {"id", "type", "period", "sheets"} <= set(schema["items"]["required"])
+    # self-contained (definitions of input models are not among the components)
+    assert b"$ref" not in orjson.dumps(schema)
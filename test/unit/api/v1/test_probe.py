@@ -1,5 +1,9 @@
 import pytest
 import httpx
+import unittest.mock
+
+from src.core import admission
+from src.core.config import CONFIG
 
 
 @pytest.mark.asyncio
@@ -17,3 +21,51 @@ async def test_ready(async_client: httpx.AsyncClient) -> None:
     assert response.status_code == 200
     assert response.json() == {"detail": "Ready"}
 
+
+@pytest.mark.asyncio
+async def test_ready__in_flight(async_client: httpx.AsyncClient, monkeypatch) -> None:
+    monkeypatch.setattr(CONFIG, "READY_MAX_IN_FLIGHT", 2)
+    monkeypatch.setattr(admission, "_limiter", admission.Limiter(None, 0))
+    for _ in range(3):
+        await admission.limiter().acquire(timeout=1)
+
+    response = await async_client.get("/api/v1/probe/ready")
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Not ready - 3 scoring requests in flight"}
+
+
+@pytest.mark.asyncio
+async def test_ready__backlog(async_client: httpx.AsyncClient, monkeypatch) -> None:
+    monkeypatch.setattr(CONFIG, "READY_MAX_BACKLOG", 10)
+
+    with unittest.mock.patch("src.api.v1.probe.write_behind.backlog", return_value=11):
+        response = await async_client.get("/api/v1/probe/ready")
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Not ready - 11 results waiting for persistence"}
+
+
+@pytest.mark.asyncio
+async def test_metrics(async_client: httpx.AsyncClient) -> None:
+    await async_client.get("/api/v1/probe/alive")
+
+    response = await async_client.get("/api/v1/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/probe/alive",status="200"}' in response.text
+    assert "persistence_backlog 0" in response.text
+    assert "process_resident_memory_bytes " in response.text
+
+
+@pytest.mark.asyncio
+async def test_ready__other_workers(async_client: httpx.AsyncClient, monkeypatch) -> None:
+    monkeypatch.setattr(CONFIG, "READY_MAX_IN_FLIGHT", 2)
+
+    with unittest.mock.patch("src.api.v1.probe.workers.others", return_value=[1, 2]):
+        response = await async_client.get("/api/v1/probe/ready")
+
+    assert response.status_code == 503
+    assert response.json() == {"detail": "Not ready - 3 scoring requests in flight"}
@@ -1,12 +1,20 @@
 import pytest
 import httpx
+import logging
+import unittest.mock
 
+from src.core import admission, memory
 from src.core.exception import HTTPException
 from src.model.document import FullDocument
 
 
 @pytest.mark.asyncio
-async def test_score__happy_path(async_client: httpx.AsyncClient, mock_001_docs, mock_score_service) -> None:
+async def test_score__happy_path(
+    async_client: httpx.AsyncClient,
+    mock_001_docs,
+    mock_score_service,
+    mock_write_behind_service,
+) -> None:
     mock_score_service.calculate_summary_document.return_value = mock_001_docs[0]
     mock_score_service.calculate_scoring_documents.return_value = mock_001_docs
     mock_score_service.calculate_final_document.return_value = mock_001_docs[0]
@@ -17,7 +25,11 @@ async def test_score__happy_path(async_client: httpx.AsyncClient, mock_001_docs,
     )
 
     assert response.status_code == 201
-    assert FullDocument(**response.json())
+    assert response.headers["content-type"] == "application/json"
+    assert FullDocument(**response.json()) == mock_001_docs[0]
+
+    encoded_docs = mock_write_behind_service.enqueue.call_args.args[0]
+    assert encoded_docs[-1].full == response.content
 
 
 @pytest.mark.asyncio
@@ -47,3 +59,285 @@ async def test_score__generic_error(async_client: httpx.AsyncClient, mock_001_do
 
     assert response.status_code == 500
     assert response.json() == {"detail": "Internal Server Error"}
+
+
+@pytest.mark.asyncio
+async def test_score__cached(
+    async_client: httpx.AsyncClient,
+    mock_001_docs,
+    mock_score_service,
+    mock_write_behind_service,
+    monkeypatch,
+) -> None:
+    from src.core.config import CONFIG
+    from src.service import cache
+
+    monkeypatch.setattr(CONFIG, "RESULT_CACHE_BACKEND", "memory")
+    monkeypatch.setattr(cache, "_backend", None)
+    mock_score_service.calculate_summary_document.return_value = mock_001_docs[0]
+    mock_score_service.calculate_scoring_documents.return_value = mock_001_docs
+    mock_score_service.calculate_final_document.return_value = mock_001_docs[0]
+
+    async def _enqueue(data, correlation_id, on_written):
+        await on_written()
+
+    mock_write_behind_service.enqueue = unittest.mock.AsyncMock(side_effect=_enqueue)
+
+    payload = [doc.model_dump(mode="json", by_alias=True) for doc in mock_001_docs]
+    first = await async_client.post("/api/v1/score", json=payload)
+    second = await async_client.post("/api/v1/score", json=payload)
+
+    assert first.status_code == second.status_code == 201
+    assert first.content == second.content
+    assert mock_score_service.calculate_final_document.call_count == 1
+    assert mock_write_behind_service.enqueue.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_score__not_cached_until_written(
+    async_client: httpx.AsyncClient,
+    mock_001_docs,
+    mock_score_service,
+    mock_write_behind_service,
+    monkeypatch,
+) -> None:
+    from src.core.config import CONFIG
+    from src.service import cache
+
+    monkeypatch.setattr(CONFIG, "RESULT_CACHE_BACKEND", "memory")
+    monkeypatch.setattr(cache, "_backend", None)
+    mock_score_service.calculate_summary_document.return_value = mock_001_docs[0]
+    mock_score_service.calculate_scoring_documents.return_value = mock_001_docs
+    mock_score_service.calculate_final_document.return_value = mock_001_docs[0]
+    # results never written (on_written not called)
+    mock_write_behind_service.enqueue = unittest.mock.AsyncMock()
+
+    payload = [doc.model_dump(mode="json", by_alias=True) for doc in mock_001_docs]
+    first = await async_client.post("/api/v1/score", json=payload)
+    second = await async_client.post("/api/v1/score", json=payload)
+
+    assert first.status_code == second.status_code == 201
+    assert mock_score_service.calculate_final_document.call_count == 2
+    assert mock_write_behind_service.enqueue.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_score__stages(
+    async_client: httpx.AsyncClient,
+    mock_001_docs,
+    mock_score_service,
+    mock_write_behind_service,
+) -> None:
+    mock_score_service.calculate_summary_document.return_value = mock_001_docs[0]
+    mock_score_service.calculate_scoring_documents.return_value = mock_001_docs
+    mock_score_service.calculate_final_document.return_value = mock_001_docs[0]
+
+    with unittest.mock.patch("src.core.telemetry.emit") as mock_emit:
+        response = await async_client.post(
+            "/api/v1/score",
+            json=[doc.model_dump(mode="json", by_alias=True) for doc in mock_001_docs],
+        )
+
+    assert response.status_code == 201
+    stages = mock_emit.call_args.args[0]
+    assert [stage.name for stage in stages] == [
+        "validate_input",
+        "calculate_summary_document",
+        "calculate_summary_document",
+        "calculate_scoring_documents",
+        "calculate_final_document",
+        "serialize_response",
+    ]
+    assert stages[0].attributes == {"document_count": 3}
+    assert stages[1].attributes == {"document_type": "001", "document_count": 3, "cell_count": 60}
+    assert stages[-1].attributes["document_count"] == 6
+    assert stages[-1].attributes["payload_bytes"] > 0
+
+
+@pytest.mark.asyncio
+async def test_score__stages_failed(
+    async_client: httpx.AsyncClient,
+    mock_001_docs,
+    mock_score_service,
+) -> None:
+    mock_score_service.calculate_summary_document.return_value = mock_001_docs[0]
+    mock_score_service.calculate_scoring_documents.side_effect = ValueError("test")
+
+    with unittest.mock.patch("src.core.telemetry.emit") as mock_emit:
+        response = await async_client.post(
+            "/api/v1/score",
+            json=[doc.model_dump(mode="json", by_alias=True) for doc in mock_001_docs],
+        )
+
+    assert response.status_code == 500
+    stages = mock_emit.call_args.args[0]
+    assert [(stage.name, stage.error) for stage in stages] == [
+        ("validate_input", None),
+        ("calculate_summary_document", None),
+        ("calculate_summary_document", None),
+        ("calculate_scoring_documents", "ValueError"),
+    ]
+
+
+@pytest.fixture
+def memory_config(monkeypatch):
+    from src.core.config import CONFIG
+
+    monkeypatch.setattr(memory, "_budget", None)
+    yield CONFIG
+
+
+@pytest.mark.asyncio
+async def test_score__max_bytes(async_client: httpx.AsyncClient, memory_config, monkeypatch) -> None:
+    monkeypatch.setattr(memory_config, "REQUEST_MAX_BYTES", 10)
+
+    response = await async_client.post("/api/v1/score", content=b"[" + b" " * 20 + b"]")
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request too large"}
+    assert memory.rejections.value(reason="size") >= 1
+
+
+@pytest.mark.asyncio
+async def test_score__max_bytes_chunked(async_client: httpx.AsyncClient, memory_config, monkeypatch) -> None:
+    monkeypatch.setattr(memory_config, "REQUEST_MAX_BYTES", 10)
+
+    async def _body():
+        for _ in range(5):
+            yield b"[{}, {}]"
+
+    response = await async_client.post(
+        "/api/v1/score",
+        content=_body(),
+        headers={"content-type": "application/json"},
+    )
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "Request too large"}
+
+
+@pytest.mark.asyncio
+async def test_score__memory_budget_unavailable(
+    async_client: httpx.AsyncClient,
+    memory_config,
+    monkeypatch,
+) -> None:
+    monkeypatch.setattr(memory_config, "REQUEST_MEMORY_BUDGET", 100)
+    monkeypatch.setattr(memory_config, "REQUEST_MEMORY_WAIT", 0.01)
+    await memory.budget().acquire(100, timeout=0)
+
+    response = await async_client.post("/api/v1/score", json=[])
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+@pytest.fixture
+def admission_config(monkeypatch):
+    from src.core.config import CONFIG
+
+    monkeypatch.setattr(admission, "_limiter", None)
+    yield CONFIG
+
+
+@pytest.mark.asyncio
+async def test_score__admission_queue_full(async_client: httpx.AsyncClient, admission_config, monkeypatch) -> None:
+    monkeypatch.setattr(admission_config, "SCORE_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(admission_config, "SCORE_QUEUE_SIZE", 0)
+    await admission.limiter().acquire(timeout=1)
+
+    response = await async_client.post("/api/v1/score", json=[])
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+    assert response.json() == {"detail": "Too many requests"}
+
+
+@pytest.mark.asyncio
+async def test_score__admission_timeout(async_client: httpx.AsyncClient, admission_config, monkeypatch) -> None:
+    monkeypatch.setattr(admission_config, "SCORE_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(admission_config, "SCORE_QUEUE_WAIT", 0.01)
+    await admission.limiter().acquire(timeout=1)
+
+    response = await async_client.post("/api/v1/score", json=[])
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    assert admission.limiter().waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_score__admitted(async_client: httpx.AsyncClient, admission_config, monkeypatch) -> None:
+    monkeypatch.setattr(admission_config, "SCORE_MAX_CONCURRENCY", 1)
+
+    response = await async_client.post("/api/v1/score", json=[])
+
+    assert response.status_code == 201
+    assert admission.limiter().running == 0
+
+
+@pytest.mark.asyncio
+async def test_score__cells_over_memory_budget(
+    async_client: httpx.AsyncClient,
+    memory_config,
+    monkeypatch,
+    mock_001_docs,
+    mock_score_service,
+) -> None:
+    # 3 documents of 20 cells
+    monkeypatch.setattr(memory_config, "REQUEST_MEMORY_BUDGET", 60 * memory.CELL_BYTES - 1)
+    monkeypatch.setattr(memory_config, "REQUEST_MEMORY_FACTOR", 0)
+
+    response = await async_client.post(
+        "/api/v1/score",
+        json=[doc.model_dump(mode="json", by_alias=True) for doc in mock_001_docs],
+    )
+
+    assert response.status_code == 413
+    mock_score_service.calculate_final_document.assert_not_called()
+    assert memory.budget().reserved == 0
+
+
+@pytest.mark.asyncio
+async def test_score__cells_over_memory_budget_before_validation(
+    async_client: httpx.AsyncClient,
+    memory_config,
+    monkeypatch,
+    mock_001_docs,
+) -> None:
+    monkeypatch.setattr(memory_config, "REQUEST_MEMORY_BUDGET", 60 * memory.CELL_BYTES - 1)
+    monkeypatch.setattr(memory_config, "REQUEST_MEMORY_FACTOR", 0)
+    payload = [doc.model_dump(mode="json", by_alias=True) for doc in mock_001_docs]
+    # rejected before validation of sheet cells (422 otherwise)
+    payload[0]["sheets"][0]["items"][0][-1] = {"invalid": "cell"}
+
+    response = await async_client.post("/api/v1/score", json=payload)
+
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_score__memory_tracking(
+    async_client: httpx.AsyncClient,
+    memory_config,
+    monkeypatch,
+    mock_001_docs,
+    mock_score_service,
+    mock_write_behind_service,
+    caplog,
+) -> None:
+    monkeypatch.setattr(memory_config, "REQUEST_MEMORY_TRACKING", True)
+    mock_score_service.calculate_summary_document.return_value = mock_001_docs[0]
+    mock_score_service.calculate_scoring_documents.return_value = mock_001_docs
+    mock_score_service.calculate_final_document.return_value = mock_001_docs[0]
+    count = memory.peak_histogram.count(process="server")
+
+    with caplog.at_level(logging.INFO, logger="src.core.memory"):
+        response = await async_client.post(
+            "/api/v1/score",
+            json=[doc.model_dump(mode="json", by_alias=True) for doc in mock_001_docs],
+        )
+
+    assert response.status_code == 201
+    assert memory.peak_histogram.count(process="server") == count + 1
+    assert any("MB peak traced" in record.message for record in caplog.records)
@@ -0,0 +1,71 @@
+import pytest
+import asyncio
+
+from src.core import admission
+
+
+@pytest.mark.asyncio
+async def test_limiter() -> None:
+    limiter = admission.Limiter(1, queue_size=1)
+
+    assert await limiter.acquire(timeout=1)
+    assert not limiter.full()
+    assert not await limiter.acquire(timeout=0.01)
+
+    waiting = asyncio.create_task(limiter.acquire(timeout=1))
+    await asyncio.sleep(0.01)
+
+    assert limiter.waiting == 1
+    assert limiter.full()
+
+    await limiter.release()
+
+    assert await waiting
+    assert limiter.running == 1
+    assert limiter.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter__fifo() -> None:
+    limiter = admission.Limiter(1, queue_size=3)
+    admitted = []
+
+    async def acquire(name: str, timeout: float = 1) -> bool:
+        result = await limiter.acquire(timeout=timeout)
+        if result:
+            admitted.append(name)
+        return result
+
+    assert await acquire("running")
+    first = asyncio.create_task(acquire("first"))
+    await asyncio.sleep(0.01)
+    timed_out = asyncio.create_task(acquire("timed_out", timeout=0.01))
+    await asyncio.sleep(0.01)
+    second = asyncio.create_task(acquire("second"))
+    await asyncio.sleep(0.02)
+
+    assert not await timed_out
+    assert limiter.waiting == 2
+
+    # freed slot goes to the first waiting request, a new one does not overtake the queue
+    await limiter.release()
+    assert not await acquire("new", timeout=0.01)
+    assert await first
+
+    await limiter.release()
+    assert await second
+
+    assert admitted == ["running", "first", "second"]
+    assert limiter.running == 1
+    assert limiter.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter__unlimited() -> None:
+    limiter = admission.Limiter(None, queue_size=0)
+
+    for _ in range(10):
+        assert await limiter.acquire(timeout=0.01)
+
+    assert limiter.running == 10
+    assert not limiter.full()
@@ -6,9 +6,77 @@ async def test_config(mock_environ) -> None:
     from src.core.config import CONFIG
 
     assert CONFIG.DATA_TARGET_URL == "http://faspo-store-service/api/v1/document"
+    assert CONFIG.DATA_TARGET_BULK_URL is None
+    assert CONFIG.DATA_TARGET_BULK_RETRY_INTERVAL == 300.0
+    assert CONFIG.DATA_TARGET_CONCURRENCY == 50
+    assert CONFIG.DATA_TARGET_REQUEST_CONCURRENCY == 8
+    assert CONFIG.DATA_TARGET_ORDERED_WRITES is True
+    assert CONFIG.DATA_TARGET_POOL_SIZE == 100
+    assert CONFIG.DATA_TARGET_POOL_SIZE_PER_HOST == 0
+    assert CONFIG.DATA_TARGET_KEEPALIVE_TIMEOUT == 30.0
+    assert CONFIG.DATA_TARGET_TIMEOUT == 60.0
+    assert CONFIG.DATA_TARGET_CONNECT_TIMEOUT == 5.0
+    assert CONFIG.PERSISTENCE_QUEUE_SIZE == 1000
+    assert CONFIG.PERSISTENCE_WORKERS == 4
+    assert CONFIG.PERSISTENCE_RETRY_ATTEMPTS == 5
+    assert CONFIG.PERSISTENCE_RETRY_BACKOFF == 0.5
+    assert CONFIG.PERSISTENCE_RETRY_BACKOFF_MAX == 30.0
+    assert CONFIG.PERSISTENCE_SPOOL_PATH is None
+    assert CONFIG.PERSISTENCE_SHUTDOWN_TIMEOUT == 10.0
+    assert CONFIG.RESULT_CACHE_BACKEND is None
+    assert CONFIG.RESULT_CACHE_MAX_ENTRIES == 1000
+    assert CONFIG.RESULT_CACHE_MAX_BYTES == 256 * 1024 * 1024
+    assert CONFIG.RESULT_CACHE_TTL == 3600.0
     assert CONFIG.REQUIRED_DOCUMENT_TYPES == ["001", "002"]
     assert CONFIG.REQUIRED_DOCUMENT_PERIODS == 3
     assert CONFIG.OPTIONAL_CASHFLOW_DOCUMENT_TYPE == "003"
     assert CONFIG.OPTIONAL_LOAN_DOCUMENT_TYPE == "080"
+    assert CONFIG.SHEET_STORAGE_MODE == "list"
+    assert CONFIG.SUMMARY_MODE == "full"
+    assert CONFIG.SUMMARY_WINDOW_CACHE_MAX_BYTES == 64 * 1024 * 1024
+    assert CONFIG.SCORE_REQUEST_DECODER == "default"
+    assert CONFIG.SCORE_EXECUTION_MODE == "thread"
+    assert CONFIG.SCORE_PROCESS_POOL_SIZE is None
+    assert CONFIG.SCORE_PROCESS_MIN_CELLS == 50_000
+    assert CONFIG.SERVER_HOST == "0.0.0.0"
+    assert CONFIG.SERVER_PORT == 8080
+    assert CONFIG.SERVER_WORKERS == 1
+    assert CONFIG.SERVER_LOOP == "auto"
+    assert CONFIG.SERVER_HTTP == "auto"
+    assert CONFIG.SERVER_BACKLOG == 2048
+    assert CONFIG.SERVER_KEEP_ALIVE == 65
+    assert CONFIG.SERVER_MAX_REQUESTS is None
+    assert CONFIG.SERVER_MAX_REQUESTS_JITTER is None
+    assert CONFIG.SERVER_GRACEFUL_TIMEOUT == 30
+    assert CONFIG.SERVER_STATE_DIR is None
+    assert CONFIG.SCORE_MAX_CONCURRENCY is None
+    assert CONFIG.SCORE_QUEUE_SIZE == 100
+    assert CONFIG.SCORE_QUEUE_WAIT == 5.0
+    assert CONFIG.READY_MAX_IN_FLIGHT is None
+    assert CONFIG.READY_MAX_BACKLOG is None
+    assert CONFIG.REQUEST_MAX_BYTES is None
+    assert CONFIG.REQUEST_MEMORY_BUDGET is None
+    assert CONFIG.REQUEST_MEMORY_FACTOR == 6.0
+    assert CONFIG.REQUEST_MEMORY_WAIT == 10.0
+    assert CONFIG.REQUEST_MEMORY_TRACKING is False
     assert CONFIG.LOG_LEVEL == "INFO"
+    assert CONFIG.LOG_QUEUE is True
+    assert CONFIG.LOG_SAMPLING == {}
+    assert CONFIG.TELEMETRY_EXPORTER == "azure"
+    assert CONFIG.TELEMETRY_SETUP == "background"
+    assert CONFIG.DEBUG_TOKEN is None
 
+
+@pytest.mark.asyncio
+async def test_config__max_requests_single_worker(mock_environ, monkeypatch) -> None:
+    import pydantic
+    from src.core.config import Config
+
+    monkeypatch.setenv("SERVER_MAX_REQUESTS", "1000")
+
+    with pytest.raises(pydantic.ValidationError, match="SERVER_MAX_REQUESTS requires multiple SERVER_WORKERS"):
+        Config()
+
+    monkeypatch.setenv("SERVER_WORKERS", "2")
+
+    assert Config().SERVER_MAX_REQUESTS == 1000
@@ -1,7 +1,8 @@
 import pytest
+import pickle
 import logging
 
-from src.core.exception import HTTPException
+from src.core.exception import HTTPException, send_http_error
 
 
 @pytest.mark.asyncio
@@ -23,3 +24,50 @@ async def test_http_exception_logging(caplog) -> None:
     assert caplog.records[0].funcName == "test_http_exception_logging"
     assert caplog.records[0].message == "HTTP 404 - Test message"
 
+
+@pytest.mark.asyncio
+async def test_http_exception_logging__args(caplog) -> None:
+    with caplog.at_level(logging.WARNING):
+        HTTPException(status_code=413, detail="Too large", logger_msg="Body of %s B exceeds %s", logger_args=(20, "10%"))
+
+    assert caplog.records[0].msg == "HTTP %s - Body of %s B exceeds %s"
+    assert caplog.records[0].args == (413, 20, "10%")
+    assert caplog.records[0].message == "HTTP 413 - Body of 20 B exceeds 10%"
+
+
+@pytest.mark.asyncio
+async def test_http_exception_pickle(caplog) -> None:
+    exception = HTTPException(status_code=404, detail="Test message", headers={"a": "b"})
+    exception.stage_records = ["record"]
+    caplog.clear()
+
+    with caplog.at_level(logging.DEBUG):
+        restored = pickle.loads(pickle.dumps(exception))
+
+    assert len(caplog.records) == 0
+    assert isinstance(restored, HTTPException)
+    assert restored.status_code == 404
+    assert restored.detail == "Test message"
+    assert restored.headers == {"a": "b"}
+    assert restored.stage_records == ["record"]
+
+
+@pytest.mark.asyncio
+async def test_send_http_error(caplog) -> None:
+    messages = []
+
+    async def send(message) -> None:
+        messages.append(message)
+
+    with caplog.at_level(logging.WARNING):
+        await send_http_error(send, 503, "Service overloaded", {"Retry-After": "1"}, logger_name=__name__)
+
+    assert messages == [
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [(b"content-type", b"application/json"), (b"retry-after", b"1")],
+        },
+        {"type": "http.response.body", "body": b'{"detail":"Service overloaded"}'},
+    ]
+    assert caplog.records[0].message == "HTTP 503 - Service overloaded"
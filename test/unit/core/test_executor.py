@@ -0,0 +1,99 @@
+import os
+import pytest
+import unittest.mock
+
+from src.core import executor, memory
+from src.core.exception import HTTPException
+
+
+def _raise_http_exception() -> None:
+    raise HTTPException(status_code=400, detail="Error")
+
+
+@pytest.fixture
+def process_pool() -> None:
+    with unittest.mock.patch("src.core.executor.CONFIG") as mock_config:
+        mock_config.SCORE_EXECUTION_MODE = "process"
+        mock_config.SCORE_PROCESS_POOL_SIZE = 1
+        mock_config.SCORE_PROCESS_MIN_CELLS = 100
+
+        executor.start_process_pool()
+        yield
+        executor.shutdown_process_pool()
+
+
+@pytest.mark.asyncio
+async def test_run__thread_pool() -> None:
+    assert await executor.run(os.getpid, cost=10**9) == os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_run__process_pool(process_pool) -> None:
+    assert await executor.run(os.getpid, cost=100) != os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_run__process_pool_small_cost(process_pool) -> None:
+    assert await executor.run(os.getpid, cost=99) == os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_run__process_pool_http_exception(process_pool) -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        await executor.run(_raise_http_exception, cost=100)
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Error"
+
+
+@pytest.mark.asyncio
+async def test_run__process_pool_memory_tracking(process_pool) -> None:
+    peaks = []
+    memory.pool_peaks.set(peaks)
+
+    assert await executor.run(bytearray, 10**7, cost=100) == bytearray(10**7)
+    assert await executor.run(os.getpid, cost=99) == os.getpid()
+
+    assert len(peaks) == 1
+    assert peaks[0] >= 10**7
+
+
+@pytest.mark.asyncio
+async def test_start_process_pool__thread_mode() -> None:
+    executor.start_process_pool()
+
+    assert executor._process_pool is None
+
+
+@pytest.mark.asyncio
+async def test_start_process_pool__size_per_server_worker() -> None:
+    with (
+        unittest.mock.patch("src.core.executor.CONFIG") as mock_config,
+        unittest.mock.patch("src.core.executor._available_cpus", return_value=8),
+        unittest.mock.patch("concurrent.futures.ProcessPoolExecutor") as mock_pool,
+    ):
+        mock_config.SCORE_EXECUTION_MODE = "process"
+        mock_config.SCORE_PROCESS_POOL_SIZE = None
+        mock_config.SERVER_WORKERS = 4
+
+        executor.start_process_pool()
+        executor.shutdown_process_pool()
+
+    assert mock_pool.call_args.kwargs["max_workers"] == 2
+
+
+@pytest.mark.parametrize("files, expected", [
+    ({"cpu.max": "250000 100000\n"}, 3),
+    ({"cpu.max": "max 100000\n"}, 8),
+    ({"cpu/cpu.cfs_quota_us": "100000\n", "cpu/cpu.cfs_period_us": "100000\n"}, 1),
+    ({"cpu/cpu.cfs_quota_us": "-1\n", "cpu/cpu.cfs_period_us": "100000\n"}, 8),
+    ({}, 8),
+])
+def test_available_cpus(files, expected, tmp_path, monkeypatch) -> None:
+    for name, content in files.items():
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text(content)
+    monkeypatch.setattr(executor, "_CGROUP_ROOT", str(tmp_path))
+    monkeypatch.setattr(os, "sched_getaffinity", lambda pid: set(range(8)))
+
+    assert executor._available_cpus() == expected
@@ -1,16 +1,26 @@
 import pytest
-import unittest.mock
 import logging
+import logging.handlers
+import asgi_correlation_id
 import datetime as dt
 
+from src.core import logging as core_logging
+
+
+@pytest.fixture(autouse=True)
+def root_handlers():
+    handlers = list(logging.getLogger().handlers)
+    yield
+    core_logging.stop_logging()
+    logging.getLogger().handlers = handlers
+
 
 @pytest.mark.asyncio
 async def test_setup_logging(capsys) -> None:
-    with unittest.mock.patch("azure.monitor.opentelemetry"):
-        from src.core.logging import setup_logging
-        setup_logging()
+    core_logging.setup_logging()
 
     logging.info("Test message")
+    core_logging.stop_logging()
     captured = capsys.readouterr()
 
     assert dt.datetime.now().isoformat().replace("T", " ")[:-7] in captured.err
@@ -19,3 +29,70 @@ async def test_setup_logging(capsys) -> None:
     assert "test_setup_logging" in captured.err
     assert "0000000000000000" in captured.err
     assert "Test message" in captured.err
+
+
+@pytest.mark.asyncio
+async def test_setup_logging__queue(capsys) -> None:
+    core_logging.setup_logging()
+    token = asgi_correlation_id.correlation_id.set("1234567890abcdef")
+
+    try:
+        logging.getLogger("src.test").warning("Test message %s", "with args")
+    finally:
+        asgi_correlation_id.correlation_id.reset(token)
+
+    core_logging.stop_logging()
+    captured = capsys.readouterr()
+
+    [handler] = logging.getLogger().handlers
+    assert isinstance(handler, logging.handlers.QueueHandler)
+    # correlation ID is taken on the logging thread, message is formatted by the listener
+    assert "1234567890abcdef" in captured.err
+    assert "Test message with args" in captured.err
+
+
+@pytest.mark.asyncio
+async def test_queue_handler__prepare() -> None:
+    handler = core_logging._QueueHandler(None)
+    items = [1]
+    record = logging.LogRecord("src.test", logging.INFO, __file__, 1, "Test %s %s", ("message", 2), None)
+    mutable_record = logging.LogRecord("src.test", logging.INFO, __file__, 1, "Test %s", (items,), None)
+
+    # immutable arguments are formatted by the listener
+    assert handler.prepare(record) is record
+    # mutable ones straight away (the logged record itself is left as it is)
+    prepared = handler.prepare(mutable_record)
+    items.append(2)
+    assert (prepared.msg, prepared.args, prepared.getMessage()) == ("Test [1]", None, "Test [1]")
+    assert mutable_record.getMessage() == "Test [1, 2]"
+
+
+@pytest.mark.asyncio
+async def test_setup_logging__no_queue(capsys, monkeypatch) -> None:
+    monkeypatch.setattr(core_logging.CONFIG, "LOG_QUEUE", False)
+    core_logging.setup_logging()
+
+    logging.info("Test message")
+    captured = capsys.readouterr()
+
+    [handler] = logging.getLogger().handlers
+    assert not isinstance(handler, logging.handlers.QueueHandler)
+    assert "Test message" in captured.err
+
+
+@pytest.mark.asyncio
+async def test_setup_logging__sampling(capsys, monkeypatch) -> None:
+    monkeypatch.setattr(core_logging.CONFIG, "LOG_SAMPLING", {"src.api": 0, "src.api.v1.probe": 1})
+    core_logging.setup_logging()
+
+    logging.getLogger("src.api.v1.score").info("Sampled out")
+    logging.getLogger("src.api.v1.score").warning("Warning kept")
+    logging.getLogger("src.api.v1.probe").info("Probe kept")
+    logging.getLogger("src.service").info("Service kept")
+    core_logging.stop_logging()
+    captured = capsys.readouterr()
+
+    assert "Sampled out" not in captured.err
+    assert "Warning kept" in captured.err
+    assert "Probe kept" in captured.err
+    assert "Service kept" in captured.err
@@ -0,0 +1,60 @@
+import pytest
+import asyncio
+
+from src.core import memory
+
+
+@pytest.mark.asyncio
+async def test_memory_budget() -> None:
+    budget = memory.MemoryBudget(100)
+
+    assert await budget.acquire(60, timeout=1)
+    assert not await budget.acquire(60, timeout=0.01)
+
+    waiting = asyncio.create_task(budget.acquire(60, timeout=1))
+    await asyncio.sleep(0.01)
+    await budget.release(60)
+
+    assert await waiting
+    assert budget.reserved == 60
+
+
+@pytest.mark.asyncio
+async def test_memory_budget__retained(monkeypatch) -> None:
+    monkeypatch.setattr(memory, "_retained", {})
+    budget = memory.MemoryBudget(100)
+
+    memory.retain("cache", 50)
+    assert await budget.acquire(40, timeout=1)
+    assert not await budget.acquire(20, timeout=0.01)
+
+    memory.retain("cache", 0)
+    assert await budget.acquire(20, timeout=1)
+    assert memory.retained() == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_budget__retained_shrinks(monkeypatch) -> None:
+    monkeypatch.setattr(memory, "_retained", {})
+    budget = memory.MemoryBudget(100)
+    monkeypatch.setattr(memory, "_budget", budget)
+
+    memory.retain("cache", 50)
+    assert await budget.acquire(40, timeout=1)
+
+    waiting = asyncio.create_task(budget.acquire(20, timeout=1))
+    await asyncio.sleep(0.01)
+    # no request released its reservation, cache shrank (in another thread)
+    await asyncio.to_thread(memory.retain, "cache", 10)
+
+    assert await asyncio.wait_for(waiting, timeout=0.5)
+    assert budget.reserved == 60
+
+
+@pytest.mark.asyncio
+async def test_memory_budget__over_limit() -> None:
+    budget = memory.MemoryBudget(100)
+
+    # larger than the whole budget - admitted alone
+    assert await budget.acquire(200, timeout=0.01)
+    assert not await budget.acquire(1, timeout=0.01)
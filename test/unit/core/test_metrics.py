@@ -0,0 +1,114 @@
+import pytest
+import threading
+import unittest.mock
+
+from src.core import metrics
+
+
+@pytest.fixture(autouse=True)
+def registry() -> list:
+    with unittest.mock.patch("src.core.metrics._registry", []) as registry:
+        yield registry
+
+
+@pytest.mark.asyncio
+async def test_counter() -> None:
+    counter = metrics.Counter("posts", "Posts", labels=("status",))
+
+    counter.inc(status=201)
+    counter.inc(2, status=201)
+    counter.inc(status=503)
+
+    assert counter.value(status=201) == 3
+    assert metrics.render() == (
+        "# HELP posts Posts\n"
+        "# TYPE posts counter\n"
+        'posts_total{status="201"} 3\n'
+        'posts_total{status="503"} 1\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_counter__threads() -> None:
+    counter = metrics.Counter("items", "Items")
+
+    def _inc() -> None:
+        for _ in range(10_000):
+            counter.inc()
+
+    threads = [threading.Thread(target=_inc) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value() == 40_000
+    assert len(counter._shards) == 4
+
+
+@pytest.mark.asyncio
+async def test_gauge() -> None:
+    in_flight = metrics.Gauge("in_flight", "In flight")
+    backlog = metrics.Gauge("backlog", "Backlog", lambda: 7)
+
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+
+    assert metrics.render() == (
+        "# HELP in_flight In flight\n"
+        "# TYPE in_flight gauge\n"
+        "in_flight 1\n"
+        "# HELP backlog Backlog\n"
+        "# TYPE backlog gauge\n"
+        "backlog 7\n"
+    )
+
+
+@pytest.mark.asyncio
+async def test_histogram() -> None:
+    histogram = metrics.Histogram("duration", "Duration", (.1, 1), labels=("stage",))
+
+    histogram.observe(.05, stage='a"b')
+    histogram.observe(.1, stage='a"b')
+    histogram.observe(.5, stage='a"b')
+    histogram.observe(5, stage='a"b')
+
+    assert histogram.count(stage='a"b') == 4
+    assert metrics.render() == (
+        "# HELP duration Duration\n"
+        "# TYPE duration histogram\n"
+        'duration_bucket{stage="a\\"b",le="0.1"} 2\n'
+        'duration_bucket{stage="a\\"b",le="1"} 3\n'
+        'duration_bucket{stage="a\\"b",le="+Inf"} 4\n'
+        'duration_sum{stage="a\\"b"} 5.65\n'
+        'duration_count{stage="a\\"b"} 4\n'
+    )
+
+
+@pytest.mark.asyncio
+async def test_render__shared() -> None:
+    counter = metrics.Counter("posts", "Posts", labels=("status",))
+    histogram = metrics.Histogram("duration", "Duration", (.1,))
+    metrics.Gauge("uptime", "Uptime", lambda: 5, merge=max)
+
+    counter.inc(status=201)
+    histogram.observe(.05)
+    shared = [{"posts": [[["201"], 2], [["503"], 1]], "duration": [[[], [0, 1, 2.0]]], "uptime": [[[], 9]]}]
+
+    assert metrics.snapshot() == {"posts": [[["201"], 1]], "duration": [[[], [1, 0, .05]]], "uptime": [[[], 5]]}
+    assert metrics.render(shared) == (
+        "# HELP posts Posts\n"
+        "# TYPE posts counter\n"
+        'posts_total{status="201"} 3\n'
+        'posts_total{status="503"} 1\n'
+        "# HELP duration Duration\n"
+        "# TYPE duration histogram\n"
+        'duration_bucket{le="0.1"} 1\n'
+        'duration_bucket{le="+Inf"} 2\n'
+        "duration_sum 2.05\n"
+        "duration_count 2\n"
+        "# HELP uptime Uptime\n"
+        "# TYPE uptime gauge\n"
+        "uptime 9\n"
+    )
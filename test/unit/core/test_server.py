@@ -0,0 +1,71 @@
+import os
+import signal
+import pytest
+import unittest.mock
+
+from src.core import server
+
+
+@pytest.mark.asyncio
+async def test_run(monkeypatch) -> None:
+    monkeypatch.setattr(server.CONFIG, "SERVER_WORKERS", 4)
+
+    with unittest.mock.patch("uvicorn.run") as mock_run:
+        server.run()
+
+    mock_run.assert_called_once_with(
+        "main:app",
+        host="0.0.0.0",
+        port=8080,
+        workers=4,
+        loop="auto",
+        http="auto",
+        backlog=2048,
+        timeout_keep_alive=65,
+        timeout_graceful_shutdown=30,
+        log_config=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_run__state_dir(monkeypatch) -> None:
+    monkeypatch.setattr(server.CONFIG, "SERVER_WORKERS", 2)
+    monkeypatch.delenv("SERVER_STATE_DIR", raising=False)
+    state_dirs = []
+
+    with unittest.mock.patch("uvicorn.run", side_effect=lambda *args, **kwargs: state_dirs.append(
+        os.environ["SERVER_STATE_DIR"]
+    )):
+        server.run()
+
+    assert os.path.basename(state_dirs[0]).startswith("faspo-workers-")
+    assert not os.path.exists(state_dirs[0])
+    assert "SERVER_STATE_DIR" not in os.environ
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("jitter, limits", [(0, (3, 3)), (None, (30, 33)), (5, (30, 35))])
+async def test_recycling_middleware__limit(jitter, limits, monkeypatch) -> None:
+    monkeypatch.setattr(server.CONFIG, "SERVER_MAX_REQUESTS", limits[0])
+    monkeypatch.setattr(server.CONFIG, "SERVER_MAX_REQUESTS_JITTER", jitter)
+
+    assert limits[0] <= server.RecyclingMiddleware(None).limit <= limits[1]
+
+
+@pytest.mark.asyncio
+async def test_recycling_middleware(monkeypatch) -> None:
+    monkeypatch.setattr(server.CONFIG, "SERVER_MAX_REQUESTS", 2)
+    monkeypatch.setattr(server.CONFIG, "SERVER_MAX_REQUESTS_JITTER", 0)
+    app = unittest.mock.AsyncMock()
+    middleware = server.RecyclingMiddleware(app)
+
+    with unittest.mock.patch("os.kill") as mock_kill:
+        await middleware({"type": "lifespan"}, None, None)
+        await middleware({"type": "http"}, None, None)
+        mock_kill.assert_not_called()
+
+        await middleware({"type": "http"}, None, None)
+        await middleware({"type": "http"}, None, None)
+
+    mock_kill.assert_called_once_with(os.getpid(), signal.SIGTERM)
+    assert app.await_count == 4
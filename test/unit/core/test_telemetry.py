@@ -0,0 +1,162 @@
+import pytest
+import logging
+import unittest.mock
+import opentelemetry.trace
+import opentelemetry.sdk.trace
+import opentelemetry.sdk.trace.export
+import opentelemetry.sdk.trace.export.in_memory_span_exporter
+
+from src.core import telemetry
+
+
+@pytest.fixture
+def span_exporter() -> opentelemetry.sdk.trace.export.in_memory_span_exporter.InMemorySpanExporter:
+    exporter = opentelemetry.sdk.trace.export.in_memory_span_exporter.InMemorySpanExporter()
+    provider = opentelemetry.sdk.trace.TracerProvider()
+    provider.add_span_processor(opentelemetry.sdk.trace.export.SimpleSpanProcessor(exporter))
+
+    with unittest.mock.patch("src.core.telemetry.tracer", provider.get_tracer(__name__)):
+        yield exporter
+
+
+@pytest.fixture
+def mock_stage_duration() -> unittest.mock.Mock:
+    with unittest.mock.patch("src.core.telemetry.stage_duration") as mock_stage_duration:
+        yield mock_stage_duration
+
+
+@pytest.mark.asyncio
+async def test_stage(span_exporter, mock_stage_duration) -> None:
+    with telemetry.stage("parse_body", payload_bytes=10, cell_count=None) as attributes:
+        attributes["document_count"] = 2
+
+    [span] = span_exporter.get_finished_spans()
+    assert span.name == "parse_body"
+    assert dict(span.attributes) == {"payload_bytes": 10, "document_count": 2}
+    assert span.status.status_code == opentelemetry.trace.StatusCode.UNSET
+
+    mock_stage_duration.record.assert_called_once()
+    duration, attributes = mock_stage_duration.record.call_args.args
+    assert duration == (span.end_time - span.start_time) / 1e9
+    assert attributes == {"stage": "parse_body", "outcome": "success"}
+
+
+@pytest.mark.asyncio
+async def test_stage__error(span_exporter, mock_stage_duration) -> None:
+    with pytest.raises(ZeroDivisionError):
+        with telemetry.stage("validate_input"):
+            1 / 0
+
+    [span] = span_exporter.get_finished_spans()
+    assert span.status.status_code == opentelemetry.trace.StatusCode.ERROR
+    assert span.status.description == "ZeroDivisionError"
+    assert mock_stage_duration.record.call_args.args[1] == {"stage": "validate_input", "outcome": "failure"}
+
+
+@pytest.mark.asyncio
+async def test_stage__recorded(span_exporter, mock_stage_duration) -> None:
+    records = []
+
+    with telemetry.stage("calculate_final_document", records, document_count=4):
+        pass
+
+    assert span_exporter.get_finished_spans() == ()
+    assert [(record.name, record.attributes) for record in records] == [
+        ("calculate_final_document", {"document_count": 4})
+    ]
+
+    with unittest.mock.patch("asgi_correlation_id.correlation_id") as mock_correlation_id:
+        mock_correlation_id.get.return_value = "123"
+        telemetry.emit(records)
+
+    [span] = span_exporter.get_finished_spans()
+    assert span.name == "calculate_final_document"
+    assert dict(span.attributes) == {"correlation_id": "123", "document_count": 4}
+    assert (span.start_time, span.end_time) == (records[0].start, records[0].end)
+
+
+@pytest.mark.asyncio
+async def test_recording__error(span_exporter, mock_stage_duration) -> None:
+    with pytest.raises(ZeroDivisionError) as error:
+        with telemetry.recording() as records:
+            with telemetry.stage("validate_input", records):
+                pass
+            with telemetry.stage("calculate_final_document", records):
+                1 / 0
+
+    assert span_exporter.get_finished_spans() == ()
+    assert [(record.name, record.error) for record in telemetry.attached(error.value)] == [
+        ("validate_input", None),
+        ("calculate_final_document", "ZeroDivisionError"),
+    ]
+    assert telemetry.attached(ValueError()) == []
+
+
+@pytest.mark.asyncio
+async def test_setup_telemetry__azure(monkeypatch) -> None:
+    monkeypatch.setattr(telemetry.CONFIG, "TELEMETRY_EXPORTER", "azure")
+
+    with unittest.mock.patch("azure.monitor.opentelemetry.configure_azure_monitor") as mock_configure_azure_monitor:
+        telemetry.setup_telemetry()
+
+    mock_configure_azure_monitor.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_setup_telemetry__memory(monkeypatch) -> None:
+    monkeypatch.setattr(telemetry.CONFIG, "TELEMETRY_EXPORTER", "memory")
+    monkeypatch.setattr(telemetry, "span_exporter", None)
+    monkeypatch.setattr(telemetry, "metric_reader", None)
+
+    with (
+        unittest.mock.patch("azure.monitor.opentelemetry.configure_azure_monitor") as mock_configure_azure_monitor,
+        unittest.mock.patch("opentelemetry.trace.set_tracer_provider") as mock_set_tracer_provider,
+        unittest.mock.patch("opentelemetry.metrics.set_meter_provider") as mock_set_meter_provider,
+    ):
+        telemetry.setup_telemetry()
+
+    mock_configure_azure_monitor.assert_not_called()
+    provider = mock_set_tracer_provider.call_args.args[0]
+    provider.get_tracer(__name__).start_span("test").end()
+    assert [span.name for span in telemetry.span_exporter.get_finished_spans()] == ["test"]
+    mock_set_meter_provider.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_start_setup__background(monkeypatch, caplog) -> None:
+    monkeypatch.setattr(telemetry.CONFIG, "TELEMETRY_SETUP", "background")
+    monkeypatch.setattr(telemetry, "_setup", None)
+
+    with (
+        caplog.at_level(logging.INFO),
+        unittest.mock.patch.object(telemetry, "setup_telemetry") as mock_setup_telemetry,
+    ):
+        telemetry.start_setup()
+        await telemetry.wait_setup()
+
+    mock_setup_telemetry.assert_called_once()
+    assert caplog.records[-1].message.startswith("telemetry set up in")
+
+
+@pytest.mark.asyncio
+async def test_start_setup__background_failure(monkeypatch, caplog) -> None:
+    monkeypatch.setattr(telemetry.CONFIG, "TELEMETRY_SETUP", "background")
+    monkeypatch.setattr(telemetry, "_setup", None)
+
+    with unittest.mock.patch.object(telemetry, "setup_telemetry", side_effect=ValueError("connection string")):
+        telemetry.start_setup()
+        await telemetry.wait_setup()
+
+    assert caplog.records[-1].message == "telemetry setup failed"
+
+
+@pytest.mark.asyncio
+async def test_start_setup__blocking(monkeypatch) -> None:
+    monkeypatch.setattr(telemetry.CONFIG, "TELEMETRY_SETUP", "blocking")
+    monkeypatch.setattr(telemetry, "_setup", None)
+
+    with unittest.mock.patch.object(telemetry, "setup_telemetry") as mock_setup_telemetry:
+        telemetry.start_setup()
+
+    mock_setup_telemetry.assert_called_once()
+    assert telemetry._setup is None
@@ -0,0 +1,53 @@
+import os
+import orjson
+import pytest
+import asyncio
+
+from src.core import workers
+
+
+@pytest.fixture
+def state_dir(tmp_path, monkeypatch) -> str:
+    monkeypatch.setattr(workers.CONFIG, "SERVER_STATE_DIR", str(tmp_path))
+    monkeypatch.setattr(workers, "_sources", {})
+    return str(tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_others__disabled(monkeypatch) -> None:
+    monkeypatch.setattr(workers.CONFIG, "SERVER_STATE_DIR", None)
+
+    assert await workers.others("in_flight") == []
+
+
+@pytest.mark.asyncio
+async def test_start_stop(state_dir) -> None:
+    workers.share("in_flight", lambda: 3)
+    path = os.path.join(state_dir, f"{os.getpid()}.json")
+
+    await workers.start()
+    while not os.path.exists(path):
+        await asyncio.sleep(.01)
+
+    with open(path, "rb") as file:
+        assert orjson.loads(file.read()) == {"in_flight": 3}
+    # own state is not included
+    assert await workers.others("in_flight") == []
+
+    await workers.stop()
+
+    assert not os.path.exists(path)
+
+
+@pytest.mark.asyncio
+async def test_others(state_dir) -> None:
+    with open(os.path.join(state_dir, f"{os.getppid()}.json"), "wb") as file:
+        file.write(orjson.dumps({"in_flight": 2, "backlog": 5}))
+    # worker killed without clean up
+    dead = os.path.join(state_dir, "999999999.json")
+    with open(dead, "wb") as file:
+        file.write(orjson.dumps({"in_flight": 7}))
+
+    assert await workers.others("in_flight") == [2]
+    assert await workers.others("backlog") == [5]
+    assert not os.path.exists(dead)
@@ -0,0 +1,105 @@
+import pytest
+import numpy as np
+
+from src.model.columnar import ColumnarItems
+
+
+@pytest.mark.asyncio
+async def test_columnar_items():
+    items = [["a", 1, 1.5, None, True], ["b", 2, 2.5, 3.5, False]]
+    columnar = ColumnarItems.from_items(items)
+
+    assert columnar.width == 5
+    assert columnar.labels == {0: ["a", "b"], 4: [True, False]}
+    assert columnar.columns.tolist() == [1, 2, 3]
+    assert columnar.values.flags["C_CONTIGUOUS"]
+    assert columnar.values.dtype == np.float64
+    assert columnar.mask.tolist() == [[False, False, True], [False, False, False]]
+    assert columnar.integer.tolist() == [[True, False, False], [True, False, False]]
+    assert columnar.size == 10
+    assert len(columnar) == 2
+
+
+@pytest.mark.asyncio
+async def test_columnar_items__round_trip():
+    items = [["a", 1, 1.5, None, True], ["b", 2, 2.5, 3.5, False]]
+    columnar = ColumnarItems.from_items(items)
+
+    assert columnar.to_items() == items
+    assert [type(value) for value in columnar.to_items()[0]] == [str, int, float, type(None), bool]
+    assert list(columnar) == items
+    assert columnar[1] == items[1]
+    assert columnar[-1] == items[-1]
+    assert columnar[0:1] == items[0:1]
+    assert columnar == items
+    assert columnar == ColumnarItems.from_items(items)
+
+
+@pytest.mark.asyncio
+async def test_columnar_items__round_trip_mixed():
+    items = [["a", 1, 2 ** 52], ["b", 1.0, None], ["c", None, 3.5], ["d", 2, -0.0]]
+    columnar = ColumnarItems.from_items(items)
+
+    assert columnar.columns.tolist() == [1, 2]
+    types = [[type(value) for value in row] for row in items]
+
+    assert columnar.to_items() == items
+    assert [[type(value) for value in row] for row in columnar.to_items()] == types
+    assert [[type(value) for value in columnar[i]] for i in range(len(items))] == types
+
+
+@pytest.mark.asyncio
+async def test_columnar_items__empty():
+    assert ColumnarItems.from_items([]).to_items() == []
+    assert ColumnarItems.from_items([[], []]).to_items() == [[], []]
+
+
+@pytest.mark.asyncio
+async def test_columnar_items__big_integer():
+    columnar = ColumnarItems.from_items([[2 ** 60, 2 ** 60], [1, 1.5]])
+
+    assert columnar.labels == {0: [2 ** 60, 1], 1: [2 ** 60, 1.5]}
+    assert columnar.to_items() == [[2 ** 60, 2 ** 60], [1, 1.5]]
+
+
+@pytest.mark.asyncio
+async def test_columnar_items__invalid():
+    with pytest.raises(ValueError):
+        ColumnarItems.from_items([[1, 2], [3]])
+
+    with pytest.raises(ValueError):
+        ColumnarItems.from_items([[1, [2]]])
+
+    with pytest.raises(ValueError):
+        ColumnarItems.from_items([[[1], [2]]])
+
+    with pytest.raises(ValueError):
+        ColumnarItems.from_items([[10 ** 400, 1]])
+
+    with pytest.raises(ValueError):
+        ColumnarItems.from_items("items")
+
+
+@pytest.mark.asyncio
+async def test_columnar_items__numeric_block():
+    columnar = ColumnarItems.from_items([["a", "b", 1.0, 2.0], ["c", "d", 3.0, 4.0]])
+
+    assert columnar.numeric_block(2).tolist() == [[1.0, 2.0], [3.0, 4.0]]
+    assert columnar.numeric_block(2).dtype == np.float64
+    assert columnar.numeric_block(3).dtype == np.float64
+    assert columnar.numeric_block(0) is None
+
+
+@pytest.mark.asyncio
+async def test_columnar_items__numeric_block_mixed():
+    columnar = ColumnarItems.from_items([["a", "b", 1, 2.0], ["c", "d", 3, 4.0]])
+
+    # integer column would be promoted to floats
+    assert columnar.numeric_block(2) is None
+    assert columnar.numeric_block(3).dtype == np.float64
+
+
+@pytest.mark.asyncio
+async def test_columnar_items__numeric_block_integer():
+    assert ColumnarItems.from_items([["a", 1, 2]]).numeric_block(1).dtype == np.int64
+    assert ColumnarItems.from_items([["a", 1, None]]).numeric_block(1) is None
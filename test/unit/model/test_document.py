@@ -108,3 +108,40 @@ async def test_document_full():
     assert document.sheets[0].items[0] == [1, 2, 3]
     assert document.sheets[0].items[1] == [4, 5, 6]
 
+
+@pytest.mark.asyncio
+async def test_document_full_header():
+    document = FullDocument(
+        id="123",
+        subject_id="456",
+        type=_DocumentType(key="123", name="Test Document Type", layer=1, order=2),
+        period="2023-10-01",
+        version=_DocumentVersion(version=1, author="Test Author", created="2023-10-01T12:00:00"),
+        sheets=[Sheet(id="789", subject_id="456", doc_id="123", name="Test Sheet", number=1, items=[[1, 2, 3]])],
+    )
+
+    header = document.header()
+
+    assert type(header) is Document
+    assert header == Document(**document.model_dump())
+    assert header.model_dump(by_alias=True) == Document(**document.model_dump()).model_dump(by_alias=True)
+    assert header.type is document.type
+    assert header.sheets == [_SheetInfo(id="789", name="Test Sheet", number=1)]
+
+
+@pytest.mark.asyncio
+async def test_document_full_trusted():
+    data = {
+        "id": "123",
+        "subject_id": "456",
+        "type": {"key": "123", "name": "Test Document Type", "layer": 1, "order": 2},
+        "period": dt.date(2023, 10, 1),
+        "version": {"version": 1, "author": "Test Author", "created": dt.datetime(2023, 10, 1, 12)},
+    }
+    sheet = {"id": "789", "subject_id": "456", "doc_id": "123", "name": "Test Sheet", "number": 1, "items": [[1, 2, 3]]}
+
+    document = FullDocument.trusted(**data, sheets=[Sheet.trusted(**sheet)])
+    validated = FullDocument(**data, sheets=[Sheet(**sheet)])
+
+    assert document == validated
+    assert document.model_dump_json(by_alias=True) == validated.model_dump_json(by_alias=True)
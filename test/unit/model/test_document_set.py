@@ -0,0 +1,62 @@
+import pytest
+
+from src.model.document import FullDocument
+from src.model.document_set import DocumentSet
+
+
+def _document(key: str, period: str) -> FullDocument:
+    return FullDocument(
+        id=f"{key}-{period}",
+        subject_id="1",
+        type={"key": key, "name": "doc_name", "layer": 1, "order": 1},
+        period=period,
+        version={"version": 1, "author": "author", "created": "1970-01-01T00:00:00"},
+        sheets=[],
+    )
+
+
+@pytest.mark.asyncio
+async def test_document_set():
+    docs = [
+        _document("001", "1971-01-01"),
+        _document("002", "1970-01-01"),
+        _document("001", "1970-01-01"),
+        _document("001", "1971-06-30"),
+    ]
+    document_set = DocumentSet(docs)
+
+    assert len(document_set) == 4
+    assert list(document_set) == docs
+    assert document_set.of_type("001") == [docs[0], docs[2], docs[3]]
+    assert document_set.of_type("002") == [docs[1]]
+    assert document_set.of_type("003") == []
+    assert document_set.of_period("001", 1971) == [docs[0], docs[3]]
+    assert document_set.of_period("001", 1972) == []
+    assert document_set.periods("001") == {1970, 1971}
+    assert document_set.periods("003") == set()
+
+
+@pytest.mark.asyncio
+async def test_document_set__has_periods():
+    document_set = DocumentSet(
+        [
+            _document("001", "1970-01-01"),
+            _document("001", "1971-01-01"),
+            _document("002", "1970-01-01"),
+            _document("002", "1972-01-01"),
+        ]
+    )
+
+    assert document_set.has_periods("001", 2)
+    assert not document_set.has_periods("001", 3)
+    assert not document_set.has_periods("002", 2)
+    assert not document_set.has_periods("003", 1)
+
+
+@pytest.mark.asyncio
+async def test_document_set__validate():
+    document_set = DocumentSet.model_validate(
+        [_document("001", "1970-01-01").model_dump(mode="json", by_alias=True)]
+    )
+
+    assert document_set.of_type("001")[0].id == "001-1970-01-01"
@@ -0,0 +1,49 @@
+import json
+import pytest
+
+from src.model.document import FullDocument, Document
+from src.model.encoded import EncodedDocument
+
+
+@pytest.fixture
+def mock_document() -> FullDocument:
+    return FullDocument(
+        id="1",
+        subject_id="1",
+        type={"key": "001", "name": "doc_name", "layer": 1, "order": 1},
+        period="1970-01-01",
+        version={"version": 1, "author": "author", "created": "1970-01-01T00:00:00"},
+        sheets=[
+            {
+                "id": str(i),
+                "subject_id": "1",
+                "doc_id": "1",
+                "name": f"sheet_name_{i}",
+                "number": i,
+                "items": [["a", "b", 1.0, None], ["c", "d", 3, True]],
+            }
+            for i in range(2)
+        ],
+    )
+
+
+def test_from_document__full(mock_document) -> None:
+    encoded = EncodedDocument.from_document(mock_document)
+
+    assert json.loads(encoded.full) == mock_document.model_dump(mode="json", by_alias=True)
+    assert FullDocument.model_validate_json(encoded.full) == mock_document
+
+
+def test_from_document__items(mock_document) -> None:
+    encoded = EncodedDocument.from_document(mock_document)
+
+    assert json.loads(encoded.header) == Document(**mock_document.model_dump()).model_dump(mode="json", by_alias=True)
+    assert [json.loads(item) for item in encoded.sheets] == [
+        sheet.model_dump(mode="json", by_alias=True) for sheet in mock_document.sheets
+    ]
+    assert encoded.items == [encoded.header, *encoded.sheets]
+
+
+def test_full__not_available() -> None:
+    with pytest.raises(ValueError):
+        EncodedDocument(header=b"{}", sheets=[]).full
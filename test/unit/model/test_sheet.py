@@ -35,3 +35,31 @@ async def test_sheet():
     assert sheet.doc_id == "789"
     assert sheet.items == [[1, 2, 3], ["a", "b", "c"], [None, None, None]]
 
+
+@pytest.mark.asyncio
+async def test_sheet__columnar(monkeypatch):
+    from src.core.config import CONFIG
+    from src.model.columnar import ColumnarItems
+
+    monkeypatch.setattr(CONFIG, "SHEET_STORAGE_MODE", "columnar")
+
+    items = [["a", "b", 1, 2.0], ["c", "d", None, 4.5]]
+    sheet = Sheet(id="123", name="Test name", number=1, subject_id="456", doc_id="789", items=items)
+
+    assert isinstance(sheet.items, ColumnarItems)
+    assert sheet.items == items
+    assert sheet.cell_count == 8
+    assert sheet.model_dump()["items"] == items
+    assert Sheet.model_validate_json(sheet.model_dump_json()).items == items
+
+
+@pytest.mark.asyncio
+async def test_sheet__columnar_fallback(monkeypatch):
+    from src.core.config import CONFIG
+
+    monkeypatch.setattr(CONFIG, "SHEET_STORAGE_MODE", "columnar")
+
+    sheet = Sheet(id="123", name="Test name", number=1, subject_id="456", doc_id="789", items=[[1, 2], [3]])
+
+    assert sheet.items == [[1, 2], [3]]
+    assert sheet.cell_count == 3
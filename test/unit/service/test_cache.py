@@ -0,0 +1,184 @@
+import pytest
+import unittest.mock
+
+from src.model.document import FullDocument
+from src.model.document_set import DocumentSet
+
+
+@pytest.fixture
+def mock_time() -> unittest.mock.Mock:
+    with unittest.mock.patch("src.service.cache.time") as mock_time:
+        mock_time.monotonic.return_value = 0.0
+        yield mock_time
+
+
+@pytest.fixture
+def mock_docs() -> list[dict]:
+    return [
+        {
+            "id": str(i),
+            "subject_id": "1",
+            "type": {"key": "001", "name": "doc_name", "layer": 1, "order": 1},
+            "period": f"197{i}-01-01",
+            "version": {"version": 1, "author": "author", "created": "1970-01-01T00:00:00"},
+            "sheets": [
+                {
+                    "id": "1",
+                    "subject_id": "1",
+                    "doc_id": str(i),
+                    "name": "sheet_name",
+                    "number": 1,
+                    "items": [["a", "b", 1.0, 2], ["c", "d", None, 4]],
+                }
+            ],
+        }
+        for i in range(2)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_memory_backend__lru() -> None:
+    from src.service.cache import MemoryCacheBackend
+
+    backend = MemoryCacheBackend(max_entries=2, max_bytes=100, ttl=60)
+
+    await backend.set("a", b"1")
+    await backend.set("b", b"2")
+    assert await backend.get("a") == b"1"
+    await backend.set("c", b"3")
+
+    assert await backend.get("b") is None
+    assert await backend.get("a") == b"1"
+    assert await backend.get("c") == b"3"
+    assert len(backend) == 2
+
+
+@pytest.mark.asyncio
+async def test_memory_backend__max_bytes() -> None:
+    from src.service.cache import MemoryCacheBackend
+
+    backend = MemoryCacheBackend(max_entries=10, max_bytes=4, ttl=60)
+
+    await backend.set("a", b"12")
+    await backend.set("b", b"34")
+    await backend.set("c", b"56")
+    await backend.set("d", b"too big")
+
+    assert await backend.get("a") is None
+    assert await backend.get("d") is None
+    assert backend.size == 4
+
+
+@pytest.mark.asyncio
+async def test_memory_backend__ttl(mock_time) -> None:
+    from src.service.cache import MemoryCacheBackend
+
+    backend = MemoryCacheBackend(max_entries=10, max_bytes=100, ttl=60)
+
+    await backend.set("a", b"1")
+    mock_time.monotonic.return_value = 59.0
+    assert await backend.get("a") == b"1"
+    mock_time.monotonic.return_value = 60.0
+    assert await backend.get("a") is None
+    assert backend.size == 0
+
+
+@pytest.mark.asyncio
+async def test_memory_backend__retained(mock_time, monkeypatch) -> None:
+    from src.core import memory
+    from src.service.cache import MemoryCacheBackend
+
+    monkeypatch.setattr(memory, "_retained", {})
+    backend = MemoryCacheBackend(max_entries=2, max_bytes=100, ttl=60)
+
+    await backend.set("a", b"12")
+    await backend.set("b", b"345")
+    assert memory.retained() == 5
+
+    # evicted
+    await backend.set("c", b"6")
+    assert memory.retained() == 4
+
+    # expired
+    mock_time.monotonic.return_value = 60.0
+    assert await backend.get("b") is None
+    assert memory.retained() == 1
+
+    await backend.clear()
+    assert memory.retained() == 0
+
+
+def test_key__same_input(mock_docs) -> None:
+    from src.service import cache
+
+    assert cache.key(DocumentSet(mock_docs)) == cache.key(DocumentSet(mock_docs))
+    assert cache.key(DocumentSet(mock_docs)) == cache.key([FullDocument(**doc) for doc in mock_docs])
+
+
+def test_key__columnar(mock_docs) -> None:
+    from src.service import cache
+
+    context = {"sheet_storage_mode": "columnar"}
+
+    assert cache.key(DocumentSet.model_validate(mock_docs, context=context)) == cache.key(
+        DocumentSet.model_validate(mock_docs, context=context)
+    )
+
+
+@pytest.mark.parametrize(
+    "path, value",
+    [
+        (("id",), "3"),
+        (("version", "version"), 2),
+        (("sheets", 0, "items", 1, 2), 3.0),
+        (("sheets", 0, "items", 1, 1), "x"),
+    ],
+)
+def test_key__changed_input(mock_docs, path, value) -> None:
+    from src.service import cache
+
+    original = cache.key(DocumentSet(mock_docs))
+
+    target = mock_docs[1]
+    for step in path[:-1]:
+        target = target[step]
+    target[path[-1]] = value
+
+    assert cache.key(DocumentSet(mock_docs)) != original
+
+
+def test_key__config(mock_docs, monkeypatch) -> None:
+    from src.core.config import CONFIG
+    from src.service import cache
+
+    original = cache.key(DocumentSet(mock_docs))
+    monkeypatch.setattr(CONFIG, "REQUIRED_DOCUMENT_PERIODS", 2)
+
+    assert cache.key(DocumentSet(mock_docs)) != original
+
+
+@pytest.mark.asyncio
+async def test_lookup__disabled() -> None:
+    from src.service import cache
+
+    await cache.store("a", b"1")
+
+    assert cache.backend() is None
+    assert await cache.lookup("a") is None
+
+
+@pytest.mark.asyncio
+async def test_lookup__custom_backend(monkeypatch) -> None:
+    from src.core.config import CONFIG
+    from src.service import cache
+
+    backend = unittest.mock.AsyncMock(spec=cache.CacheBackend)
+    backend.get.return_value = b"1"
+    monkeypatch.setattr(CONFIG, "RESULT_CACHE_BACKEND", "custom")
+    monkeypatch.setattr(cache, "_backend", None)
+    monkeypatch.setitem(cache._BACKENDS, "custom", lambda: backend)
+
+    await cache.store("a", b"1")
+
+    assert await cache.lookup("a") == b"1"
+    backend.set.assert_awaited_once_with("a", b"1")
@@ -1,7 +1,13 @@
+import time
 import pytest
+import asyncio
+import logging
+import orjson
 import pydantic
+import unittest.mock
 
 from src.core.exception import HTTPException
+from src.model.encoded import EncodedDocument
 
 
 class _DummyModel(pydantic.BaseModel):
@@ -25,6 +31,23 @@ async def test_post_data__success(mock_aiohttp) -> None:
     )
 
 
+@pytest.mark.asyncio
+async def test_post_data__encoded(mock_aiohttp) -> None:
+    mock_aiohttp.status = 201
+
+    from src.service.data_target import post_data
+    from src.core.config import CONFIG
+
+    response = await post_data(b'{"id":"id"}', correlation_id="123")
+
+    assert response == "id"
+    mock_aiohttp.post.assert_called_once_with(
+        url=f"{CONFIG.DATA_TARGET_URL}",
+        headers={"Correlation-Id": "123", "Content-Type": "application/json"},
+        data=b'{"id":"id"}',
+    )
+
+
 @pytest.mark.asyncio
 async def test_post_data__failure(mock_aiohttp) -> None:
     mock_aiohttp.status = 503
@@ -38,3 +61,296 @@ async def test_post_data__failure(mock_aiohttp) -> None:
     assert exc_info.value.status_code == 503
     assert exc_info.value.detail == "Data target API request failed: Service Unavailable"
 
+
+@pytest.mark.asyncio
+async def test_post_data__shared_session(mock_aiohttp) -> None:
+    mock_aiohttp.status = 201
+    mock_aiohttp.close = unittest.mock.AsyncMock()
+
+    from src.service import data_target
+
+    with unittest.mock.patch("aiohttp.TCPConnector"):
+        await data_target.start_session()
+        await data_target.post_data(_DummyModel(id="id"), correlation_id="123")
+        await data_target.post_data(_DummyModel(id="id"), correlation_id="123")
+        await data_target.close_session()
+
+    assert len([call for call in mock_aiohttp.call_args_list if "connector" in call.kwargs]) == 1
+    assert mock_aiohttp.post.call_count == 2
+    mock_aiohttp.close.assert_awaited_once()
+    assert data_target._session is None
+
+
+@pytest.mark.asyncio
+async def test_pool_stats() -> None:
+    from src.service import data_target
+
+    assert data_target.pool_stats() == {"limit": 0, "acquired": 0, "idle": 0}
+
+    await data_target.start_session()
+    assert data_target.pool_stats() == {"limit": 100, "acquired": 0, "idle": 0}
+
+    await data_target.close_session()
+    assert data_target.pool_stats() == {"limit": 0, "acquired": 0, "idle": 0}
+
+
+@pytest.fixture
+def bulk_url(monkeypatch) -> str:
+    from src.core.config import CONFIG
+    from src.service import data_target
+
+    monkeypatch.setattr(CONFIG, "DATA_TARGET_BULK_URL", "http://faspo-store-service/api/v1/bulk")
+    monkeypatch.setattr(data_target, "_bulk_unsupported_until", 0.0)
+    return CONFIG.DATA_TARGET_BULK_URL
+
+
+@pytest.mark.asyncio
+async def test_post_data_bulk__success(mock_aiohttp, bulk_url) -> None:
+    mock_aiohttp.status = 207
+    mock_aiohttp.json = unittest.mock.AsyncMock(return_value=[{"status": 201, "id": "1"}, {"status": 201, "id": "2"}])
+
+    from src.service.data_target import post_data_bulk
+
+    response = await post_data_bulk([_encoded_document("1", "2")], correlation_id="123")
+
+    assert response == ["1", "2"]
+    mock_aiohttp.post.assert_called_once_with(
+        url=bulk_url,
+        headers={"Correlation-Id": "123", "Content-Type": "application/json"},
+        data=b'[{"id":"1"},{"id":"2"}]',
+    )
+
+
+@pytest.mark.asyncio
+async def test_post_data_bulk__item_failure(mock_aiohttp, bulk_url) -> None:
+    mock_aiohttp.status = 207
+    mock_aiohttp.json = unittest.mock.AsyncMock(return_value=[{"status": 201, "id": "1"}, {"status": 400}])
+
+    from src.service.data_target import post_data_bulk
+
+    with pytest.raises(HTTPException) as exc_info:
+        await post_data_bulk([_encoded_document("1", "2")], correlation_id="123")
+
+    assert exc_info.value.status_code == 502
+    assert exc_info.value.detail == "Data target API bulk request failed for 1 of 2 items"
+
+
+@pytest.mark.asyncio
+async def test_post_data_bulk__results_mismatch(mock_aiohttp, bulk_url) -> None:
+    mock_aiohttp.status = 207
+    mock_aiohttp.json = unittest.mock.AsyncMock(return_value=[{"status": 201, "id": "1"}])
+
+    from src.service.data_target import post_data_bulk
+
+    with pytest.raises(HTTPException) as exc_info:
+        await post_data_bulk([_encoded_document("1", "2")], correlation_id="123")
+
+    assert exc_info.value.status_code == 502
+    assert exc_info.value.detail == "Data target API bulk request returned 1 results for 2 items"
+
+
+@pytest.mark.asyncio
+async def test_post_data_bulk__item_failure_retry(mock_aiohttp, bulk_url) -> None:
+    mock_aiohttp.status = 207
+    mock_aiohttp.json = unittest.mock.AsyncMock(return_value=[{"status": 201, "id": "1"}, {"status": 400}])
+
+    from src.service.data_target import post_data_bulk
+
+    written = [None, None]
+    with pytest.raises(HTTPException):
+        await post_data_bulk([_encoded_document("1", "2")], "123", written)
+
+    assert written == ["1", None]
+
+    mock_aiohttp.json = unittest.mock.AsyncMock(return_value=[{"status": 201, "id": "2"}])
+    response = await post_data_bulk([_encoded_document("1", "2")], "123", written)
+
+    assert response == written == ["1", "2"]
+    # only the failed item is posted again
+    assert mock_aiohttp.post.call_args.kwargs["data"] == b'[{"id":"2"}]'
+
+
+@pytest.mark.asyncio
+async def test_post_data_bulk__not_configured(mock_aiohttp) -> None:
+    mock_aiohttp.status = 201
+
+    from src.service.data_target import post_data_bulk
+    from src.core.config import CONFIG
+
+    response = await post_data_bulk([_encoded_document("1", "2")], correlation_id="123")
+
+    assert response == ["id", "id"]
+    assert mock_aiohttp.post.call_count == 2
+    mock_aiohttp.post.assert_called_with(
+        url=f"{CONFIG.DATA_TARGET_URL}",
+        headers={"Correlation-Id": "123", "Content-Type": "application/json"},
+        data=b'{"id":"2"}',
+    )
+
+
+@pytest.mark.asyncio
+async def test_post_data_bulk__not_supported(mock_aiohttp, bulk_url) -> None:
+    from src.service import data_target
+
+    async def _status(*args, **kwargs):
+        # bulk request is refused, single item requests succeed
+        mock_aiohttp.status = 404 if mock_aiohttp.post.call_count == 1 else 201
+        return mock_aiohttp
+
+    mock_aiohttp.__aenter__.side_effect = _status
+
+    response = await data_target.post_data_bulk([_encoded_document("1", "2")], correlation_id="123")
+
+    assert response == ["id", "id"]
+    assert mock_aiohttp.post.call_count == 3
+    assert data_target._bulk_unsupported_until > time.monotonic()
+
+
+@pytest.mark.asyncio
+async def test_post_data_bulk__not_supported_retried(mock_aiohttp, bulk_url, monkeypatch) -> None:
+    from src.service import data_target
+
+    async def _status(*args, **kwargs):
+        # session itself is entered before any post
+        post = mock_aiohttp.post.call_args
+        mock_aiohttp.status = 207 if post is not None and post.kwargs["url"] == bulk_url else 201
+        return mock_aiohttp
+
+    mock_aiohttp.__aenter__.side_effect = _status
+    mock_aiohttp.json = unittest.mock.AsyncMock(return_value=[{"status": 201, "id": "1"}, {"status": 201, "id": "2"}])
+    monkeypatch.setattr(data_target, "_bulk_unsupported_until", time.monotonic() + 60)
+
+    # bulk endpoint refused recently - items are posted one by one
+    await data_target.post_data_bulk([_encoded_document("1", "2")], correlation_id="123")
+    assert mock_aiohttp.post.call_count == 2
+
+    # retry interval elapsed - bulk endpoint is probed again
+    monkeypatch.setattr(data_target, "_bulk_unsupported_until", time.monotonic() - 1)
+    response = await data_target.post_data_bulk([_encoded_document("1", "2")], correlation_id="123")
+
+    assert response == ["1", "2"]
+    assert mock_aiohttp.post.call_count == 3
+    mock_aiohttp.post.assert_called_with(
+        url=bulk_url,
+        headers={"Correlation-Id": "123", "Content-Type": "application/json"},
+        data=unittest.mock.ANY,
+    )
+
+
+@pytest.fixture
+def mock_post_data() -> unittest.mock.AsyncMock:
+    with unittest.mock.patch("src.service.data_target.post_data") as mock_post_data:
+        yield mock_post_data
+
+
+def _encoded_document(doc_id: str, *sheet_ids: str) -> EncodedDocument:
+    return EncodedDocument(
+        header=orjson.dumps({"id": doc_id}),
+        sheets=[orjson.dumps({"id": sheet_id}) for sheet_id in sheet_ids],
+    )
+
+
+def _id(item: bytes) -> str:
+    return orjson.loads(item)["id"]
+
+
+@pytest.fixture
+def mock_documents() -> list[EncodedDocument]:
+    return [_encoded_document(f"doc{i}", *(f"sheet{i}{j}" for j in range(3))) for i in range(2)]
+
+
+@pytest.mark.asyncio
+async def test_post_data_bulk__concurrency_limit(mock_post_data, mock_documents, monkeypatch) -> None:
+    from src.core.config import CONFIG
+    from src.service.data_target import post_data_bulk
+
+    monkeypatch.setattr(CONFIG, "DATA_TARGET_REQUEST_CONCURRENCY", 2)
+    in_flight = []
+    max_in_flight = 0
+
+    async def _post_data(item, correlation_id):
+        nonlocal max_in_flight
+        in_flight.append(item)
+        max_in_flight = max(max_in_flight, len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(item)
+        return _id(item)
+
+    mock_post_data.side_effect = _post_data
+
+    response = await post_data_bulk(mock_documents, correlation_id="123")
+
+    assert response == [_id(item) for doc in mock_documents for item in doc.items]
+    assert max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_post_data_bulk__ordered(mock_post_data, mock_documents) -> None:
+    from src.service.data_target import post_data_bulk
+
+    posted = []
+
+    async def _post_data(item, correlation_id):
+        await asyncio.sleep(0.01 if _id(item).startswith("doc") else 0)
+        posted.append(_id(item))
+        return _id(item)
+
+    mock_post_data.side_effect = _post_data
+
+    await post_data_bulk(mock_documents, correlation_id="123")
+
+    for i in range(2):
+        assert all(posted.index(f"doc{i}") < posted.index(f"sheet{i}{j}") for j in range(3))
+
+
+@pytest.mark.asyncio
+async def test_post_data_bulk__document_failure(mock_post_data, mock_documents, caplog) -> None:
+    from src.service.data_target import post_data_bulk
+
+    async def _post_data(item, correlation_id):
+        if _id(item) == "doc0":
+            raise HTTPException(status_code=503, detail="Error")
+        return _id(item)
+
+    mock_post_data.side_effect = _post_data
+
+    with (
+        caplog.at_level(logging.INFO, logger="src.service.data_target"),
+        pytest.raises(HTTPException) as exc_info,
+    ):
+        await post_data_bulk(mock_documents, correlation_id="123")
+
+    assert exc_info.value.status_code == 503
+    assert [_id(call.args[0]) for call in mock_post_data.call_args_list] == ["doc0", "doc1", "sheet10", "sheet11", "sheet12"]
+    records = [record for record in caplog.records if record.name == "src.service.data_target"]
+    assert len(records) == 1
+    assert records[0].message.startswith("data target post failure for request 123: 4 of 8 items written in ")
+    # formatted lazily
+    assert records[0].args[:4] == ("failure", "123", 4, 8)
+
+
+@pytest.mark.asyncio
+async def test_post_data_bulk__global_limit_not_held_while_waiting(mock_post_data, monkeypatch) -> None:
+    from src.core.config import CONFIG
+    from src.service import data_target
+
+    monkeypatch.setattr(CONFIG, "DATA_TARGET_CONCURRENCY", 2)
+    monkeypatch.setattr(CONFIG, "DATA_TARGET_REQUEST_CONCURRENCY", 1)
+    monkeypatch.setattr(CONFIG, "DATA_TARGET_ORDERED_WRITES", False)
+    monkeypatch.setattr(data_target, "_global_semaphore", None)
+    posted = []
+
+    async def _post_data(item, correlation_id):
+        posted.append(_id(item))
+        await asyncio.sleep(0.01)
+        return _id(item)
+
+    mock_post_data.side_effect = _post_data
+
+    large = asyncio.create_task(data_target.post_data_bulk([_encoded_document("large", "1", "2", "3")], "1"))
+    await asyncio.sleep(0)
+    await data_target.post_data_bulk([_encoded_document("small")], "2")
+    await large
+
+    # the small request gets the free global permit while the large one waits for its own limit
+    assert posted.index("small") == 1
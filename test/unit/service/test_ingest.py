@@ -0,0 +1,88 @@
+import pytest
+import unittest.mock
+
+from src.api.v1 import score as score_api
+from src.core import executor
+from src.core.exception import HTTPException
+from src.model.document import FullDocument
+from src.service import cache, score
+from src.service.ingest import StreamedInput
+
+
+def _streamed(docs: list[FullDocument], hash_input: bool = False) -> StreamedInput:
+    streamed = StreamedInput(hash_input=hash_input)
+    for doc in docs:
+        streamed.add(doc)
+    return streamed
+
+
+@pytest.mark.asyncio
+async def test_summary_documents__same_as_full(mock_001_docs, mock_002_docs) -> None:
+    streamed = _streamed([*mock_001_docs, *mock_002_docs])
+
+    summary_docs = streamed.summary_documents()
+    expected_docs = [score.calculate_summary_document(mock_001_docs), score.calculate_summary_document(mock_002_docs)]
+
+    for summary_doc, expected_doc in zip(summary_docs, expected_docs):
+        assert summary_doc.type == expected_doc.type
+        assert summary_doc.period == expected_doc.period
+        assert [(sheet.name, sheet.number, sheet.items) for sheet in summary_doc.sheets] == [
+            (sheet.name, sheet.number, sheet.items) for sheet in expected_doc.sheets
+        ]
+
+
+@pytest.mark.asyncio
+async def test_summary_documents__missing_period(mock_001_docs, mock_002_docs) -> None:
+    streamed = _streamed([*mock_001_docs[:2], *mock_002_docs])
+
+    assert streamed.has_periods("001", 3) is False
+    with pytest.raises(HTTPException) as excinfo:
+        streamed.summary_documents()
+
+    assert excinfo.value.status_code == 500
+
+
+@pytest.mark.asyncio
+async def test_has_periods(mock_001_docs, mock_002_docs) -> None:
+    streamed = _streamed([*mock_001_docs, *mock_002_docs])
+
+    assert score.validate_input(streamed)
+    assert streamed.has_periods("001", 3)
+    assert not streamed.has_periods("003", 3)
+
+
+@pytest.mark.asyncio
+async def test_aggregates(mock_001_docs, mock_003_docs, mock_080_docs) -> None:
+    streamed = _streamed([*mock_001_docs, *mock_003_docs, *mock_080_docs])
+
+    assert streamed.aggregates == score.OptionalAggregates.from_documents(mock_003_docs, mock_080_docs)
+    assert streamed.aggregates.has_loans
+
+
+@pytest.mark.asyncio
+async def test_cache_key(mock_001_docs, mock_002_docs) -> None:
+    docs = [*mock_001_docs, *mock_002_docs]
+
+    assert _streamed(docs).cache_key is None
+    assert _streamed(docs, hash_input=True).cache_key == cache.key(docs)
+
+
+@pytest.mark.asyncio
+async def test_process_pool__cache_key(mock_001_docs, mock_002_docs) -> None:
+    streamed = _streamed([*mock_001_docs, *mock_002_docs], hash_input=True)
+    cache_key = streamed.cache_key
+
+    with unittest.mock.patch("src.core.executor.CONFIG") as mock_config:
+        mock_config.SCORE_EXECUTION_MODE = "process"
+        mock_config.SCORE_PROCESS_POOL_SIZE = 1
+        mock_config.SCORE_PROCESS_MIN_CELLS = 0
+
+        executor.start_process_pool()
+        try:
+            # streamed input costs nothing, i.e. it is scored in the pool as well
+            encoded_docs, _ = await executor.run(score_api._calculate, streamed, cost=0)
+        finally:
+            executor.shutdown_process_pool()
+
+    assert encoded_docs[-1].full
+    assert streamed.cache_key == cache_key
@@ -0,0 +1,194 @@
+import random
+import pytest
+
+from src.model.columnar import ColumnarItems
+from src.service import matrix
+
+
+@pytest.mark.asyncio
+async def test_stack_numeric__success() -> None:
+    block = matrix.stack_numeric([[["a", "b", 1.0, 2.0]], [["c", "d", 3.0, 4.0]]])
+
+    assert block.shape == (2, 1, 2)
+    assert block.tolist() == [[[1.0, 2.0]], [[3.0, 4.0]]]
+
+
+@pytest.mark.asyncio
+async def test_stack_numeric__not_numeric() -> None:
+    assert matrix.stack_numeric([[["a", "b", 1.0, None]], [["c", "d", 3.0, 4.0]]]) is None
+    assert matrix.stack_numeric([[["a", "b", 1.0, "x"]], [["c", "d", 3.0, 4.0]]]) is None
+
+
+@pytest.mark.asyncio
+async def test_stack_numeric__not_rectangular() -> None:
+    assert matrix.stack_numeric([[["a", "b", 1.0, 2.0]], [["c", "d", 3.0]]]) is None
+
+
+@pytest.mark.asyncio
+async def test_sum_periods__float() -> None:
+    result = matrix.sum_periods(
+        [
+            [["a", "b", 1.0, 2.0], ["c", "d", 3.0, 4.0]],
+            [["e", "f", 5.0, 6.0], ["g", "h", 7.0, 8.0]],
+        ]
+    )
+
+    assert result == [["a", "b", 6.0, 8.0], ["c", "d", 10.0, 12.0]]
+
+
+@pytest.mark.asyncio
+async def test_sum_periods__int() -> None:
+    result = matrix.sum_periods([[["a", "b", 1, 2]], [["c", "d", 3, 4]]])
+
+    assert result == [["a", "b", 4, 6]]
+    assert all(type(value) is int for value in result[0][2:])
+
+
+@pytest.mark.asyncio
+async def test_sum_periods__mixed_types() -> None:
+    result = matrix.sum_periods([[["a", "b", 1.0, True]], [["c", "d", 3, 4.0]], [["e", "f", 5.0, 6]]])
+
+    assert result == [["a", "b", 9.0, 11.0]]
+
+
+@pytest.mark.asyncio
+async def test_sum_periods__fallback_error() -> None:
+    with pytest.raises(TypeError):
+        matrix.sum_periods([[["a", "b", 1.0, None]], [["c", "d", 3.0, 4.0]]])
+
+
+@pytest.mark.asyncio
+async def test_cross_product__success() -> None:
+    result = matrix.cross_product([["a", "b", 1.0, 2.0], ["c", "d", 3.0, 4.0]])
+
+    assert result.shape == (2, 2)
+    assert result.tolist() == [[3 * 4 / 7, 3 * 6 / 9], [7 * 4 / 11, 7 * 6 / 13]]
+
+
+@pytest.mark.asyncio
+async def test_cross_product__zero_denominator() -> None:
+    result = matrix.cross_product([["a", "b", 1.0, -1.0], ["c", "d", -1.0, 2.0]])
+
+    assert matrix.to_items(result) == [[None, 0.0], [0.0, 1 * 1 / 2]]
+
+
+@pytest.mark.asyncio
+async def test_cross_product__fallback() -> None:
+    result = matrix.cross_product([["a", "b", 1.0, 2.0], ["c", "d", 3.0]])
+
+    assert result.shape == (2, 1)
+    assert result.tolist() == [[3 * 4 / 7], [3 * 4 / 7]]
+
+
+@pytest.mark.asyncio
+async def test_to_items() -> None:
+    result = matrix.to_items(matrix.cross_product([["a", "b", 1.0, 2.0]]))
+
+    assert result == [[1.0 * 3.0 / 4.0, 2.0 * 3.0 / 5.0]]
+    assert all(type(value) is float for value in result[0])
+
+
+@pytest.mark.asyncio
+async def test_sum_periods__columnar() -> None:
+    result = matrix.sum_periods(
+        [
+            ColumnarItems.from_items([["a", "b", 1, 2.0], ["c", "d", 3, 4.0]]),
+            ColumnarItems.from_items([["e", "f", 5, 6.0], ["g", "h", 7, 8.0]]),
+        ]
+    )
+
+    assert result == [["a", "b", 6, 8.0], ["c", "d", 10, 12.0]]
+    assert [type(value) for value in result[0][2:]] == [int, float]
+
+
+@pytest.mark.asyncio
+async def test_sum_periods__columnar_null() -> None:
+    with pytest.raises(TypeError):
+        matrix.sum_periods([ColumnarItems.from_items([["a", "b", None]]), ColumnarItems.from_items([["c", "d", 1.0]])])
+
+
+@pytest.mark.asyncio
+async def test_cross_product__columnar() -> None:
+    items = [["a", "b", 1.0, 2.0], ["c", "d", 3.0, 4.0]]
+
+    assert matrix.cross_product(ColumnarItems.from_items(items)).tolist() == matrix.cross_product(items).tolist()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "matrices",
+    [
+        [[["a", "b", 1.5, 2]], [["c", "d", 3, 4]], [["e", "f", 0.1, 0.2]]],
+        [[["a", "b", 1, 2]], [["c", "d", True, 4]]],
+        [[["a", "b", True, False]], [["c", "d", True, True]]],
+        [[["a", "b", 1, 2 ** 70]], [["c", "d", 3, 4]]],
+        [[["a", "b", 1, 2], ["c", "d", 3, 4]], [["e", "f", 5, 6], ["g", "h", 7, 8], ["i", "j", 9, 10]]],
+    ],
+)
+async def test_period_sum(matrices) -> None:
+    for columnar in [False, True]:
+        if columnar:
+            matrices = [ColumnarItems.from_items(items) for items in matrices]
+
+        period_sum = matrix.PeriodSum()
+        for items in matrices:
+            period_sum.add(items)
+
+        assert period_sum.count == len(matrices)
+        assert period_sum.result() == matrix.sum_periods(matrices)
+
+
+def _mixed_matrices(seed: int, periods: int = 3) -> list[list[list]]:
+    rnd = random.Random(seed)
+    value = [
+        lambda: rnd.randint(-1000, 1000),
+        lambda: rnd.uniform(-1000, 1000),
+        lambda: rnd.choice([0, 1.5, True, 7]),
+        lambda: rnd.randint(2 ** 40, 2 ** 52),
+    ]
+    return [[[f"label{i}", "x", *(value[j % 4]() for j in range(8))] for i in range(6)] for _ in range(periods)]
+
+
+def _typed(items: list[list]) -> list[list]:
+    return [[(type(value), value) for value in row] for row in items]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "matrices",
+    [
+        *(_mixed_matrices(seed) for seed in range(5)),
+        [[["a", "b", 1, 2]], [["c", "d", 3.5, 4.5]], [["e", "f", True, 6]]],
+        [[["a", "b", 2 ** 52 + 1, 2]], [["c", "d", 0.5, 4.5]]],
+        [[["a", "b", 2 ** 60, 2]], [["c", "d", 2 ** 60, 4]]],
+    ],
+)
+async def test_sum_periods__identity(matrices) -> None:
+    # baseline: cell by cell python loop
+    expected = _typed(matrix._sum_periods_python(matrices))
+
+    assert _typed(matrix.sum_periods(matrices)) == expected
+    assert _typed(matrix.sum_periods([ColumnarItems.from_items(items) for items in matrices])) == expected
+
+    period_sum = matrix.PeriodSum()
+    for items in matrices:
+        period_sum.add(items)
+
+    assert _typed(period_sum.result()) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "items",
+    [
+        *(_mixed_matrices(seed, periods=1)[0] for seed in range(5)),
+        [["a", "b", 3, 7], ["c", "d", 11, 13]],
+        [["a", "b", 2 ** 30 + 1, 2 ** 30 + 3], ["c", "d", 2 ** 29 + 7, 5]],
+        [["a", "b", 1.5, 2.25], ["c", "d", 3.125, -4.0]],
+    ],
+)
+async def test_cross_product__identity(items) -> None:
+    expected = matrix._cross_product_python(items)
+
+    assert matrix.cross_product(items).tolist() == expected.tolist()
+    assert matrix.cross_product(ColumnarItems.from_items(items)).tolist() == expected.tolist()
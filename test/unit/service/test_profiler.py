@@ -0,0 +1,112 @@
+import time
+import marshal
+import pytest
+import asyncio
+
+from src.model.profile import ProfileSettings
+from src.service import profiler
+
+
+@pytest.fixture(autouse=True)
+def session(monkeypatch) -> None:
+    monkeypatch.setattr(profiler, "_session", None)
+    yield
+    profiler.stop()
+
+
+def _busy() -> int:
+    return sum(i * i for i in range(10_000))
+
+
+@pytest.mark.asyncio
+async def test_cprofile__requests() -> None:
+    profiler.start(ProfileSettings(mode="cprofile", requests=2))
+
+    for _ in range(2):
+        assert profiler.profiling_calls()
+        result, stats = profiler.call_profiled(_busy)
+        assert result == _busy()
+        profiler.add_stats(stats)
+        profiler.request_done()
+
+    assert not profiler.profiling_calls()
+    assert profiler.status()["state"] == "finished"
+    assert profiler.status()["profiled_requests"] == 2
+
+    content, media_type, filename = profiler.artifact()
+    assert filename.endswith(".prof")
+    calls = {func[2]: stat[1] for func, stat in marshal.loads(content).items()}
+    assert calls["_busy"] == 2
+
+    content, media_type, filename = profiler.artifact(text=True)
+    assert media_type == "text/plain"
+    assert b"_busy" in content
+
+
+@pytest.mark.asyncio
+async def test_sampling__duration() -> None:
+    profiler.start(ProfileSettings(mode="sampling", duration=0.1, interval=0.001))
+    assert profiler.artifact() is None
+
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        _busy()
+    await asyncio.sleep(0.1)
+
+    assert profiler.status()["state"] == "finished"
+    assert not profiler.profiling_calls()
+    content, media_type, filename = profiler.artifact()
+    assert filename.endswith(".collapsed")
+    assert b"_busy" in content
+
+
+@pytest.mark.asyncio
+async def test_tracemalloc() -> None:
+    profiler.start(ProfileSettings(mode="tracemalloc", requests=1))
+
+    data = [bytearray(1024) for _ in range(1000)]
+    profiler.request_done()
+
+    content, media_type, filename = profiler.artifact()
+    assert content.startswith(b"peak traced memory: ")
+    assert b"test_profiler.py" in content
+    del data
+
+
+@pytest.mark.asyncio
+async def test_tracemalloc__tracing_already_started() -> None:
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        profiler.start(ProfileSettings(mode="tracemalloc", requests=1))
+        profiler.request_done()
+
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["sampling", "tracemalloc"])
+async def test_start__process_mode(mode, monkeypatch) -> None:
+    monkeypatch.setattr(profiler.CONFIG, "SCORE_EXECUTION_MODE", "process")
+
+    with pytest.raises(RuntimeError, match="not supported with process execution mode"):
+        profiler.start(ProfileSettings(mode=mode, requests=1))
+
+    assert profiler.start(ProfileSettings(mode="cprofile", requests=1))["state"] == "running"
+
+
+@pytest.mark.asyncio
+async def test_start__already_running() -> None:
+    profiler.start(ProfileSettings(mode="cprofile", requests=1))
+
+    with pytest.raises(RuntimeError):
+        profiler.start(ProfileSettings(mode="cprofile", requests=1))
+
+
+@pytest.mark.asyncio
+async def test_settings__unbounded() -> None:
+    with pytest.raises(ValueError):
+        ProfileSettings(mode="cprofile")
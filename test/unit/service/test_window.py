@@ -0,0 +1,112 @@
+import random
+import pytest
+import unittest.mock
+
+from src.model.document import FullDocument
+from src.service import matrix, window
+
+
+def _document(year: int, items: list[list], version: int = 1, subject_id: str = "1") -> FullDocument:
+    return FullDocument(
+        id=f"doc{year}",
+        subject_id=subject_id,
+        type={"key": "001", "name": "doc_name", "layer": 1, "order": 1},
+        period=f"{year}-01-01",
+        version={"version": version, "author": "author", "created": "1970-01-01T00:00:00"},
+        sheets=[
+            {
+                "id": "1",
+                "subject_id": subject_id,
+                "doc_id": f"doc{year}",
+                "name": "sheet_name",
+                "number": 1,
+                "items": items,
+            }
+        ],
+    )
+
+
+def _items(year: int, kind: type) -> list[list]:
+    rnd = random.Random(year)
+    value = (lambda: rnd.randint(-1000, 1000)) if kind is int else (lambda: rnd.uniform(-1000, 1000))
+    return [[f"label{i}", str(year), *(value() for _ in range(5))] for i in range(4)]
+
+
+@pytest.fixture(autouse=True)
+def clear_windows() -> None:
+    window.clear()
+    yield
+    window.clear()
+
+
+@pytest.fixture
+def spy_update_total() -> list:
+    results = []
+    update_total = window._update_total
+
+    def _update_total(*args):
+        results.append(update_total(*args))
+        return results[-1]
+
+    with unittest.mock.patch("src.service.window._update_total", _update_total):
+        yield results
+
+
+@pytest.mark.parametrize("kind", [int, float])
+def test_sum_periods__moving_window(kind) -> None:
+    docs = {year: _document(year, _items(year, kind)) for year in range(2000, 2010)}
+
+    for start in range(2000, 2008):
+        period_docs = [docs[year] for year in range(start, start + 3)]
+
+        assert window.sum_periods(period_docs, 0) == matrix.sum_periods([doc.sheets[0].items for doc in period_docs])
+
+
+def test_sum_periods__incremental(spy_update_total) -> None:
+    docs = [_document(year, _items(year, int)) for year in range(2000, 2004)]
+
+    window.sum_periods(docs[:3], 0)
+    result = window.sum_periods(docs[1:], 0)
+
+    assert spy_update_total[0] is None
+    assert spy_update_total[1] is not None
+    assert result == matrix.sum_periods([doc.sheets[0].items for doc in docs[1:]])
+    assert window._windows[("1", "001", 0)].keys == tuple(
+        window._PeriodKey(doc.period, doc.id, 1) for doc in docs[1:]
+    )
+
+
+def test_sum_periods__version_change() -> None:
+    docs = [_document(year, _items(year, int)) for year in range(2000, 2003)]
+    window.sum_periods(docs, 0)
+
+    docs[1] = _document(2001, _items(2042, int), version=2)
+
+    assert window.sum_periods(docs, 0) == matrix.sum_periods([doc.sheets[0].items for doc in docs])
+
+
+def test_sum_periods__not_numeric() -> None:
+    docs = [_document(year, [["a", "b", 1, 2 ** 70]]) for year in range(2000, 2003)]
+
+    assert window.sum_periods(docs, 0) == matrix.sum_periods([doc.sheets[0].items for doc in docs])
+    assert ("1", "001", 0) not in window._windows
+
+
+def test_sum_periods__cache_size(monkeypatch) -> None:
+    from src.core import memory
+    from src.core.config import CONFIG
+
+    # 3 periods of 4x5 int64 blocks and the total per window
+    monkeypatch.setattr(CONFIG, "SUMMARY_WINDOW_CACHE_MAX_BYTES", 2 * 4 * 160)
+    monkeypatch.setattr(memory, "_retained", {})
+
+    for subject_id in "123":
+        window.sum_periods([_document(year, _items(year, int), subject_id=subject_id) for year in range(2000, 2003)], 0)
+
+    assert list(window._windows) == [("2", "001", 0), ("3", "001", 0)]
+    assert window._size == 2 * 4 * 160
+    assert memory.retained() == 2 * 4 * 160
+
+    window.clear()
+
+    assert memory.retained() == 0
@@ -0,0 +1,278 @@
+import os
+import json
+import pytest
+import asyncio
+import unittest.mock
+
+from src.core.exception import HTTPException
+from src.model.encoded import EncodedDocument
+
+
+@pytest.fixture
+def mock_post_data_bulk() -> unittest.mock.AsyncMock:
+    with unittest.mock.patch("src.service.data_target.post_data_bulk") as mock_post_data_bulk:
+        yield mock_post_data_bulk
+
+
+@pytest.fixture
+def mock_config(monkeypatch, tmp_path) -> None:
+    from src.core.config import CONFIG
+
+    monkeypatch.setattr(CONFIG, "PERSISTENCE_RETRY_BACKOFF", 0)
+    monkeypatch.setattr(CONFIG, "PERSISTENCE_SPOOL_PATH", str(tmp_path / "spool.jsonl"))
+    return CONFIG
+
+
+@pytest.fixture
+def mock_document() -> EncodedDocument:
+    return EncodedDocument(header=b'{"id":"1","sheets":[{"id":"1"}]}', sheets=[b'{"id":"1","items":[["a",1.0]]}'])
+
+
+@pytest.mark.asyncio
+async def test_enqueue__not_started(mock_post_data_bulk, mock_document) -> None:
+    from src.service import write_behind
+
+    await write_behind.enqueue([mock_document], correlation_id="123")
+
+    mock_post_data_bulk.assert_awaited_once_with([mock_document], "123", [None, None], record=False)
+
+
+def _spool_records(path: str) -> list[dict]:
+    with open(path) as file:
+        return [json.loads(line) for line in file]
+
+
+@pytest.mark.asyncio
+async def test_enqueue__started(mock_post_data_bulk, mock_config, mock_document) -> None:
+    from src.service import write_behind
+
+    written = asyncio.Event()
+
+    async def _post_data_bulk(*args, **kwargs):
+        await written.wait()
+
+    mock_post_data_bulk.side_effect = _post_data_bulk
+
+    await write_behind.start()
+    await write_behind.enqueue([mock_document], correlation_id="123")
+    await write_behind.enqueue([mock_document], correlation_id="456")
+
+    # results are spooled until written
+    records = _spool_records(mock_config.PERSISTENCE_SPOOL_PATH)
+    assert [record["correlation_id"] for record in records] == ["123", "456"]
+    assert records[0]["data"] == [
+        {"header": json.loads(mock_document.header), "sheets": [json.loads(mock_document.sheets[0])]}
+    ]
+
+    written.set()
+    await write_behind.stop()
+
+    mock_post_data_bulk.assert_any_await([mock_document], "123", [None, None], record=False)
+    assert write_behind.backlog() == 0
+    # spool is truncated once all spooled results are written
+    assert _spool_records(mock_config.PERSISTENCE_SPOOL_PATH) == []
+
+
+@pytest.mark.asyncio
+async def test_enqueue__done_marker(mock_post_data_bulk, mock_config, mock_document) -> None:
+    from src.service import write_behind
+
+    blocked = asyncio.Event()
+
+    async def _post_data_bulk(data, correlation_id, written, record):
+        if correlation_id == "456":
+            await blocked.wait()
+
+    mock_post_data_bulk.side_effect = _post_data_bulk
+
+    await write_behind.start()
+    await write_behind.enqueue([mock_document], correlation_id="456")
+    await write_behind.enqueue([mock_document], correlation_id="123")
+    while write_behind.backlog() or len(_spool_records(mock_config.PERSISTENCE_SPOOL_PATH)) < 3:
+        await asyncio.sleep(.01)
+
+    # results still pending, written ones are only marked as done
+    records = _spool_records(mock_config.PERSISTENCE_SPOOL_PATH)
+    assert records[2] == {"done": records[1]["id"]}
+
+    blocked.set()
+    await write_behind.stop()
+
+    assert _spool_records(mock_config.PERSISTENCE_SPOOL_PATH) == []
+
+
+@pytest.mark.asyncio
+async def test_enqueue__failed_not_replayed(mock_post_data_bulk, mock_config, mock_document, caplog) -> None:
+    from src.service import write_behind
+
+    mock_post_data_bulk.side_effect = HTTPException(status_code=400)
+
+    await write_behind.start()
+    await write_behind.enqueue([mock_document], correlation_id="123")
+    await write_behind.stop()
+
+    assert _spool_records(mock_config.PERSISTENCE_SPOOL_PATH) == []
+    assert "writing results of request 123 failed, results dropped" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_enqueue__on_written(mock_post_data_bulk, mock_config, mock_document) -> None:
+    from src.service import write_behind
+
+    on_written = unittest.mock.AsyncMock()
+    mock_post_data_bulk.side_effect = HTTPException(status_code=400)
+
+    with pytest.raises(HTTPException):
+        await write_behind.enqueue([mock_document], "123", on_written)
+
+    on_written.assert_not_awaited()
+
+    mock_post_data_bulk.side_effect = None
+    await write_behind.start()
+    await write_behind.enqueue([mock_document], "123", on_written)
+    await write_behind.stop()
+
+    on_written.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_enqueue__spool_disabled(mock_post_data_bulk, mock_config, mock_document, monkeypatch) -> None:
+    from src.service import write_behind
+
+    monkeypatch.setattr(mock_config, "PERSISTENCE_SPOOL_PATH", None)
+
+    with unittest.mock.patch.object(write_behind, "_append_line") as mock_append_line:
+        await write_behind.start()
+        await write_behind.enqueue([mock_document], correlation_id="123")
+        await write_behind.stop()
+
+    mock_post_data_bulk.assert_awaited_once()
+    mock_append_line.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_enqueue__retry(mock_post_data_bulk, mock_config, mock_document) -> None:
+    mock_post_data_bulk.side_effect = [HTTPException(status_code=503), ["1"]]
+
+    from src.service import write_behind
+
+    await write_behind.enqueue([mock_document], correlation_id="123")
+
+    assert mock_post_data_bulk.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_enqueue__retry_partial_failure(mock_config, mock_document, monkeypatch) -> None:
+    from src.service import data_target, write_behind
+
+    monkeypatch.setattr(mock_config, "DATA_TARGET_BULK_URL", None)
+    posted = []
+
+    async def _post_data(item, correlation_id):
+        posted.append(item)
+        if item in mock_document.sheets and posted.count(item) == 1:
+            raise HTTPException(status_code=503)
+        return "id"
+
+    with (
+        unittest.mock.patch.object(data_target, "post_data", side_effect=_post_data),
+        unittest.mock.patch.object(data_target, "record_post") as mock_record_post,
+    ):
+        await write_behind.enqueue([mock_document], correlation_id="123")
+
+    # header written by the first attempt is not posted again
+    assert posted == [mock_document.header, *mock_document.sheets, *mock_document.sheets]
+    # outcome recorded once for all attempts
+    mock_record_post.assert_called_once_with("123", 2, 0, unittest.mock.ANY)
+
+
+@pytest.mark.asyncio
+async def test_enqueue__retry_exhausted(mock_post_data_bulk, mock_config, mock_document) -> None:
+    mock_post_data_bulk.side_effect = HTTPException(status_code=503)
+
+    from src.service import write_behind
+
+    with (
+        unittest.mock.patch("src.service.data_target.record_post") as mock_record_post,
+        pytest.raises(HTTPException),
+    ):
+        await write_behind.enqueue([mock_document], correlation_id="123")
+
+    assert mock_post_data_bulk.await_count == mock_config.PERSISTENCE_RETRY_ATTEMPTS
+    mock_record_post.assert_called_once_with("123", 2, 2, unittest.mock.ANY)
+
+
+@pytest.mark.asyncio
+async def test_enqueue__no_retry(mock_post_data_bulk, mock_config, mock_document) -> None:
+    mock_post_data_bulk.side_effect = HTTPException(status_code=400)
+
+    from src.service import write_behind
+
+    with pytest.raises(HTTPException):
+        await write_behind.enqueue([mock_document], correlation_id="123")
+
+    assert mock_post_data_bulk.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_start__replay_spool(mock_post_data_bulk, mock_config, mock_document) -> None:
+    with open(mock_config.PERSISTENCE_SPOOL_PATH, "w") as file:
+        data = [{"header": json.loads(mock_document.header), "sheets": [json.loads(mock_document.sheets[0])]}]
+        for record in [
+            {"id": "1", "correlation_id": "123", "data": data},
+            {"id": "2", "correlation_id": "456", "data": data},
+            {"done": "1"},
+        ]:
+            file.write(json.dumps(record) + "\n")
+
+    from src.service import write_behind
+
+    await write_behind.start()
+    await write_behind.stop()
+
+    mock_post_data_bulk.assert_awaited_once_with([mock_document], "456", [None, None], record=False)
+    assert _spool_records(mock_config.PERSISTENCE_SPOOL_PATH) == []
+
+
+@pytest.mark.asyncio
+async def test_claim_spool__server_workers(mock_config, monkeypatch) -> None:
+    from src.service import write_behind
+
+    monkeypatch.setattr(mock_config, "SERVER_WORKERS", 2)
+    monkeypatch.setattr(write_behind, "_spool_slot", None)
+    path = write_behind._claim_spool()
+
+    # slot of another worker (lock held by another open file)
+    monkeypatch.setattr(write_behind, "_spool_slot", None)
+    other_path = write_behind._claim_spool()
+
+    monkeypatch.setattr(write_behind, "_spool_slot", None)
+    fallback_path = write_behind._claim_spool()
+
+    assert path == f"{mock_config.PERSISTENCE_SPOOL_PATH}.0"
+    assert other_path == f"{mock_config.PERSISTENCE_SPOOL_PATH}.1"
+    assert fallback_path.startswith(f"{mock_config.PERSISTENCE_SPOOL_PATH}.")
+    assert fallback_path not in (path, other_path)
+
+
+@pytest.mark.asyncio
+async def test_start__replay_orphaned_spools(mock_post_data_bulk, mock_config, mock_document, monkeypatch) -> None:
+    from src.service import write_behind
+
+    monkeypatch.setattr(mock_config, "SERVER_WORKERS", 2)
+    path = mock_config.PERSISTENCE_SPOOL_PATH
+    data = [{"header": json.loads(mock_document.header), "sheets": [json.loads(mock_document.sheets[0])]}]
+    # bare path (single worker run), slot over SERVER_WORKERS, PID fallback and slot of a running worker
+    for i, spool_path in enumerate([path, f"{path}.5", f"{path}.12345", f"{path}.1"]):
+        with open(spool_path, "w") as file:
+            file.write(json.dumps({"id": str(i), "correlation_id": str(i), "data": data}) + "\n")
+    running = write_behind._lock_spool(f"{path}.1")
+
+    await write_behind.start()
+    await write_behind.stop()
+    running.close()
+
+    assert sorted(call.args[1] for call in mock_post_data_bulk.await_args_list) == ["0", "1", "2"]
+    assert sorted(os.listdir(os.path.dirname(path))) == [
+        "spool.jsonl.0", "spool.jsonl.0.lock", "spool.jsonl.1", "spool.jsonl.1.lock",
+    ]